@@ -0,0 +1,125 @@
+"""
+Benchmarks Account balance and statement queries with and without the model indexes.
+
+Usage:
+    python benchmarks/ledger_indexes.py --ledgers 1000000
+
+A ledger of Client Invoices spread across the client Accounts is imported into a new
+SQLite database, after which `Account.balance_movement` and `Account.statement` are
+timed for one client Account, first with the model indexes dropped and then after
+recreating them with `create_indexes`.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from python_accounting.models import Base, Entity, Currency, Account
+from python_accounting.database.session import get_session
+from python_accounting.database.database_init import create_indexes
+from python_accounting.importers import TransactionImporter
+
+
+def _invoices(clients: list, revenue: Account, count: int, start: datetime):
+    span = int((datetime.now() - start).total_seconds()) - 1
+    for i in range(count):
+        yield {
+            "transaction_type": "CLIENT_INVOICE",
+            "transaction_date": start + timedelta(seconds=1 + (i * 7919) % span),
+            "narration": f"Invoice {i}",
+            "account_id": clients[i % len(clients)].id,
+            "line_items": [
+                {"narration": "Services", "account_id": revenue.id, "amount": 100}
+            ],
+        }
+
+
+def _best(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--ledgers", type=int, default=1_000_000)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+
+    with get_session(engine) as session:
+        entity = Entity(name="Benchmark Entity")
+        session.add(entity)
+        session.commit()
+        currency = Currency(name="US Dollars", code="USD", entity_id=entity.id)
+        session.add(currency)
+        session.commit()
+
+        clients = [
+            Account(
+                name=f"Client {i}",
+                account_type=Account.AccountType.RECEIVABLE,
+                currency_id=currency.id,
+                entity_id=entity.id,
+            )
+            for i in range(args.clients)
+        ]
+        revenue = Account(
+            name="Sales",
+            account_type=Account.AccountType.OPERATING_REVENUE,
+            currency_id=currency.id,
+            entity_id=entity.id,
+        )
+        session.add_all(clients + [revenue])
+        session.commit()
+
+        start = entity.reporting_period.interval()["start"]
+        started = time.perf_counter()
+        TransactionImporter(session, chunk_size=5000).run(
+            _invoices(clients, revenue, args.ledgers // 2, start)
+        )
+        print(
+            f"Imported {args.ledgers} ledgers in {time.perf_counter() - started:.1f}s"
+        )
+
+        account, end = clients[0], datetime.now()
+        queries = {
+            "balance_movement": lambda: account.balance_movement(session, start, end),
+            "statement": lambda: account.statement(session, start, end),
+        }
+
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.drop(engine)
+        without = {name: _best(query, args.repeat) for name, query in queries.items()}
+
+        create_indexes(engine)
+        with engine.connect() as connection:
+            connection.exec_driver_sql("ANALYZE")
+        indexed = {name: _best(query, args.repeat) for name, query in queries.items()}
+
+    print(f"{'query':<20}{'no indexes':>14}{'indexes':>14}{'speedup':>10}")
+    for name in queries:
+        print(
+            f"{name:<20}{without[name]:>13.4f}s{indexed[name]:>13.4f}s"
+            f"{without[name] / indexed[name]:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -45,6 +45,32 @@ class Config:
         {
             salt (str): The initial value for the ledger hashing. Defaults to 'hashing salt'.
             algorithm (str): The Algorithm to use for encoding the hashes. Defaults to 'sha256'.
+            checkpoint_interval (int): The number of Ledgers between checkpoints of the
+            running hash. Defaults to 1000. 0 disables checkpoints.
+        }
+    """
+    movements: dict
+    """
+    Configuration for the daily totals of Account movements, from which balances are read
+    instead of the Ledger.
+    ::
+        {
+            enabled (bool): Whether to maintain the daily totals when posting Transactions.
+            Defaults to false.
+        }
+    """
+    cache: dict
+    """
+    Configuration for caching query results, which are invalidated by changes to the Ledger.
+    ::
+        {
+            balances (int): The number of Account balances to cache. Defaults to 0, which
+            disables the cache.
+            snapshots (int): The number of report snapshots to store in the database for
+            each Entity. Defaults to 0, which disables the store.
+            refresh_window (int): The number of Ledger and Balance ids below the highest
+            included in a report snapshot that are aggregated again when it is refreshed,
+            to pick up postings committed out of id order. Defaults to 10000.
         }
     """
     dates: dict
@@ -120,16 +146,48 @@ class Config:
         self.database["include_deleted"] = include_deleted
         self.database["ignore_isolation"] = ignore_isolation
 
-    def configure_hashing(self, salt="hashing salt", algorithm="sha256") -> None:
+    def configure_hashing(
+        self, salt="hashing salt", algorithm="sha256", checkpoint_interval=1000
+    ) -> None:
+        # pylint: disable = line-too-long
         """
         Configures hashing.
 
         Args:
             salt (str): The initial value for the ledger hashing. Defaults to 'hashing salt'.
             algorithm (str): The Algorithm to use for encoding the hashes. Defaults to 'sha256'.
+            checkpoint_interval (int): The number of Ledgers between hash chain checkpoints. Defaults to 1000.
         """
+        # pylint: enable = line-too-long
         self.hashing["salt"] = salt
         self.hashing["algorithm"] = algorithm
+        self.hashing["checkpoint_interval"] = checkpoint_interval
+
+    def configure_movements(self, enabled=False) -> None:
+        """
+        Configures the daily Account movement totals.
+
+        Existing totals should be regenerated with `AccountMovement.rebuild` after enabling.
+
+        Args:
+            enabled (bool): Whether to maintain the daily totals. Defaults to false.
+        """
+        self.movements["enabled"] = enabled
+
+    def configure_cache(self, balances=0, snapshots=0, refresh_window=10000) -> None:
+        """
+        Configures caching.
+
+        Args:
+            balances (int): The number of Account balances to cache. Defaults to 0.
+            snapshots (int): The number of report snapshots to store per Entity. Defaults
+                to 0.
+            refresh_window (int): The number of ids below the highest included in a report
+                snapshot that are aggregated again when it is refreshed. Defaults to 10000.
+        """
+        self.cache["balances"] = balances
+        self.cache["snapshots"] = snapshots
+        self.cache["refresh_window"] = refresh_window
 
     def configure_dates(self, short="%Y-%m-%d", long="%d, %b %Y") -> None:
         """
@@ -8,16 +8,68 @@
 """
 Database initialization based on the engine and PythonAccounting models.
 """
+from sqlalchemy import inspect
 from python_accounting.database.engine import engine
 from python_accounting import models
 
 
-def database_init() -> None:
+def database_init(bind=engine) -> None:
     """
     Initializes the database by setting up all tables that do not currently exist.
 
+    When upgrading a database whose Ledgers were hashed before the hash chain was
+    continuous, the cut-over to the continuous chain is recorded at its latest Ledger so
+    that the existing Ledgers are still verified as they were hashed.
+
+    Args:
+        bind (`Engine`, optional): The database engine to initialize the tables with.
+            Defaults to the configured engine.
+
     Returns:
         None
     """
+    tables = inspect(bind).get_table_names()
+    upgrading = "ledger" in tables and "ledger_checkpoint" not in tables
+
+    models.Base.metadata.create_all(bind)
+
+    if upgrading:
+        with bind.begin() as connection:
+            models.LedgerCheckpoint.record_cutover(connection)
+
+
+def create_indexes(bind=engine) -> list:
+    """
+    Creates the indexes declared by the models that are missing from the existing tables.
+
+    Indexes whose columns differ from their declaration are dropped and created again.
+    Tables that do not exist yet are skipped, since they are created together with their
+    indexes by `database_init`.
+
+    Args:
+        bind (`Engine`, optional): The database engine or connection to create the
+            indexes with. Defaults to the configured engine.
+
+    Returns:
+        list: The names of the indexes that were created.
+    """
+    inspector = inspect(bind)
+    created = []
+
+    for table in models.Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
 
-    models.Base.metadata.create_all(engine)
+        existing = {
+            index["name"]: index["column_names"]
+            for index in inspector.get_indexes(table.name)
+        }
+        for index in table.indexes:
+            columns = [column.name for column in index.columns]
+            if existing.get(index.name) == columns:
+                continue
+            if index.name in existing:
+                index.drop(bind)
+            index.create(bind)
+            created.append(index.name)
+    return created
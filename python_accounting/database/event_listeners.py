@@ -13,9 +13,19 @@ that are relevant to accounting.
 from datetime import datetime
 
 from sqlalchemy.orm.session import Session
-from sqlalchemy import event, orm, and_, update
+from sqlalchemy import event, orm, and_, insert, inspect
 
-from python_accounting.models import Entity, Recyclable, Transaction, Account, Ledger
+from python_accounting.models import (
+    Entity,
+    Recyclable,
+    Account,
+    Ledger,
+    LedgerCheckpoint,
+    LedgerWatermark,
+    Balance,
+    ReportingPeriod,
+)
+from python_accounting.config import config
 from python_accounting.mixins import IsolatingMixin
 from python_accounting.exceptions import MissingEntityError
 
@@ -29,6 +39,37 @@ def _filter_options(execute_state, option) -> bool:
     )
 
 
+def _calendar_years(session, model, found: dict) -> set:
+    # The Reporting Periods of the model, before and after any changes to it
+    def get(cls, primary_key):
+        current = getattr(session, "entity", None)
+        if cls is Entity and current is not None and current.id == primary_key:
+            return current
+        if (
+            cls is ReportingPeriod
+            and current is not None
+            and current.reporting_period is not None
+            and current.reporting_period.id == primary_key
+        ):
+            return current.reporting_period
+        if (cls, primary_key) not in found:
+            found[(cls, primary_key)] = session.get(cls, primary_key)
+        return found[(cls, primary_key)]
+
+    if isinstance(model, Balance):
+        return {
+            get(ReportingPeriod, period_id).calendar_year
+            for period_id in inspect(model).attrs.reporting_period_id.history.sum()
+            if period_id is not None
+        }
+    entity = get(Entity, model.entity_id)
+    return {
+        ReportingPeriod.date_year(date, entity)
+        for date in inspect(model).attrs.transaction_date.history.sum()
+        if date is not None
+    }
+
+
 # pylint: disable=too-few-public-methods
 class EventListenersMixin:
     """
@@ -84,41 +125,89 @@ class EventListenersMixin:
         ):
             self._set_reporting_period()
 
-    @event.listens_for(Session, "transient_to_pending")
-    def _set_object_index(self, object_) -> None:
-        if (isinstance(object_, (Account, Transaction))) and object_.id is None:
-            object_.session_index = (
-                len(
-                    [
-                        t
-                        for t in self.new
-                        if isinstance(t, Transaction)
-                        and t.transaction_type == object_.transaction_type
-                    ]
-                )
-                if isinstance(object_, Transaction)
-                else len(
-                    [
-                        a
-                        for a in self.new
-                        if isinstance(a, Account)
-                        and a.account_type == object_.account_type
-                    ]
-                )
-            )
+    @event.listens_for(Session, "before_flush")
+    def _reset_ledger_chain(self, _, __) -> None:
+        self.ledger_chain = None
 
-    @event.listens_for(Ledger, "after_insert")
+    @event.listens_for(Ledger, "before_insert")
     def _set_ledger_hash(  # pylint: disable=no-self-argument
         mapper, connection, target
     ):
-        connection.execute(
-            update(Ledger)
-            .where(Ledger.id == target.id)
-            .values(hash=target.get_hash(connection))
-        )
+        session = orm.object_session(target)
+        if getattr(session, "ledger_chain", None) is None:
+            previous, pending = LedgerCheckpoint.chain_state(connection)
+            session.ledger_chain = {
+                "hash": previous,
+                "pending": pending,
+                "checkpoints": [],
+            }
+        chain = session.ledger_chain
+
+        target.hash = chain["hash"] = target.get_hash(connection, chain["hash"])
+        chain["pending"] += 1
+
+        interval = config.hashing["checkpoint_interval"]
+        if interval and chain["pending"] >= interval:
+            chain["checkpoints"].append(target)
+            chain["pending"] = 0
+
+    @event.listens_for(Session, "after_flush")
+    def _record_ledger_checkpoints(self, _) -> None:
+        chain = getattr(self, "ledger_chain", None)
+        if chain and chain["checkpoints"]:
+            self.connection().execute(
+                insert(LedgerCheckpoint),
+                [{"ledger_id": l.id, "hash": l.hash} for l in chain["checkpoints"]],
+            )
+            chain["checkpoints"] = []
+
+    @event.listens_for(Session, "after_flush")
+    def _set_flushed(self, _) -> None:
+        self.info["flushed"] = True
+
+    @event.listens_for(Session, "after_commit")
+    @event.listens_for(Session, "after_rollback")
+    def _reset_transaction_info(self) -> None:
+        self.info.pop("flushed", None)
+        self.info.pop("ledger_changed", None)
+
+    @event.listens_for(Session, "before_flush")
+    def _set_account_codes(self, _, __) -> None:
+        accounts = {}
+        for model in self.new:
+            if isinstance(model, Account) and model.account_code is None:
+                accounts.setdefault((model.entity_id, model.account_type), []).append(
+                    model
+                )
+
+        # Codes for new Accounts are reserved a block per Account type
+        for (entity_id, account_type), group in accounts.items():
+            codes = Account.account_codes(self, account_type, len(group), entity_id)
+            for account, code in zip(group, codes):
+                account.account_code = code
 
     @event.listens_for(Session, "before_flush")
     def _validate_model(self, _, __) -> None:
         for model in list(self.new) + list(self.dirty):
             if hasattr(model, "validate"):
                 model.validate(self)
+
+    # Registered after validation, which sets the Reporting Period of Balances
+    @event.listens_for(Session, "before_flush")
+    def _advance_ledger_watermark(self, _, __) -> None:
+        changes, found = {}, {}
+        for model in self.new:
+            if isinstance(model, (Ledger, Balance)):
+                for year in _calendar_years(self, model, found):
+                    changes.setdefault((model.entity_id, year), False)
+        for model in self.dirty:
+            if isinstance(model, (Ledger, Balance)) and self.is_modified(model):
+                for year in _calendar_years(self, model, found):
+                    changes[(model.entity_id, year)] = True
+        for model in self.deleted:
+            if isinstance(model, (Ledger, Balance)):
+                for year in _calendar_years(self, model, found):
+                    changes[(model.entity_id, year)] = True
+
+        for (entity_id, year), rewrite in changes.items():
+            LedgerWatermark.advance(self, entity_id, year, rewrite)
@@ -426,3 +426,42 @@ class MixedAssignmentError(AccountingExeption):
     def __init__(self, previous: str, current: str) -> None:
         self.message = f"A Transaction that has been {previous} cannot be {current}."
         super().__init__()
+
+
+class InvalidImportRecordError(AccountingExeption):
+    """
+    A record being imported does not describe a valid Transaction.
+
+    Args:
+         record (int): The position of the record in the import source, starting from 1.
+         error (AccountingExeption): The reason the record is invalid.
+    """
+
+    def __init__(self, record: int, error: Exception) -> None:
+        self.record = record
+        self.error = error
+        self.message = f"Record {record} could not be imported: {error}"
+        super().__init__()
+
+
+class ExhaustedAccountCodesError(AccountingExeption):
+    """
+    The Account codes of an Account type cannot go beyond the range configured for it.
+
+    Args:
+         account_type (Account.AccountType): The Account type in question.
+         limit (int): The first code beyond the range of the Account type.
+    """
+
+    def __init__(self, account_type, limit: int) -> None:
+        self.message = f"""No more {account_type} Account codes are available, as they
+         must be lower than {limit}."""
+        super().__init__()
+
+
+class InvalidCursorError(AccountingExeption):
+    """The cursor given for a page was not issued for the listing being paged."""
+
+    def __init__(self) -> None:
+        self.message = "The cursor is invalid or was not issued for this listing."
+        super().__init__()
@@ -0,0 +1,13 @@
+# importers/__init__.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Provides bulk importing of historical Transactions.
+
+"""
+from .readers import read_csv, read_jsonl
+from .transaction_importer import TransactionImporter
@@ -0,0 +1,72 @@
+# importers/readers.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Provides streaming readers for Transaction import sources.
+
+"""
+import csv
+import json
+from typing import Iterator, TextIO
+
+LINE_ITEM_PREFIX = "line_item_"
+"""(str): The prefix of the CSV columns that hold the Line Item fields."""
+
+
+def read_csv(source: TextIO, key: str = "transaction") -> Iterator[dict]:
+    """
+    Reads Transaction records from a CSV file, one Line Item per row.
+
+    Consecutive rows with the same value in the key column belong to the same Transaction.
+    Columns prefixed with `line_item_` hold the fields of the row's Line Item, the rest
+    hold the fields of its Transaction and are read from the first row of the group.
+    Empty cells are treated as missing values.
+
+    Args:
+        source (TextIO): The open CSV file.
+        key (`str`, optional): The column identifying the Transaction of each row.
+            Defaults to 'transaction'.
+
+    Returns:
+        Iterator[dict]: The Transaction records, each with a list of `line_items`.
+    """
+    record = None
+    for row in csv.DictReader(source):
+        row = {k: v for k, v in row.items() if v not in (None, "")}
+        if record is None or row.get(key) != record.get(key):
+            if record is not None:
+                yield record
+            record = {
+                k: v for k, v in row.items() if not k.startswith(LINE_ITEM_PREFIX)
+            }
+            record["line_items"] = []
+
+        line_item = {
+            k[len(LINE_ITEM_PREFIX) :]: v
+            for k, v in row.items()
+            if k.startswith(LINE_ITEM_PREFIX)
+        }
+        if line_item:
+            record["line_items"].append(line_item)
+
+    if record is not None:
+        yield record
+
+
+def read_jsonl(source: TextIO) -> Iterator[dict]:
+    """
+    Reads Transaction records from a JSON Lines file, one Transaction per line.
+
+    Args:
+        source (TextIO): The open JSON Lines file.
+
+    Returns:
+        Iterator[dict]: The Transaction records, each with a list of `line_items`.
+    """
+    for line in source:
+        if line.strip():
+            yield json.loads(line)
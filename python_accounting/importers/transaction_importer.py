@@ -0,0 +1,437 @@
+# importers/transaction_importer.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Imports Transactions in bulk, validating and posting them a chunk at a time.
+
+"""
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+from types import SimpleNamespace
+from typing import Iterable
+from sqlalchemy import select, insert
+
+from python_accounting.config import config
+from python_accounting.models import (
+    Account,
+    Tax,
+    Transaction,
+    ReportingPeriod,
+    LineItem,
+    Ledger,
+    LedgerCheckpoint,
+    AccountMovement,
+    LedgerWatermark,
+    IdCounter,
+)
+from python_accounting.transactions import JournalEntry
+from python_accounting.exceptions import (
+    AccountingExeption,
+    InvalidImportRecordError,
+    MissingEntityError,
+    MissingLineItemError,
+    MissingMainAccountAmountError,
+    MissingReportingPeriodError,
+    RedundantTransactionError,
+    UnbalancedTransactionError,
+)
+
+_RECORD_ERRORS = (AccountingExeption, ArithmeticError, LookupError, TypeError, ValueError)
+
+_BULK_OPTIONS = {"ignore_isolation": True, "include_deleted": True}
+
+_TRANSACTION_COLUMNS = (
+    "transaction_date",
+    "transaction_no",
+    "transaction_type",
+    "narration",
+    "reference",
+    "main_account_amount",
+    "credited",
+    "compound",
+    "currency_id",
+    "account_id",
+    "entity_id",
+)
+
+_LINE_ITEM_COLUMNS = (
+    "narration",
+    "quantity",
+    "amount",
+    "credited",
+    "tax_inclusive",
+    "account_id",
+    "transaction_id",
+    "tax_id",
+    "entity_id",
+)
+
+_LEDGER_COLUMNS = (
+    "transaction_date",
+    "entry_type",
+    "amount",
+    "hash",
+    "transaction_id",
+    "currency_id",
+    "post_account_id",
+    "folio_account_id",
+    "line_item_id",
+    "tax_id",
+    "entity_id",
+)
+
+
+def _boolean(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes")
+    return bool(value)
+
+
+def _decimal(value) -> Decimal:
+    return Decimal(str(value))
+
+
+def _date(value) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def _transaction_type(value) -> Transaction.TransactionType:
+    if value in Transaction.TransactionType.__members__:
+        return Transaction.TransactionType[value]
+    return Transaction.TransactionType(value)
+
+
+def _row(entry, columns: tuple) -> dict:
+    return {column: getattr(entry, column) for column in columns}
+
+
+# pylint: disable=too-few-public-methods
+class _Entry(SimpleNamespace):
+    """A Transaction read from an import source, with the attributes used to post it."""
+
+    def get_compound_entries(self) -> tuple:
+        """Prepare the compound entries of a Journal Entry record."""
+        return JournalEntry.get_compound_entries(self)
+
+
+class TransactionImporter:
+    """
+    Imports Transactions with their Line Items in bulk, and posts them to the Ledger.
+
+    Records are read from the source a chunk at a time, so memory use does not grow with
+    the size of the import. Each chunk is validated as a set, with the Accounts and Taxes it
+    refers to loaded in one query each, and its Transactions, Line Items and Ledgers are
+    written with one executemany statement per table and committed together.
+
+    Attributes:
+        session (Session): The accounting session into which the Transactions are imported.
+        chunk_size (int): The number of Transactions validated and written at a time.
+        imported (int): The number of Transactions imported so far.
+    """
+
+    def __init__(self, session, chunk_size: int = 1000) -> None:
+        if getattr(session, "entity", None) is None:
+            raise MissingEntityError
+
+        self.session = session
+        self.chunk_size = chunk_size
+        self.imported = 0
+        self._prototypes = {}
+        self._periods = {
+            p.calendar_year: p for p in session.scalars(select(ReportingPeriod))
+        }
+
+    def run(self, records: Iterable[dict]) -> int:
+        """
+        Imports and posts the Transactions described by the records.
+
+        Each record has the Transaction's `transaction_type` (the name or label of a
+        Transaction Type), `transaction_date`, `narration` and main `account_id`, and
+        optionally its `transaction_no`, `reference`, `credited`, `compound` and
+        `main_account_amount`. Its `line_items` each have a `narration`, `account_id` and
+        `amount`, and optionally a `quantity`, `tax_id`, `tax_inclusive` and `credited`.
+        Transaction numbers are allocated for records that do not have one.
+
+        Args:
+            records (Iterable[dict]): The Transaction records, as produced by `read_csv`
+                or `read_jsonl`.
+
+        Raises:
+            InvalidImportRecordError: If a record does not describe a valid Transaction.
+                None of the Transactions in its chunk are imported, and the session is
+                rolled back.
+
+        Returns:
+            int: The number of Transactions imported so far.
+        """
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                return self.imported
+            self._import(chunk)
+
+    def _import(self, chunk: list) -> None:
+        try:
+            entries = self._prepare(chunk)
+            self._insert_transactions(entries)
+            self._insert_ledgers([l for e in entries for l in Ledger.entries(e)])
+            self.session.commit()
+        except Exception:
+            # Discard the Transaction numbers reserved for the chunk
+            self.session.rollback()
+            raise
+        self.imported += len(entries)
+
+    def _prepare(self, chunk: list) -> list:
+        entries = [
+            self._check(position, self._parse, record)
+            for position, record in enumerate(chunk, self.imported + 1)
+        ]
+        accounts = self._load(
+            Account,
+            {e.account_id for e in entries}
+            | {l.account_id for e in entries for l in e.line_items},
+            Account.account_type,
+            Account.currency_id,
+        )
+        taxes = self._load(
+            Tax,
+            {l.tax_id for e in entries for l in e.line_items if l.tax_id},
+            Tax.rate,
+            Tax.account_id,
+        )
+        periods = [
+            self._check(position, self._validate, entry, accounts, taxes)
+            for position, entry in enumerate(entries, self.imported + 1)
+        ]
+
+        numbered, unnumbered = {}, {}
+        for entry, period in zip(entries, periods):
+            group = numbered if entry.transaction_no else unnumbered
+            group.setdefault((entry.transaction_type, period), []).append(entry)
+
+        # Numbers generated later must not clash with the ones supplied in the records
+        for (transaction_type, period), group in numbered.items():
+            Transaction.skip_transaction_numbers(
+                self.session,
+                transaction_type,
+                period,
+                [e.transaction_no for e in group],
+            )
+        for (transaction_type, period), group in unnumbered.items():
+            numbers = Transaction.transaction_numbers(
+                self.session, transaction_type, period, len(group)
+            )
+            for entry, transaction_no in zip(group, numbers):
+                entry.transaction_no = transaction_no
+        self._check_numbers(entries)
+        return entries
+
+    @staticmethod
+    def _check(position: int, function, *args):
+        try:
+            return function(*args)
+        except _RECORD_ERRORS as exc:
+            raise InvalidImportRecordError(position, exc) from exc
+
+    def _check_numbers(self, entries: list) -> None:
+        # Transaction numbers are unique per Entity, including recycled Transactions
+        numbers = set(
+            self.session.scalars(
+                select(Transaction.transaction_no)
+                .where(Transaction.entity_id == self.session.entity.id)
+                .where(Transaction.transaction_no.in_({e.transaction_no for e in entries}))
+                .execution_options(**_BULK_OPTIONS)
+            )
+        )
+        for position, entry in enumerate(entries, self.imported + 1):
+            if entry.transaction_no in numbers:
+                raise InvalidImportRecordError(
+                    position,
+                    ValueError(
+                        f"Transaction number {entry.transaction_no} already exists"
+                    ),
+                )
+            numbers.add(entry.transaction_no)
+
+    def _load(self, model, ids: set, *columns) -> dict:
+        return {
+            row.id: row
+            for row in self.session.execute(
+                select(model.id, *columns).where(model.id.in_(ids))
+            )
+        }
+
+    def _prototype(self, transaction_type: Transaction.TransactionType) -> Transaction:
+        # Subclass validation rules are set up by the Transaction constructors
+        if transaction_type not in self._prototypes:
+            self._prototypes[transaction_type] = Transaction.__mapper__.polymorphic_map[
+                transaction_type
+            ].class_()
+        return self._prototypes[transaction_type]
+
+    def _parse(self, record: dict) -> _Entry:
+        transaction_type = _transaction_type(record["transaction_type"])
+        return _Entry(
+            transaction_type=transaction_type,
+            transaction_date=_date(record["transaction_date"]),
+            transaction_no=record.get("transaction_no"),
+            narration=record["narration"],
+            reference=record.get("reference"),
+            account_id=int(record["account_id"]),
+            credited=_boolean(
+                record.get("credited", self._prototype(transaction_type).credited)
+            ),
+            compound=_boolean(record.get("compound", False)),
+            main_account_amount=_decimal(record.get("main_account_amount", 0)),
+            currency_id=None,
+            entity_id=self.session.entity.id,
+            line_items=[
+                SimpleNamespace(
+                    narration=l["narration"],
+                    account_id=int(l["account_id"]),
+                    amount=_decimal(l["amount"]),
+                    quantity=_decimal(l.get("quantity", 1)),
+                    credited=_boolean(l.get("credited", False)),
+                    tax_inclusive=_boolean(l.get("tax_inclusive", False)),
+                    tax_id=int(l["tax_id"]) if l.get("tax_id") else None,
+                    tax=None,
+                    entity_id=self.session.entity.id,
+                )
+                for l in record.get("line_items", [])
+            ],
+        )
+
+    def _validate_line_items(self, entry: _Entry, accounts: dict, taxes: dict) -> None:
+        prototype = self._prototype(entry.transaction_type)
+
+        for line_item in entry.line_items:
+            LineItem.check_amounts(line_item.amount, line_item.quantity)
+            if line_item.account_id not in accounts:
+                raise ValueError("The Line Item Account is required")
+            if line_item.account_id == entry.account_id:
+                raise RedundantTransactionError(line_item.narration)
+            line_item.account = accounts[line_item.account_id]
+            if hasattr(prototype, "check_line_item"):
+                prototype.check_line_item(line_item, entry.compound)
+
+            if line_item.tax_id:
+                if line_item.tax_id not in taxes:
+                    raise ValueError("The Line Item Tax is required")
+                line_item.tax = taxes[line_item.tax_id]
+
+            if not entry.compound:
+                line_item.credited = not entry.credited
+
+    def _validate(self, entry: _Entry, accounts: dict, taxes: dict) -> ReportingPeriod:
+        prototype = self._prototype(entry.transaction_type)
+
+        if not entry.line_items:
+            raise MissingLineItemError
+        if entry.compound and not isinstance(prototype, JournalEntry):
+            raise ValueError("Only Journal Entry Transactions can be compound")
+
+        self._validate_line_items(entry, accounts, taxes)
+
+        if entry.compound:
+            if not entry.main_account_amount:
+                raise MissingMainAccountAmountError
+            debit_amounts, credit_amounts = entry.get_compound_entries()
+            if sum(d[1] for d in debit_amounts) != sum(c[1] for c in credit_amounts):
+                raise UnbalancedTransactionError
+
+        if entry.account_id not in accounts:
+            raise ValueError("The main Account is required")
+        if hasattr(prototype, "check_main_account"):
+            prototype.check_main_account(accounts[entry.account_id])
+        entry.currency_id = accounts[entry.account_id].currency_id
+
+        year = ReportingPeriod.date_year(entry.transaction_date, self.session.entity)
+        if year not in self._periods:
+            raise MissingReportingPeriodError(self.session.entity, year)
+        period = self._periods[year]
+        Transaction.check_reporting_period(
+            period, entry.transaction_type, entry.transaction_date
+        )
+        return period
+
+    def _insert(self, model, rows: list) -> list:
+        if not rows:
+            return []
+        if self.session.get_bind().dialect.insert_returning:
+            return (
+                self.session.execute(
+                    insert(model)
+                    .returning(model.id, sort_by_parameter_order=True)
+                    .execution_options(**_BULK_OPTIONS),
+                    rows,
+                )
+                .scalars()
+                .all()
+            )
+
+        # Without RETURNING (MySQL/MariaDB) the ids are reserved ahead of the insert, and
+        # each of the model's inherited tables is written with one executemany statement
+        mapper = model.__mapper__
+        connection = self.session.connection()
+        ids = IdCounter.reserve_ids(connection, mapper.base_mapper.local_table, len(rows))
+        rows = [
+            {mapper.polymorphic_on.key: mapper.polymorphic_identity, **row, "id": row_id}
+            for row, row_id in zip(rows, ids)
+        ]
+        for table in [m.local_table for m in reversed(list(mapper.iterate_to_root()))]:
+            connection.execute(
+                insert(table),
+                [{c.key: r[c.key] for c in table.columns if c.key in r} for r in rows],
+            )
+        return ids
+
+    def _insert_transactions(self, entries: list) -> None:
+        # Transaction subclasses are identified by their Transaction Type
+        ids = self._insert(
+            Transaction,
+            [
+                dict(_row(e, _TRANSACTION_COLUMNS), recycled_type=e.transaction_type)
+                for e in entries
+            ],
+        )
+        for entry, transaction_id in zip(entries, ids):
+            entry.id = transaction_id
+            for line_item in entry.line_items:
+                line_item.transaction_id = transaction_id
+
+        line_items = [l for e in entries for l in e.line_items]
+        ids = self._insert(LineItem, [_row(l, _LINE_ITEM_COLUMNS) for l in line_items])
+        for line_item, line_item_id in zip(line_items, ids):
+            line_item.id = line_item_id
+
+    def _insert_ledgers(self, ledgers: list) -> None:
+        connection = self.session.connection()
+        previous, pending = LedgerCheckpoint.chain_state(connection)
+        for ledger in ledgers:
+            ledger.hash = previous = Ledger.compute_hash(ledger, previous)
+
+        ids = self._insert(Ledger, [_row(l, _LEDGER_COLUMNS) for l in ledgers])
+
+        interval = config.hashing["checkpoint_interval"]
+        checkpoints = [
+            {"ledger_id": ledger_id, "hash": ledger.hash}
+            for position, (ledger_id, ledger) in enumerate(zip(ids, ledgers), pending + 1)
+            if interval and position % interval == 0
+        ]
+        if checkpoints:
+            connection.execute(insert(LedgerCheckpoint), checkpoints)
+
+        if config.movements["enabled"]:
+            AccountMovement.record(connection, ledgers)
+        for year in {
+            ReportingPeriod.date_year(l.transaction_date, self.session.entity)
+            for l in ledgers
+        }:
+            LedgerWatermark.advance(self.session, self.session.entity.id, year)
@@ -13,5 +13,6 @@ Provides accounting functionality mixins.
 from .assigning import AssigningMixin
 from .buying import BuyingMixin
 from .clearing import ClearingMixin
+from .counting import CountingMixin
 from .isolating import IsolatingMixin
 from .selling import SellingMixin
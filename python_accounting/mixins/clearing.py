@@ -45,6 +45,43 @@ class ClearingMixin:
             .filter(Assignment.assigned_type == self.__class__.__name__)
         ).scalar() or 0
 
+    @staticmethod
+    def cleared_amounts(session, clearables: list) -> dict:
+        """
+        Gets how much of the amounts of many clearable Transactions has been cleared, in
+        one grouped query.
+
+        Args:
+            session (Session): The accounting session to which the Transactions belong.
+            clearables (list): The clearable Transactions and Balances.
+
+        Returns:
+            dict: The total amount of assignments made against each Transaction, keyed
+            by its id and class name. Transactions without assignments are omitted.
+        """
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            Assignment,
+        )
+
+        ids = list({c.id for c in clearables})
+        amounts = {}
+
+        # Ids are batched to stay within the bound parameter limits of the database
+        for start in range(0, len(ids), 1000):
+            amounts.update(
+                {
+                    (assigned_id, assigned_type): amount
+                    for assigned_id, assigned_type, amount in session.query(
+                        Assignment.assigned_id,
+                        Assignment.assigned_type,
+                        func.sum(Assignment.amount),  # pylint: disable=not-callable
+                    )
+                    .filter(Assignment.assigned_id.in_(ids[start : start + 1000]))
+                    .group_by(Assignment.assigned_id, Assignment.assigned_type)
+                }
+            )
+        return amounts
+
     def clearances(self, session) -> list:
         """
         Gets the assignments made to clear the Transaction.
@@ -0,0 +1,107 @@
+# mixins/counting.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Provides functionality for allocating serial numbers from a counter table.
+
+"""
+from typing import Callable
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import select, insert, update
+from sqlalchemy.exc import IntegrityError
+
+
+# pylint: disable=too-few-public-methods
+class CountingMixin:
+    """
+    This class enables counter models, whose records each hold the last number allocated
+    for the combination of their key columns.
+
+    Attributes:
+        count (int): The last number allocated by the counter.
+    """
+
+    count: Mapped[int] = mapped_column(default=0)
+
+    @classmethod
+    def reserve(
+        cls, connection, key: dict, quantity: int = 1, initial: Callable = None
+    ) -> int:
+        """
+        Atomically reserve a block of consecutive numbers from the counter.
+
+        The counter record is incremented in a single UPDATE, so concurrent sessions are
+        serialized by the database and never receive the same numbers.
+
+        Args:
+            connection (Connection): The database connection of the accounting session.
+            key (dict): The values of the key columns of the counter.
+            quantity (`int`, optional): The number of numbers to reserve. Defaults to 1.
+            initial (`Callable`, optional): Returns the count from which the counter starts
+                if it does not exist yet. Defaults to 0.
+
+        Returns:
+            int: The first of the reserved numbers.
+        """
+        criteria = [getattr(cls, column) == value for column, value in key.items()]
+
+        while True:
+            if connection.execute(
+                update(cls).where(*criteria).values(count=cls.count + quantity)
+            ).rowcount:
+                return (
+                    connection.execute(select(cls.count).where(*criteria)).scalar()
+                    - quantity
+                    + 1
+                )
+
+            start = initial() if initial else 0
+            try:
+                with connection.begin_nested():
+                    connection.execute(
+                        insert(cls).values(**key, count=start + quantity)
+                    )
+                return start + 1
+            except IntegrityError:
+                # Another session created the counter first
+                continue
+
+    @classmethod
+    def skip_to(
+        cls, connection, key: dict, count: int, initial: Callable = None
+    ) -> None:
+        """
+        Atomically move the counter forward to a number allocated outside of it.
+
+        The counter is left unchanged if it is already at or past the number.
+
+        Args:
+            connection (Connection): The database connection of the accounting session.
+            key (dict): The values of the key columns of the counter.
+            count (int): The number the counter should have allocated.
+            initial (`Callable`, optional): Returns the count from which the counter starts
+                if it does not exist yet. Defaults to 0.
+        """
+        criteria = [getattr(cls, column) == value for column, value in key.items()]
+
+        while True:
+            if connection.execute(select(cls.count).where(*criteria)).first():
+                connection.execute(
+                    update(cls).where(*criteria, cls.count < count).values(count=count)
+                )
+                return
+
+            start = initial() if initial else 0
+            try:
+                with connection.begin_nested():
+                    connection.execute(
+                        insert(cls).values(**key, count=max(start, count))
+                    )
+                return
+            except IntegrityError:
+                # Another session created the counter first
+                continue
@@ -23,7 +23,23 @@ class TradingMixin:
     for an entity.
     """
 
-    def _validate_subclass_line_items(self, line_item):
+    def check_line_item(self, line_item, _) -> None:
+        """
+        Checks the Line Item Account and Tax against the rules of the trading Transaction.
+
+        Args:
+            line_item (LineItem): The Line Item, with its Account.
+            compound (bool): Whether the Transaction is compound.
+
+        Raises:
+            InvalidLineItemAccountError: If the Line Item Account is not of a Type allowed
+                for the Transaction.
+            InvalidTaxChargeError: If the Line Item is charged Tax and the Transaction
+                cannot be.
+
+        Returns:
+            None
+        """
         if line_item.account.account_type not in self.line_item_types:
             raise InvalidLineItemAccountError(
                 self.__class__.__name__,
@@ -31,24 +47,37 @@ class TradingMixin:
             )
         if getattr(self, "no_tax", False) and line_item.tax_id:
             raise InvalidTaxChargeError(self.__class__.__name__)
-        return line_item
 
-    def validate(self, session) -> None:
+    def check_main_account(self, account) -> None:
         """
-        Validates the trading Transaction properties.
+        Checks the main Account against the rules of the trading Transaction.
 
         Args:
-            session (Session): The accounting session to which the Transaction belongs.
+            account (Account): The main Account of the Transaction.
+
+        Raises:
+            InvalidMainAccountError: If the main Account is not of a Type allowed for the
+                Transaction.
 
         Returns:
             None
         """
-
-        account = self._get_main_account(session)
-
         if account.account_type not in self.main_account_types:
             raise InvalidMainAccountError(
                 self.__class__.__name__,
                 self.account_type_map[self.__class__.__name__],
             )
+
+    def validate(self, session) -> None:
+        """
+        Validates the trading Transaction properties.
+
+        Args:
+            session (Session): The accounting session to which the Transaction belongs.
+
+        Returns:
+            None
+        """
+
+        self.check_main_account(self._get_main_account(session))
         super().validate(session)
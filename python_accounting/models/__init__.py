@@ -17,10 +17,17 @@ from .recycled import Recycled
 from .reporting_period import ReportingPeriod
 from .entity import Entity
 from .account import Account
+from .account_counter import AccountCounter
 from .category import Category
 from .line_item import LineItem
 from .transaction import Transaction
+from .transaction_counter import TransactionCounter
+from .id_counter import IdCounter
 from .balance import Balance
 from .tax import Tax
 from .ledger import Ledger
+from .ledger_checkpoint import LedgerCheckpoint
+from .ledger_watermark import LedgerWatermark
+from .account_movement import AccountMovement
+from .cached_snapshot import CachedSnapshot
 from .assignment import Assignment
@@ -8,22 +8,37 @@
 """
 Represents an Account, the basic unit of accounting that groups the transactions of an Entity.
 """
-import warnings
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, time
+from dateutil.relativedelta import relativedelta, SU
 from strenum import StrEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship, aliased
-from sqlalchemy import String, ForeignKey, Enum, func, inspect, select, or_, exc
+from sqlalchemy import (
+    String,
+    ForeignKey,
+    Enum,
+    func,
+    inspect,
+    or_,
+    and_,
+    case,
+    Date,
+)
 from python_accounting.models.recyclable import Recyclable
 from python_accounting.models.reporting_period import ReportingPeriod
-from python_accounting.mixins import IsolatingMixin
+from python_accounting.mixins import IsolatingMixin, ClearingMixin
 from python_accounting.config import config
 from python_accounting.exceptions import (
     InvalidCategoryAccountTypeError,
     InvalidAccountTypeError,
     HangingTransactionsError,
+    ExhaustedAccountCodesError,
+    InvalidCursorError,
 )
 from python_accounting.utils.dates import get_dates
+from python_accounting.utils.aggregates import signed_sum
+from python_accounting.utils.cursors import encode_cursor, decode_cursor
+from python_accounting.utils.balance_cache import balance_cache
 
 account_type_enum = StrEnum(
     "AccountType", {k: v["label"] for k, v in config.accounts["types"].items()}
@@ -70,20 +85,84 @@ class Account(IsolatingMixin, Recyclable):
     """(`Category`, optional): The Category to which the Account belongs."""
 
     def _get_account_code(self, session) -> int:
-        current_count = (
-            session.query(Account)
-            .filter(Account.entity_id == self.entity_id)
-            .filter(Account.account_type == self.account_type)
-            .with_entities(func.count())  # pylint: disable=not-callable
-            .scalar()
+        return Account.account_codes(
+            session, self.account_type, entity_id=self.entity_id
+        )[0]
+
+    @staticmethod
+    def code_range(account_type: StrEnum) -> tuple:
+        """
+        Get the range of Account codes configured for the Account type.
+
+        Args:
+            account_type (Account.AccountType): The Account type whose range is to be found.
+
+        Returns:
+            tuple: The base code of the Account type, and the next higher configured base
+            code, which its Account codes must be lower than (None if there is none).
+        """
+        base = int(config.accounts["types"][account_type.name]["account_code"])
+        return base, min(
+            (
+                int(t["account_code"])
+                for t in config.accounts["types"].values()
+                if int(t["account_code"]) > base
+            ),
+            default=None,
         )
 
-        return (
-            int(config.accounts["types"][self.account_type.name]["account_code"])
-            + current_count
-            + getattr(self, "session_index", 1)
+    @staticmethod
+    def account_codes(
+        session, account_type: StrEnum, quantity: int = 1, entity_id: int = None
+    ) -> list:
+        """
+        Reserves the next Account codes for the Account type.
+
+        Args:
+            session (Session): The accounting session to which the Accounts belong.
+            account_type (Account.AccountType): The type of the Accounts.
+            quantity (`int`, optional): How many Account codes to reserve. Defaults to 1.
+            entity_id (`int`, optional): The id of the Entity to which the Accounts belong.
+                Defaults to the session Entity.
+
+        Raises:
+            ExhaustedAccountCodesError: If the codes would go beyond the range configured
+                for the Account type.
+
+        Returns:
+            list: The reserved Account codes, in order.
+        """
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            AccountCounter,
         )
 
+        entity_id = entity_id or session.entity.id
+        base, limit = Account.code_range(account_type)
+
+        def initial() -> int:
+            # Continue from the Accounts recorded before the counter existed
+            query = (
+                session.query(func.max(Account.account_code))
+                .filter(Account.entity_id == entity_id)
+                .filter(Account.account_type == account_type)
+                .filter(Account.account_code > base)
+                .execution_options(include_deleted=True)
+            )
+            if limit is not None:
+                query = query.filter(Account.account_code < limit)
+            return (query.scalar() or base) - base
+
+        first = base + AccountCounter.reserve(
+            session.connection(),
+            {"entity_id": entity_id, "account_type": account_type},
+            quantity,
+            initial,
+        )
+        if limit is not None and first + quantity > limit:
+            raise ExhaustedAccountCodesError(account_type, limit)
+
+        return [first + i for i in range(quantity)]
+
     def __repr__(self) -> str:
         return f"{self.account_type} {self.name} <{self.account_code}>"
 
@@ -105,26 +184,48 @@ class Account(IsolatingMixin, Recyclable):
             end date.
         """
         from python_accounting.models import (  # pylint: disable=import-outside-toplevel
-            Balance,
+            AccountMovement,
             Ledger,
         )
 
         start_date, end_date, _, _ = get_dates(session, start_date, end_date)
 
-        query = (
-            session.query(
-                func.sum(Ledger.amount).label("amount")  # pylint: disable=not-callable
+        # Whole days are read from the daily totals, partial days from the Ledger
+        first, last = AccountMovement.full_days(start_date, end_date)
+        if not config.movements["enabled"] or first > last:
+            return self._ledger_movement(
+                session,
+                Ledger.transaction_date >= start_date,
+                Ledger.transaction_date <= end_date,
+            )
+
+        movement = AccountMovement.movement(session, self, first, last)
+        if start_date < datetime.combine(first, time.min):
+            movement += self._ledger_movement(
+                session,
+                Ledger.transaction_date >= start_date,
+                Ledger.transaction_date < datetime.combine(first, time.min),
+            )
+        if end_date > datetime.combine(last, time.max):
+            movement += self._ledger_movement(
+                session,
+                Ledger.transaction_date > datetime.combine(last, time.max),
+                Ledger.transaction_date <= end_date,
             )
+        return movement
+
+    def _ledger_movement(self, session, *criteria) -> Decimal:
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            Ledger,
+        )
+
+        return (
+            session.query(signed_sum(Ledger.amount, Ledger.entry_type))
             .filter(Ledger.currency_id == self.currency_id)
-            .filter(Ledger.transaction_date >= start_date)
-            .filter(Ledger.transaction_date <= end_date)
+            .filter(*criteria)
             .filter(Ledger.post_account_id == self.id)
             .filter(Ledger.entity_id == self.entity_id)
-        )
-        return (
-            query.filter(Ledger.entry_type == Balance.BalanceType.DEBIT).scalar() or 0
-        ) - (
-            query.filter(Ledger.entry_type == Balance.BalanceType.CREDIT).scalar() or 0
+            .scalar()
         )
 
     @staticmethod
@@ -157,46 +258,13 @@ class Account(IsolatingMixin, Recyclable):
                 - closing (Decimal): The sum of opening closing of Accounts in the section.
                 - categories (dict): The Accounts belonging to the section separated by Category.
         """
-        balances = {"opening": 0, "movement": 0, "closing": 0, "categories": {}}
-        start_date, end_date, period_start, _ = get_dates(session, start_date, end_date)
-
-        for account in session.scalars(
-            select(Account).filter(Account.account_type.in_(account_types))
-        ).all():
-            account.opening = account.opening_balance(
-                session, end_date.year
-            ) + account.balance_movement(session, period_start, start_date)
-            movement = account.balance_movement(session, start_date, end_date)
-            account.closing = account.opening + movement if full_balance else movement
-            account.movement = movement * -1  # cashflow statement display
-            if account.closing != 0 or account.movement != 0:
-                category_id, category_name = (
-                    (0, Account.AccountType[account.account_type.name].value)
-                    if account.category is None
-                    else (account.category_id, account.category.name)
-                )
-                if (
-                    category_name
-                    in balances[  # pylint: disable=consider-iterating-dictionary
-                        "categories"  # pylint: disable=consider-iterating-dictionary
-                    ].keys()  # pylint: disable=consider-iterating-dictionary
-                ):
-                    balances["categories"][category_name]["total"] += account.closing
-                    balances["categories"][category_name]["accounts"].append(account)
-                else:
-                    balances["categories"].update(
-                        {
-                            category_name: {
-                                "id": category_id,
-                                "total": account.closing,
-                                "accounts": [account],
-                            }
-                        }
-                    )
-                balances["opening"] += account.opening
-                balances["movement"] += account.movement
-                balances["closing"] += account.closing
-        return balances
+        from python_accounting.reports.ledger_snapshot import (  # pylint: disable=import-outside-toplevel
+            LedgerSnapshot,
+        )
+
+        return LedgerSnapshot(session, start_date, end_date, account_types).section(
+            account_types, full_balance
+        )
 
     def opening_balance(self, session, year: int = None) -> Decimal:
         """
@@ -221,21 +289,16 @@ class Account(IsolatingMixin, Recyclable):
             if year
             else session.entity.reporting_period_id
         )
-        query = (
-            session.query(
-                func.sum(Balance.amount).label("amount")  # pylint: disable=not-callable
-            )
+        return balance_cache.fetch(
+            session,
+            self,
+            ("opening", period_id),
+            session.query(signed_sum(Balance.amount, Balance.balance_type))
             .filter(Balance.currency_id == self.currency_id)
             .filter(Balance.reporting_period_id == period_id)
             .filter(Balance.account_id == self.id)
             .filter(Balance.entity_id == self.entity_id)
-        )
-        return (
-            query.filter(Balance.balance_type == Balance.BalanceType.DEBIT).scalar()
-            or 0
-        ) - (
-            query.filter(Balance.balance_type == Balance.BalanceType.CREDIT).scalar()
-            or 0
+            .scalar,
         )
 
     def closing_balance(self, session, end_date: datetime = None) -> Decimal:
@@ -254,10 +317,432 @@ class Account(IsolatingMixin, Recyclable):
 
         start_date, end_date, _, _ = get_dates(session, None, end_date)
 
-        return self.opening_balance(session, end_date.year) + self.balance_movement(
-            session, start_date, end_date
+        return balance_cache.fetch(
+            session,
+            self,
+            ("closing", end_date),
+            lambda: self.opening_balance(session, end_date.year)
+            + self.balance_movement(session, start_date, end_date),
+        )
+
+    @staticmethod
+    def _ledger_window(start_date: datetime, end_date: datetime, *criteria):
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            Ledger,
+        )
+
+        return signed_sum(
+            case(
+                (
+                    and_(
+                        Ledger.transaction_date >= start_date,
+                        Ledger.transaction_date <= end_date,
+                        *criteria,
+                    ),
+                    Ledger.amount,
+                ),
+                else_=0,
+            ),
+            Ledger.entry_type,
+        )
+
+    @staticmethod
+    def closing_balances(  # pylint: disable=too-many-locals
+        session, account_ids: list, dates: list
+    ) -> dict:
+        """
+        Gets the closing balances of many Accounts as at each of the given dates.
+
+        The dates are grouped by Reporting Period, and the balances for all the Accounts
+        and dates in a period are found with one grouped query over the Ledger and one over
+        the opening Balances per thousand Accounts.
+
+        Args:
+            session (Session): The accounting session to which the Accounts belong.
+            account_ids (list): The ids of the Accounts.
+            dates (list): The dates as at which the balances are required.
+
+        Returns:
+            dict: The closing balance of each Account at each date, keyed by the Account
+            id and then by the date.
+        """
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            Balance,
+            Ledger,
+        )
+
+        periods = {}
+        for date in dates:
+            _, end_date, period_start, period_id = get_dates(session, None, date)
+            periods.setdefault((period_id, period_start), []).append((date, end_date))
+
+        balances = {account_id: {} for account_id in account_ids}
+        accounts = aliased(Account, flat=True)
+        ids = list(balances)
+
+        # Ids are batched to stay within the bound parameter limits of the database
+        for (period_id, period_start), period_dates in periods.items():
+            for start in range(0, len(ids), 1000):
+                batch = ids[start : start + 1000]
+                opening_balances = dict(
+                    session.query(
+                        Balance.account_id,
+                        signed_sum(Balance.amount, Balance.balance_type),
+                    )
+                    .join(accounts, accounts.id == Balance.account_id)
+                    .filter(accounts.id.in_(batch))
+                    .filter(Balance.currency_id == accounts.currency_id)
+                    .filter(Balance.reporting_period_id == period_id)
+                    .filter(Balance.entity_id == accounts.entity_id)
+                    .group_by(Balance.account_id)
+                    .all()
+                )
+                movements = {
+                    account_id: amounts
+                    for account_id, *amounts in session.query(
+                        Ledger.post_account_id,
+                        *[
+                            Account._ledger_window(period_start, end_date)
+                            for _, end_date in period_dates
+                        ],
+                    )
+                    .join(accounts, accounts.id == Ledger.post_account_id)
+                    .filter(accounts.id.in_(batch))
+                    .filter(Ledger.currency_id == accounts.currency_id)
+                    .filter(Ledger.transaction_date >= period_start)
+                    .filter(Ledger.transaction_date <= max(e for _, e in period_dates))
+                    .filter(Ledger.entity_id == accounts.entity_id)
+                    .group_by(Ledger.post_account_id)
+                }
+
+                for account_id in batch:
+                    opening = opening_balances.get(account_id, 0)
+                    for (date, _), movement in zip(
+                        period_dates,
+                        movements.get(account_id, [0] * len(period_dates)),
+                    ):
+                        balances[account_id][date] = opening + movement
+        return balances
+
+    def balance_series(  # pylint: disable=too-many-locals
+        self,
+        session,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        bucket: str = "month",
+    ) -> dict:
+        """
+        Gets the closing balances of the Account at the end of each day, week or month
+        between the given dates.
+
+        The Ledger movements are totalled by day in a single query, and cumulated on top
+        of the opening balance of each Reporting Period the dates span.
+
+        Args:
+            session (Session): The accounting session to which the Account belongs.
+            start_date (datetime): The first day of the series. Defaults to the start of
+                the current Reporting Period.
+            end_date (datetime): The last day of the series. Defaults to today.
+            bucket (`str`, optional): The length of the intervals of the series, one of
+                "day", "week" (starting on Mondays) or "month". Defaults to "month".
+
+        Raises:
+            ValueError: If the bucket is not one of the supported intervals.
+
+        Returns:
+            dict: The series as parallel lists.
+                - dates (list): The first day of each interval, the first being the start date.
+                - balances (list): The closing balance of the Account at the end of each interval.
+        """
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            AccountMovement,
+            Ledger,
+        )
+
+        steps = {
+            "day": lambda day: day,
+            "week": lambda day: day + relativedelta(weekday=SU),
+            "month": lambda day: day + relativedelta(day=31),
+        }
+        if bucket not in steps:
+            raise ValueError(f"Unsupported balance series bucket: {bucket}")
+
+        start_date, end_date, _, _ = get_dates(session, start_date, end_date)
+        series = {"dates": [], "balances": []}
+        ends = []
+        day = start_date.date()
+        while day <= end_date.date():
+            series["dates"].append(day)
+            ends.append(min(steps[bucket](day), end_date.date()))
+            day = ends[-1] + relativedelta(days=1)
+
+        periods = {}
+        for year in sorted({end.year for end in ends}):
+            _, _, period_start, period_id = get_dates(
+                session, None, datetime(year, 12, 31)
+            )
+            periods[year] = (period_start.date(), period_id)
+
+        if config.movements["enabled"]:
+            day = AccountMovement.movement_date
+            query = (
+                session.query(
+                    day,
+                    func.sum(  # pylint: disable=not-callable
+                        AccountMovement.debit - AccountMovement.credit
+                    ),
+                )
+                .filter(AccountMovement.currency_id == self.currency_id)
+                .filter(AccountMovement.account_id == self.id)
+                .filter(AccountMovement.entity_id == self.entity_id)
+            )
+        else:
+            day = func.date(Ledger.transaction_date, type_=Date)
+            query = (
+                session.query(day, signed_sum(Ledger.amount, Ledger.entry_type))
+                .filter(Ledger.currency_id == self.currency_id)
+                .filter(Ledger.post_account_id == self.id)
+                .filter(Ledger.entity_id == self.entity_id)
+            )
+        movements = iter(
+            query.filter(day >= min(start for start, _ in periods.values()))
+            .filter(day <= end_date.date())
+            .group_by(day)
+            .order_by(day)
+            .all()
+        )
+
+        # Balances start over from the opening balance of each Reporting Period
+        current, movement = None, next(movements, None)
+        for end in ends:
+            period_start, period_id = periods[end.year]
+            if period_id != current:
+                current, balance = period_id, self.opening_balance(session, end.year)
+            while movement is not None and movement[0] <= end:
+                if movement[0] >= period_start:
+                    balance += movement[1]
+                movement = next(movements, None)
+            series["balances"].append(balance)
+        return series
+
+    def _statement_query(self, session, start_date, end_date, *columns):
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            Transaction,
+            Ledger,
+        )
+
+        contributions = (
+            session.query(
+                Ledger.transaction_id,
+                signed_sum(Ledger.amount, Ledger.entry_type).label("amount"),
+            )
+            .filter(Ledger.currency_id == self.currency_id)
+            .filter(Ledger.transaction_date >= start_date)
+            .filter(Ledger.transaction_date <= end_date)
+            .filter(Ledger.post_account_id == self.id)
+            .filter(Ledger.entity_id == self.entity_id)
+            .group_by(Ledger.transaction_id)
+            .subquery()
+        )
+        order = (Transaction.transaction_date, Transaction.id)
+
+        # The running balance is accumulated by the database in the same query
+        return (
+            session.query(
+                *columns,
+                contributions.c.amount,
+                func.sum(contributions.c.amount)  # pylint: disable=not-callable
+                .over(order_by=order)
+                .label("movement"),
+            )
+            .join(contributions, contributions.c.transaction_id == Transaction.id)
+            .filter(Transaction.currency_id == self.currency_id)
+            .filter(Transaction.entity_id == self.entity_id)
+            .order_by(*order)
+        )
+
+    def iter_statement(
+        self,
+        session,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        chunk_size: int = 1000,
+    ):
+        """
+        Streams the lines of the Account's statement between the dates given.
+
+        Unlike `statement`, Transactions are not loaded as models. The lines are fetched
+        from the database a chunk at a time, so memory use does not grow with the number
+        of Transactions in the statement.
+
+        Args:
+            session (Session): The accounting session to which the Account belongs.
+            start_date (datetime): The earliest transaction date for Transaction amounts
+                to be included in the statement.
+            end_date (datetime): The latest transaction date for Transaction amounts to
+                be included in the statement.
+            chunk_size (`int`, optional): The number of lines fetched at a time.
+                Defaults to 1000.
+
+        Yields:
+            dict: A line of the statement, in chronological order.
+                - id (int): The id of the Transaction.
+                - transaction_date (datetime): The date of the Transaction.
+                - transaction_no (str): The Transaction number of the Transaction.
+                - transaction_type (TransactionType): The type of the Transaction.
+                - narration (str): The narration of the Transaction.
+                - reference (str): The reference of the Transaction.
+                - debit (Decimal): The amount debited to the Account by the Transaction.
+                - credit (Decimal): The amount credited to the Account by the Transaction.
+                - balance (Decimal): The balance of the Account after the Transaction.
+        """
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            Transaction,
+        )
+
+        start_date, end_date, _, _ = get_dates(session, start_date, end_date)
+        opening_balance = self.opening_balance(session, end_date.year)
+
+        for row in self._statement_query(
+            session, start_date, end_date, *Transaction.statement_columns()
+        ).yield_per(chunk_size):
+            line = row._asdict()
+            movement = line.pop("movement")
+            yield Account._statement_line(line, opening_balance + movement)
+
+    @staticmethod
+    def _statement_line(line: dict, balance: Decimal) -> dict:
+        contribution = line.pop("amount")
+        return dict(
+            line,
+            debit=max(contribution, 0),
+            credit=max(-contribution, 0),
+            balance=balance,
         )
 
+    def statement_page(  # pylint: disable=too-many-locals,too-many-arguments
+        self,
+        session,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        *,
+        cursor: str = None,
+        limit: int = 100,
+    ) -> dict:
+        """
+        Gets a page of the Account's statement between the dates given.
+
+        Pages are keyed on the transaction date and id of the last Transaction listed, and
+        the balance at that point is carried in the cursor, so fetching any page costs the
+        same as fetching the first. The `ix_ledger_statement` index serves this ordering.
+
+        Args:
+            session (Session): The accounting session to which the Account belongs.
+            start_date (datetime): The earliest transaction date for Transaction amounts
+                to be included in the statement.
+            end_date (datetime): The latest transaction date for Transaction amounts to
+                be included in the statement. Defaults to the end date of the cursor's
+                statement, or today for the first page.
+            cursor (`str`, optional): The cursor returned with the previous page.
+                Defaults to the first page.
+            limit (`int`, optional): The maximum number of lines in the page.
+                Defaults to 100.
+
+        Raises:
+            InvalidCursorError: If the cursor was not issued for this statement.
+
+        Returns:
+            dict: The page of the statement.
+                - brought_forward (Decimal): The balance of the Account before the page.
+                - transactions (list): The lines of the page, as yielded by `iter_statement`.
+                - carried_forward (Decimal): The balance of the Account after the page.
+                - cursor (str): The cursor of the next page, None if this is the last.
+        """
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            Transaction,
+            Ledger,
+        )
+
+        position = None if cursor is None else decode_cursor(cursor)
+        if position is not None:
+            # Omitted dates continue the statement the cursor was issued for, even
+            # after the day it was issued on has ended
+            start_date = start_date or datetime.fromisoformat(position["start_date"])
+            end_date = end_date or datetime.fromisoformat(position["end_date"])
+
+        start_date, end_date, _, _ = get_dates(session, start_date, end_date)
+        statement = {
+            "account_id": self.id,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+        }
+
+        contributions = (
+            session.query(
+                Ledger.transaction_id,
+                Ledger.transaction_date,
+                signed_sum(Ledger.amount, Ledger.entry_type).label("amount"),
+            )
+            .filter(Ledger.currency_id == self.currency_id)
+            .filter(Ledger.transaction_date >= start_date)
+            .filter(Ledger.transaction_date <= end_date)
+            .filter(Ledger.post_account_id == self.id)
+            .filter(Ledger.entity_id == self.entity_id)
+        )
+        if position is None:
+            balance = self.opening_balance(session, end_date.year)
+        else:
+            if any(position.get(key) != value for key, value in statement.items()):
+                raise InvalidCursorError
+            balance = Decimal(position["balance"])
+            after = datetime.fromisoformat(position["transaction_date"])
+            contributions = contributions.filter(
+                or_(
+                    Ledger.transaction_date > after,
+                    and_(
+                        Ledger.transaction_date == after,
+                        Ledger.transaction_id > position["transaction_id"],
+                    ),
+                )
+            )
+        contributions = (
+            contributions.group_by(Ledger.transaction_date, Ledger.transaction_id)
+            .order_by(Ledger.transaction_date, Ledger.transaction_id)
+            .limit(limit + 1)
+            .subquery()
+        )
+
+        page = {
+            "brought_forward": balance,
+            "transactions": [],
+            "carried_forward": balance,
+            "cursor": None,
+        }
+        rows = (
+            session.query(*Transaction.statement_columns(), contributions.c.amount)
+            .join(contributions, contributions.c.transaction_id == Transaction.id)
+            .order_by(contributions.c.transaction_date, contributions.c.transaction_id)
+            .all()
+        )
+        for row in rows[:limit]:
+            line = row._asdict()
+            balance += line["amount"]
+            page["transactions"].append(Account._statement_line(line, balance))
+
+        if page["transactions"]:
+            page["carried_forward"] = balance
+        if len(rows) > limit:
+            last = page["transactions"][-1]
+            page["cursor"] = encode_cursor(
+                dict(
+                    statement,
+                    transaction_date=last["transaction_date"].isoformat(),
+                    transaction_id=last["id"],
+                    balance=str(balance),
+                )
+            )
+        return page
+
     def statement(  # pylint: disable=too-many-locals
         self,
         session,
@@ -328,95 +813,86 @@ class Account(IsolatingMixin, Recyclable):
                 "closing_balance": 0,
             }
         )
-        balances = []
-
-        with warnings.catch_warnings():
-            warnings.filterwarnings(
-                "ignore", "SELECT statement has a cartesian product.*", exc.SAWarning
-            )
-            ledger = aliased(Ledger, flat=True)
-            transactions = (
-                session.query(Transaction)
-                .join(ledger, ledger.transaction_id == Transaction.id)
-                .filter(Transaction.currency_id == self.currency_id)
-                .filter(Transaction.transaction_date <= end_date)
-                .filter(
-                    or_(
-                        ledger.post_account_id == self.id,
-                        ledger.folio_account_id == self.id,
-                    )
+        if not schedule:
+            for transaction, contribution, movement in self._statement_query(
+                session, start_date, end_date, Transaction
+            ):
+                transaction.balance = statement["opening_balance"] + movement
+                transaction.debit, transaction.credit = (
+                    (0, abs(contribution))
+                    if contribution < 0
+                    else (contribution, 0)
                 )
-                .filter(Transaction.entity_id == self.entity_id)
-                .filter(Ledger.entity_id == self.entity_id)
-            )
-            if schedule:
-                transactions = transactions.filter(
-                    Transaction.transaction_type.in_(Assignment.clearables)
+                statement["closing_balance"] = transaction.balance
+                statement["transactions"].append(transaction)
+            return statement
+
+        ledger = aliased(Ledger, flat=True)
+        transactions = (
+            session.query(Transaction)
+            .join(ledger, ledger.transaction_id == Transaction.id)
+            .filter(Transaction.currency_id == self.currency_id)
+            .filter(Transaction.transaction_date <= end_date)
+            .filter(
+                or_(
+                    ledger.post_account_id == self.id,
+                    ledger.folio_account_id == self.id,
                 )
+            )
+            .filter(Transaction.entity_id == self.entity_id)
+            .filter(ledger.entity_id == self.entity_id)
+            .filter(Transaction.transaction_type.in_(Assignment.clearables))
+        )
+        balances = (
+            session.query(Balance)
+            .filter(Balance.account_id == self.id)
+            .filter(Balance.reporting_period_id == period_id)
+            .filter(Balance.entity_id == self.entity_id)
+            .order_by(Balance.transaction_date)
+        )
 
-                balances = (
-                    session.query(Balance)
-                    .filter(Balance.account_id == self.id)
-                    .filter(Balance.reporting_period_id == period_id)
-                    .filter(Balance.entity_id == self.entity_id)
-                    .order_by(Balance.transaction_date)
-                )
-            else:
-                transactions = transactions.filter(
-                    Transaction.transaction_date >= start_date
-                )
-                balance = statement["opening_balance"]
+        clearables = list(balances) + list(
+            transactions.order_by(Transaction.transaction_date).distinct()
+        )
+        cleared_amounts = ClearingMixin.cleared_amounts(session, clearables)
 
-            for transaction in list(balances) + list(
-                transactions.order_by(Transaction.transaction_date).distinct()
-            ):
-                if schedule:
-                    cleared = transaction.cleared(session)
-                    if (
-                        transaction.amount  # pylint: disable=too-many-boolean-expressions
-                        - cleared
-                        == 0
+        for transaction in clearables:
+            cleared = cleared_amounts.get(
+                (transaction.id, transaction.__class__.__name__), 0
+            )
+            if (
+                transaction.amount  # pylint: disable=too-many-boolean-expressions
+                - cleared
+                == 0
+                or (
+                    transaction.transaction_type
+                    == Transaction.TransactionType.JOURNAL_ENTRY
+                    and (
+                        (
+                            self.account_type == Account.AccountType.RECEIVABLE
+                            and transaction.credited
+                        )
                         or (
-                            transaction.transaction_type
-                            == Transaction.TransactionType.JOURNAL_ENTRY
-                            and (
-                                (
-                                    self.account_type == Account.AccountType.RECEIVABLE
-                                    and transaction.credited
-                                )
-                                or (
-                                    self.account_type == Account.AccountType.PAYABLE
-                                    and not transaction.credited
-                                )
-                            )
+                            self.account_type == Account.AccountType.PAYABLE
+                            and not transaction.credited
                         )
-                    ):
-                        continue
-                    (
-                        transaction.cleared_amount,
-                        transaction.uncleared_amount,
-                        transaction.age,
-                    ) = (
-                        cleared,
-                        transaction.amount - cleared,
-                        (end_date - transaction.transaction_date).days,
                     )
-                    statement["total_amount"] += transaction.amount
-                    statement["cleared_amount"] += transaction.cleared_amount
-                    statement["uncleared_amount"] += transaction.uncleared_amount
-                else:
-                    contribution = transaction.contribution(session, self)
-                    balance += contribution
-                    transaction.balance = balance
-
-                    transaction.debit, transaction.credit = (
-                        (0, abs(contribution))
-                        if contribution < 0
-                        else (contribution, 0)
-                    )
-                    statement["closing_balance"] = balance
-
-                statement["transactions"].append(transaction)
+                )
+            ):
+                continue
+            (
+                transaction.cleared_amount,
+                transaction.uncleared_amount,
+                transaction.age,
+            ) = (
+                cleared,
+                transaction.amount - cleared,
+                (end_date - transaction.transaction_date).days,
+            )
+            statement["total_amount"] += transaction.amount
+            statement["cleared_amount"] += transaction.cleared_amount
+            statement["uncleared_amount"] += transaction.uncleared_amount
+            statement["transactions"].append(transaction)
 
         return statement
 
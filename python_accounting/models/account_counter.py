@@ -0,0 +1,31 @@
+# models/account_counter.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Represents the code counter of an Account type.
+
+"""
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, UniqueConstraint
+from python_accounting.mixins import IsolatingMixin, CountingMixin
+from python_accounting.models import Base
+
+
+class AccountCounter(IsolatingMixin, CountingMixin, Base):
+    """
+    Represents the offset of the last Account code allocated for an Account type.
+    (Should never have to be invoked directly).
+    """
+
+    __tablename__ = "account_counter"
+    __table_args__ = (UniqueConstraint("entity_id", "account_type"),)
+
+    account_type: Mapped[str] = mapped_column(String(255))
+    """(str): The label of the Account type being counted."""
+
+    def __repr__(self) -> str:
+        return f"{self.account_type}: {self.count}"
@@ -0,0 +1,217 @@
+# models/account_movement.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Represents the total debit and credit amounts posted to an Account in a day.
+
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    Date,
+    ForeignKey,
+    UniqueConstraint,
+    case,
+    delete,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.types import DECIMAL
+from python_accounting.mixins import IsolatingMixin
+from python_accounting.models import Base, Balance, Ledger
+
+
+class AccountMovement(IsolatingMixin, Base):
+    """
+    Represents the daily totals of the Ledgers posted to an Account, which are maintained
+    when `config.movements["enabled"]` is set. (Should never have to be invoked directly).
+    """
+
+    __tablename__ = "account_movement"
+    __table_args__ = (
+        UniqueConstraint("entity_id", "account_id", "currency_id", "movement_date"),
+    )
+
+    movement_date: Mapped[date] = mapped_column(Date)
+    """(date): The day of the Ledgers included in the totals."""
+    debit: Mapped[Decimal] = mapped_column(DECIMAL(precision=13, scale=4), default=0)
+    """(Decimal): The total amount debited to the Account on the day."""
+    credit: Mapped[Decimal] = mapped_column(DECIMAL(precision=13, scale=4), default=0)
+    """(Decimal): The total amount credited to the Account on the day."""
+    account_id: Mapped[int] = mapped_column(
+        ForeignKey("account.id", ondelete="CASCADE")
+    )
+    """(int): The id of the Account to which the Ledgers were posted."""
+    currency_id: Mapped[int] = mapped_column(
+        ForeignKey("currency.id", ondelete="RESTRICT")
+    )
+    """(int): The id of the Currency of the Ledgers."""
+
+    def __repr__(self) -> str:
+        return f"{self.movement_date} <{self.account_id}>: {self.debit} {self.credit}"
+
+    @staticmethod
+    def record(connection, ledgers: list) -> None:
+        """
+        Add the amounts of the given Ledgers to the daily totals of their Accounts.
+
+        Args:
+            connection (Connection): The database connection of the accounting session.
+            ledgers (list): The Ledgers being posted.
+
+        Returns:
+            None
+        """
+        totals = {}
+        for ledger in ledgers:
+            key = (
+                ledger.entity_id,
+                ledger.post_account_id,
+                ledger.currency_id,
+                ledger.transaction_date.date(),
+            )
+            debit, credit = totals.get(key, (0, 0))
+            if ledger.entry_type == Balance.BalanceType.DEBIT:
+                debit += ledger.amount
+            else:
+                credit += ledger.amount
+            totals[key] = (debit, credit)
+
+        for (entity_id, account_id, currency_id, day), (debit, credit) in totals.items():
+            key = {
+                "entity_id": entity_id,
+                "account_id": account_id,
+                "currency_id": currency_id,
+                "movement_date": day,
+            }
+            criteria = [
+                getattr(AccountMovement, column) == value for column, value in key.items()
+            ]
+            while not connection.execute(
+                update(AccountMovement)
+                .where(*criteria)
+                .values(
+                    debit=AccountMovement.debit + debit,
+                    credit=AccountMovement.credit + credit,
+                )
+            ).rowcount:
+                try:
+                    with connection.begin_nested():
+                        connection.execute(
+                            insert(AccountMovement).values(
+                                **key, debit=debit, credit=credit
+                            )
+                        )
+                    break
+                except IntegrityError:
+                    # Another session recorded the day first
+                    continue
+
+    @staticmethod
+    def rebuild(session) -> int:
+        """
+        Regenerate the daily totals of the session Entity's Accounts from the Ledger.
+
+        This should be run after enabling `config.movements`, or if Ledgers have been
+        changed outside of posting.
+
+        Args:
+            session (Session): The accounting session whose Entity's totals are rebuilt.
+
+        Returns:
+            int: The number of daily totals recorded.
+        """
+        day = func.date(Ledger.transaction_date, type_=Date)
+        rows = session.execute(
+            select(
+                Ledger.post_account_id.label("account_id"),
+                Ledger.currency_id,
+                day.label("movement_date"),
+                func.sum(
+                    case(
+                        (Ledger.entry_type == Balance.BalanceType.DEBIT, Ledger.amount),
+                        else_=0,
+                    )
+                ).label("debit"),
+                func.sum(
+                    case(
+                        (Ledger.entry_type == Balance.BalanceType.CREDIT, Ledger.amount),
+                        else_=0,
+                    )
+                ).label("credit"),
+            ).group_by(Ledger.post_account_id, Ledger.currency_id, day)
+        ).all()
+
+        connection = session.connection()
+        connection.execute(
+            delete(AccountMovement).where(
+                AccountMovement.entity_id == session.entity.id
+            )
+        )
+        if rows:
+            connection.execute(
+                insert(AccountMovement),
+                [dict(row._asdict(), entity_id=session.entity.id) for row in rows],
+            )
+        session.commit()
+        return len(rows)
+
+    @staticmethod
+    def full_days(start_date: datetime, end_date: datetime) -> tuple:
+        """
+        Get the first and last days that fall entirely within the given dates.
+
+        Args:
+            start_date (datetime): The earliest transaction date of the range.
+            end_date (datetime): The latest transaction date of the range.
+
+        Returns:
+            tuple: The first and last whole days, the first being after the last if the
+            range does not contain a whole day.
+        """
+        first = start_date.date()
+        if start_date.time() != time.min:
+            first += timedelta(days=1)
+
+        last = end_date.date()
+        if end_date.time() != time.max:
+            last -= timedelta(days=1)
+
+        return first, last
+
+    @staticmethod
+    def movement(session, account, first: date, last: date) -> Decimal:
+        """
+        Get the net movement of the Account's balance over the given days.
+
+        Args:
+            session (Session): The accounting session to which the Account belongs.
+            account (Account): The Account whose balance movement is to be found.
+            first (date): The first day included in the movement.
+            last (date): The last day included in the movement.
+
+        Returns:
+            Decimal: The total debits less the total credits of the Account over the days.
+        """
+        return (
+            session.query(
+                func.sum(  # pylint: disable=not-callable
+                    AccountMovement.debit - AccountMovement.credit
+                )
+            )
+            .filter(AccountMovement.currency_id == account.currency_id)
+            .filter(AccountMovement.movement_date >= first)
+            .filter(AccountMovement.movement_date <= last)
+            .filter(AccountMovement.account_id == account.id)
+            .filter(AccountMovement.entity_id == account.entity_id)
+            .scalar()
+            or 0
+        )
@@ -13,7 +13,7 @@ import importlib
 from decimal import Decimal
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey, func, String
+from sqlalchemy import ForeignKey, Index, func, String
 from sqlalchemy.types import DECIMAL
 from python_accounting.mixins import IsolatingMixin
 from python_accounting.models import Balance, Transaction, Base
@@ -54,6 +54,11 @@ class Assignment(IsolatingMixin, Base):
     that can have cleareable Transactions assigned to them.
     """
 
+    __table_args__ = (
+        Index("ix_assignment_assigned", "assigned_id", "assigned_type"),
+        Index("ix_assignment_transaction", "transaction_id"),
+    )
+
     assignment_date: Mapped[datetime] = mapped_column()
     """(datetime): The date of the Assignment."""
     transaction_id: Mapped[int] = mapped_column(
@@ -12,7 +12,7 @@ Represents the amount outstanding on a Transaction from a previous Reporting Per
 from datetime import datetime
 from decimal import Decimal
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, ForeignKey, Enum, select
+from sqlalchemy import String, ForeignKey, Enum, Index, select
 from sqlalchemy.types import DECIMAL
 from strenum import StrEnum
 from python_accounting.models import (
@@ -50,6 +50,9 @@ class Balance(IsolatingMixin, ClearingMixin, Recyclable):
     )
     """(StrEnum): A list of Transaction Types that can have Balances."""
 
+    __table_args__ = (
+        Index("ix_balance_account_period", "account_id", "reporting_period_id"),
+    )
     __mapper_args__ = {"polymorphic_identity": "Balance"}
 
     id: Mapped[int] = mapped_column(ForeignKey("recyclable.id"), primary_key=True)
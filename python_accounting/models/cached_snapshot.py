@@ -0,0 +1,213 @@
+# models/cached_snapshot.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Represents the stored Account balances of a report snapshot.
+
+"""
+import hashlib
+import json
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.pool import SingletonThreadPool, StaticPool
+from sqlalchemy import String, Text, UniqueConstraint, delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from python_accounting.config import config
+from python_accounting.mixins import IsolatingMixin
+from python_accounting.models import Base, LedgerWatermark
+
+
+class CachedSnapshot(IsolatingMixin, Base):
+    """
+    Represents the opening and movement balances of an Entity's Accounts between two dates,
+    stored against the Ledger watermark of the Reporting Periods the dates span when
+    `config.cache["snapshots"]` is set. Postings to other Reporting Periods leave the
+    snapshot valid, so those of closed periods are kept indefinitely. (Should never have to
+    be invoked directly).
+
+    The balances of every Account are stored, and each financial statement derives its
+    sections from them when it is generated, so snapshots are shared by all report types.
+    They are sums of Ledgers and opening Balances alone, which Assignments do not change.
+    Their fingerprint covers the Account types configured and the start of the Reporting
+    Period they were aggregated for.
+    """
+
+    __tablename__ = "cached_snapshot"
+    __table_args__ = (
+        UniqueConstraint("entity_id", "start_date", "end_date", "fingerprint"),
+    )
+
+    first_year: Mapped[int] = mapped_column()
+    """(int): The calendar year of the earliest Reporting Period the snapshot spans."""
+    last_year: Mapped[int] = mapped_column()
+    """(int): The calendar year of the latest Reporting Period the snapshot spans."""
+    start_date: Mapped[datetime] = mapped_column()
+    """(datetime): The earliest transaction date of the snapshot."""
+    end_date: Mapped[datetime] = mapped_column()
+    """(datetime): The latest transaction date of the snapshot."""
+    fingerprint: Mapped[str] = mapped_column(String(64))
+    """(str): The hash of the configuration and Reporting Period of the snapshot."""
+    watermark: Mapped[int] = mapped_column()
+    """(int): The Ledger watermark of the Reporting Periods when the snapshot was aggregated."""
+    balances: Mapped[str] = mapped_column(Text)
+    """(str): The opening and movement balances of the Accounts, serialized as JSON."""
+    stored_at: Mapped[datetime] = mapped_column()
+    """(datetime): When the snapshot was stored."""
+
+    def __repr__(self) -> str:
+        return f"{self.start_date} - {self.end_date} <{self.watermark}>"
+
+    @staticmethod
+    def key(session, snapshot) -> dict:
+        """
+        Get the key of the stored balances of a report snapshot, including the current
+        watermark of the Reporting Periods it spans. The key is taken before the snapshot is
+        aggregated, so that balances are never stored against changes committed meanwhile.
+
+        Args:
+            session (Session): The accounting session of the snapshot.
+            snapshot (LedgerSnapshot): The snapshot, of all Account types.
+
+        Returns:
+            dict: The key of the snapshot, or None if snapshots are not stored.
+        """
+        if not config.cache["snapshots"] or session.info.get("ledger_changed"):
+            return None
+
+        first_year, last_year = snapshot.calendar_years
+        fingerprint = hashlib.sha256(
+            json.dumps(
+                {
+                    "account_types": sorted(config.accounts["types"]),
+                    "period_start": snapshot.period_start.isoformat(),
+                }
+            ).encode()
+        ).hexdigest()
+        return {
+            "entity_id": session.entity.id,
+            "first_year": first_year,
+            "last_year": last_year,
+            "start_date": snapshot.start_date,
+            "end_date": snapshot.end_date,
+            "fingerprint": fingerprint,
+            "watermark": LedgerWatermark.current(
+                session.connection(), session.entity.id, last_year, first_year
+            ),
+        }
+
+    @staticmethod
+    def fetch(session, key: dict) -> dict:
+        """
+        Get the stored balances of the snapshot, if the Ledger of the Reporting Periods it
+        spans has not changed since. Nothing is written to the database.
+
+        Args:
+            session (Session): The accounting session of the snapshot.
+            key (dict): The key of the snapshot, as returned by `CachedSnapshot.key`.
+
+        Returns:
+            dict: The opening and movement balances by Account id, or None if there are none
+            valid for the current Ledger watermark.
+        """
+        if key is None:
+            return None
+
+        balances = (
+            session.connection()
+            .execute(
+                select(CachedSnapshot.balances).where(
+                    *[
+                        getattr(CachedSnapshot, column) == value
+                        for column, value in key.items()
+                    ]
+                )
+            )
+            .scalar()
+        )
+        if balances is None:
+            return None
+
+        return {
+            int(account_id): (Decimal(opening), Decimal(movement))
+            for account_id, (opening, movement) in json.loads(balances).items()
+        }
+
+    @staticmethod
+    def store(session, key: dict, balances: dict) -> None:
+        """
+        Store the balances of the snapshot, and evict stale and least recently stored ones.
+
+        Snapshots of the same Reporting Periods whose watermark is behind the one they were
+        aggregated at can never be fetched again and are removed, as are the least recently
+        stored beyond `config.cache["snapshots"]`. They are committed in a transaction of
+        their own, so that sessions which only read reports still store them, unless the
+        session has flushed changes that the transaction could wait on or its engine shares
+        a single connection. Balances stored apart outlive a rollback of the session, which
+        leaves them valid since they only include changes committed before it.
+
+        Args:
+            session (Session): The accounting session of the snapshot.
+            key (dict): The key of the snapshot, as returned by `CachedSnapshot.key`.
+            balances (dict): The opening and movement balances by Account id.
+
+        Returns:
+            None
+        """
+        if key is None or session.info.get("ledger_changed"):
+            return
+
+        snapshot = dict(
+            key,
+            balances=json.dumps(
+                {
+                    account_id: [str(opening), str(movement)]
+                    for account_id, (opening, movement) in balances.items()
+                }
+            ),
+            stored_at=datetime.now(),
+        )
+
+        bind = session.get_bind()
+        if (
+            isinstance(bind, Engine)
+            and not isinstance(bind.pool, (SingletonThreadPool, StaticPool))
+            and not session.info.get("flushed")
+        ):
+            with bind.begin() as connection:
+                CachedSnapshot._write(connection, snapshot)
+        else:
+            CachedSnapshot._write(session.connection(), snapshot)
+
+    @staticmethod
+    def _write(connection, snapshot: dict) -> None:
+        entity_id = snapshot["entity_id"]
+        connection.execute(
+            delete(CachedSnapshot).where(
+                CachedSnapshot.entity_id == entity_id,
+                CachedSnapshot.first_year == snapshot["first_year"],
+                CachedSnapshot.last_year == snapshot["last_year"],
+                CachedSnapshot.watermark < snapshot["watermark"],
+            )
+        )
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(CachedSnapshot).values(**snapshot))
+        except IntegrityError:
+            # The snapshot is already stored, by another session
+            pass
+
+        evicted = connection.execute(
+            select(CachedSnapshot.id)
+            .where(CachedSnapshot.entity_id == entity_id)
+            .order_by(CachedSnapshot.stored_at.desc(), CachedSnapshot.id.desc())
+            .offset(config.cache["snapshots"])
+        ).scalars()
+        connection.execute(
+            delete(CachedSnapshot).where(CachedSnapshot.id.in_(evicted.all()))
+        )
@@ -0,0 +1,56 @@
+# models/id_counter.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Represents the counter of the primary keys allocated for rows inserted in bulk into a table.
+
+"""
+from sqlalchemy import String, func, select
+from sqlalchemy.orm import Mapped, mapped_column
+from python_accounting.mixins import CountingMixin
+from python_accounting.models import Base
+
+
+class IdCounter(CountingMixin, Base):
+    """
+    Represents the last primary key reserved for a table on databases that cannot return the
+    ids of the rows inserted by an executemany statement. (Should never have to be invoked
+    directly).
+    """
+
+    __tablename__ = "id_counter"
+
+    table_name: Mapped[str] = mapped_column(String(255), unique=True)
+    """(str): The name of the table whose primary keys are counted."""
+
+    def __repr__(self) -> str:
+        return f"{self.table_name}: {self.count}"
+
+    @classmethod
+    def reserve_ids(cls, connection, table, quantity: int) -> list:
+        """
+        Reserve a block of consecutive primary keys for rows to be inserted into a table.
+
+        Rows inserted one at a time take their primary keys from the table itself, so the
+        counter is first moved past the largest one in use.
+
+        Args:
+            connection (Connection): The database connection of the accounting session.
+            table (Table): The table into which the rows are to be inserted.
+            quantity (int): The number of primary keys to reserve.
+
+        Returns:
+            list: The reserved primary keys.
+        """
+        key = {"table_name": table.name}
+        cls.skip_to(
+            connection,
+            key,
+            connection.execute(select(func.max(table.c.id))).scalar() or 0,
+        )
+        first = cls.reserve(connection, key, quantity)
+        return list(range(first, first + quantity))
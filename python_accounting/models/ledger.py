@@ -14,7 +14,7 @@ from datetime import datetime
 from copy import deepcopy
 from decimal import Decimal
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, ForeignKey, Enum, select
+from sqlalchemy import String, ForeignKey, Enum, Index, select
 from sqlalchemy.types import DECIMAL
 from strenum import StrEnum
 from python_accounting.mixins import IsolatingMixin
@@ -27,6 +27,27 @@ class Ledger(  # pylint: disable=too-many-instance-attributes
 ):
     """Represents an entry in the Ledger. (Should never have to be invoked directly)."""
 
+    __table_args__ = (
+        Index(
+            "ix_ledger_posting",
+            "entity_id",
+            "post_account_id",
+            "currency_id",
+            "transaction_date",
+            "entry_type",
+        ),
+        # Keyset ordering of Account.statement_page
+        Index(
+            "ix_ledger_statement",
+            "entity_id",
+            "post_account_id",
+            "currency_id",
+            "transaction_date",
+            "transaction_id",
+        ),
+        Index("ix_ledger_folio", "entity_id", "folio_account_id"),
+        Index("ix_ledger_transaction", "transaction_id"),
+    )
     __mapper_args__ = {"polymorphic_identity": "Ledger"}
 
     id: Mapped[int] = mapped_column(ForeignKey("recyclable.id"), primary_key=True)
@@ -38,7 +59,10 @@ class Ledger(  # pylint: disable=too-many-instance-attributes
     amount: Mapped[Decimal] = mapped_column(DECIMAL(precision=13, scale=4))
     """(Decimal): The amount posted to the Ledger by the entry."""
     hash: Mapped[str] = mapped_column(String(500), nullable=True)
-    """(str): The encoded contents of the Ledger entry."""
+    """
+    (str): The encoded contents of the Ledger entry, chained to the hash of the
+    Ledger preceding it.
+    """
     transaction_id: Mapped[int] = mapped_column(
         ForeignKey("transaction.id", ondelete="RESTRICT")
     )
@@ -83,77 +107,40 @@ class Ledger(  # pylint: disable=too-many-instance-attributes
          {self.amount}"""
 
     @staticmethod
-    def _allocate_amount(  # pylint: disable=too-many-arguments
-        session, post, amount, posts, folios, transaction, entry_type
-    ) -> None:
-        if amount == 0:
-            posts.pop(0)
-            return Ledger._make_compound_ledgers(
-                session, posts, folios, transaction, entry_type
-            )
-        folio, folio_amount = folios[0]
-        ledger = Ledger(
-            transaction_id=transaction.id,
-            currency_id=transaction.currency_id,
-            transaction_date=transaction.transaction_date,
-            entity_id=transaction.entity_id,
-            entry_type=entry_type,
-            post_account_id=post,
-            folio_account_id=folio,
-        )
-
-        if folio_amount > amount:
-            ledger.amount = amount
-            folios[0][1] -= amount
-            amount = 0
-        else:
-            ledger.amount = folio_amount
-            amount -= folio_amount
-            folios.pop(0)
-
-        session.add(ledger)
-        session.commit()
-
-        return Ledger._allocate_amount(
-            session, post, amount, posts, folios, transaction, entry_type
-        )
-
-    @staticmethod
-    def _make_compound_ledgers(
-        session,
+    def _compound_ledgers(
+        transaction: Transaction,
         posts: list,
         folios: list,
-        transaction: Transaction,
         entry_type: Balance.BalanceType,
-    ) -> None:
-        if posts == []:
-            return None
-        post, post_amount = posts[0]
-        return Ledger._allocate_amount(
-            session, post, post_amount, posts, folios, transaction, entry_type
-        )
+    ) -> list:
+        ledgers = []
+        folio_index = 0
+        folio_amounts = [amount for _, amount in folios]
 
-    @staticmethod
-    def _post_compound(session, transaction: Transaction) -> None:
-        # Debit amounts ledgers
-        debit_ledgers, credit_ledgers = transaction.get_compound_entries()
-        Ledger._make_compound_ledgers(
-            session,
-            debit_ledgers,
-            credit_ledgers,
-            transaction,
-            Balance.BalanceType.DEBIT,
-        )
+        for post, amount in posts:
+            while amount != 0:
+                folio, folio_amount = folios[folio_index][0], folio_amounts[folio_index]
+                ledger = Ledger(
+                    transaction_id=transaction.id,
+                    currency_id=transaction.currency_id,
+                    transaction_date=transaction.transaction_date,
+                    entity_id=transaction.entity_id,
+                    entry_type=entry_type,
+                    post_account_id=post,
+                    folio_account_id=folio,
+                )
 
-        # Credit amounts ledgers
-        debit_ledgers, credit_ledgers = transaction.get_compound_entries()
-        Ledger._make_compound_ledgers(
-            session,
-            credit_ledgers,
-            debit_ledgers,
-            transaction,
-            Balance.BalanceType.CREDIT,
-        )
+                if folio_amount > amount:
+                    ledger.amount = amount
+                    folio_amounts[folio_index] -= amount
+                    amount = 0
+                else:
+                    ledger.amount = folio_amount
+                    amount -= folio_amount
+                    folio_index += 1
+
+                ledgers.append(ledger)
+        return ledgers
 
     @staticmethod
     def _transaction_ledgers(transaction: Transaction) -> tuple:
@@ -173,7 +160,8 @@ class Ledger(  # pylint: disable=too-many-instance-attributes
         return post, folio
 
     @staticmethod
-    def _post_simple(session, transaction: Transaction) -> None:
+    def _simple_ledgers(transaction: Transaction) -> list:
+        ledgers = []
         for line_item in transaction.line_items:
             amount = line_item.amount * line_item.quantity
             post, folio = Ledger._transaction_ledgers(transaction)
@@ -199,12 +187,7 @@ class Ledger(  # pylint: disable=too-many-instance-attributes
                 tax_post.folio_account_id = tax_folio.post_account_id = (
                     line_item.tax.account_id
                 )
-
-                session.add(tax_post)
-                session.flush()
-
-                session.add(tax_folio)
-                session.flush()
+                ledgers.extend([tax_post, tax_folio])
 
             post.tax_id = folio.tax_id = line_item.tax_id
             post.amount = folio.amount = amount
@@ -212,58 +195,124 @@ class Ledger(  # pylint: disable=too-many-instance-attributes
             post.post_account_id = folio.folio_account_id = transaction.account_id
             post.folio_account_id = folio.post_account_id = line_item.account_id
 
-            session.add(post)
-            session.flush()
+            ledgers.extend([post, folio])
+        return ledgers
 
-            session.add(folio)
-            session.commit()
+    @staticmethod
+    def entries(transaction: Transaction) -> list:
+        """
+        Builds the Ledgers for the Transaction in memory, without adding them to a session.
+
+        Args:
+            transaction (Transaction): The Transaction whose Ledgers are to be built.
+
+        Returns:
+            list: The Ledgers of the Transaction, in the order in which they are posted.
+        """
+        if not transaction.compound:
+            return Ledger._simple_ledgers(transaction)
+
+        debit_ledgers, credit_ledgers = transaction.get_compound_entries()
+        return (
+            # Debit amounts ledgers
+            Ledger._compound_ledgers(
+                transaction, debit_ledgers, credit_ledgers, Balance.BalanceType.DEBIT
+            )
+            # Credit amounts ledgers
+            + Ledger._compound_ledgers(
+                transaction, credit_ledgers, debit_ledgers, Balance.BalanceType.CREDIT
+            )
+        )
 
     @staticmethod
     def post(session, transaction: Transaction) -> None:
         """
         Posts the Transaction to the ledger.
 
+        The Ledgers for all of the Transaction's Line Items are built in memory and
+        written to the database together, in a single flush and commit. The daily Account
+        movement totals are updated in the same commit if `config.movements` is enabled.
+
         Args:
             session (Session): The accounting session to which the Account belongs.
             transaction (Transaction): The Transaction to be posted.
         """
-        if transaction.compound:
-            Ledger._post_compound(session, transaction)
-        else:
-            Ledger._post_simple(session, transaction)
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            AccountMovement,
+        )
+
+        ledgers = Ledger.entries(transaction)
+        session.add_all(ledgers)
+        if config.movements["enabled"]:
+            AccountMovement.record(session.connection(), ledgers)
+        session.commit()
 
-    def get_hash(self, connection) -> None:
+    @staticmethod
+    def chain_tail(connection, before_id: int = None) -> str:
+        """
+        Get the hash of the latest Ledger in the hash chain.
+
+        Args:
+            connection (Connection): The database connection of the accounting session.
+            before_id (`int`, optional): Only consider Ledgers recorded before this id.
+                Defaults to all Ledgers.
+
+        Returns:
+            str: The hash of the latest Ledger, or the hashing salt if there is none.
+        """
+        query = select(Ledger.hash).order_by(Ledger.id.desc()).limit(1)
+        if before_id is not None:
+            query = query.where(Ledger.id < before_id)
+
+        return connection.execute(query).scalar() or config.hashing["salt"]
+
+    def get_hash(self, connection, previous: str = None) -> str:
         """
         Calculate the hash of the Ledger.
 
         Args:
             connection (Connection): The database connection of the accounting session
-            to which the Ledger belongs.
+                to which the Ledger belongs.
+            previous (`str`, optional): The hash of the preceding Ledger in the chain.
+                Looked up from the database if not given.
 
         Returns:
-            None
+            str: The hash of the Ledger.
         """
-        last = connection.execute(
-            select(Ledger).where(Ledger.id == self.id - 1)
-        ).fetchone()
+        if previous is None:
+            previous = Ledger.chain_tail(connection, self.id)
+
+        return Ledger.compute_hash(self, previous)
 
+    @staticmethod
+    def compute_hash(ledger, previous: str) -> str:
+        """
+        Calculate the hash of a Ledger's contents, chained to the given previous hash.
+
+        Args:
+            ledger (Ledger): The Ledger, or a database row with the Ledger's columns.
+            previous (str): The hash of the preceding Ledger in the chain.
+
+        Returns:
+            str: The hash of the Ledger.
+        """
         return getattr(hashlib, config.hashing["algorithm"])(
             ",".join(
                 list(
                     map(
                         str,
                         [
-                            self.transaction_date.replace(microsecond=0),
-                            self.entry_type,
-                            round(Decimal(self.amount), 4).normalize(),
-                            last.hash if last else config.hashing["salt"],
-                            self.entity_id,
-                            self.transaction_id,
-                            self.currency_id,
-                            self.post_account_id,
-                            self.folio_account_id,
-                            self.line_item_id,
-                            self.tax_id,
+                            ledger.transaction_date.replace(microsecond=0),
+                            ledger.entry_type,
+                            round(Decimal(ledger.amount), 4).normalize(),
+                            previous,
+                            ledger.entity_id,
+                            ledger.transaction_id,
+                            ledger.currency_id,
+                            ledger.post_account_id,
+                            ledger.folio_account_id,
+                            ledger.line_item_id,
+                            ledger.tax_id,
                         ],
                     )
                 )
@@ -0,0 +1,167 @@
+# models/ledger_checkpoint.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Represents a trusted point in the Ledger hash chain.
+
+"""
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Boolean, String, ForeignKey, insert, select, func
+from python_accounting.config import config
+from python_accounting.models import Base, Ledger
+
+
+class LedgerCheckpoint(Base):
+    """
+    Represents the running hash of the Ledger chain, recorded every
+    `config.hashing["checkpoint_interval"]` Ledgers. (Should never have to be invoked directly).
+    """
+
+    __tablename__ = "ledger_checkpoint"
+
+    ledger_id: Mapped[int] = mapped_column(
+        ForeignKey("ledger.id", ondelete="RESTRICT"), unique=True
+    )
+    """(int): The id of the Ledger at which the checkpoint was recorded."""
+    hash: Mapped[str] = mapped_column(String(500))
+    """(str): The hash of the Ledger at which the checkpoint was recorded."""
+    legacy: Mapped[bool] = mapped_column(Boolean, default=False)
+    """
+    (bool): Whether the checkpoint marks the cut-over from Ledgers hashed before the hash
+    chain was continuous, each of which is chained to the Ledger with the preceding id if
+    there is one and to the hashing salt otherwise.
+    """
+
+    def __repr__(self) -> str:
+        return f"Ledger <{self.ledger_id}>: {self.hash}"
+
+    @staticmethod
+    def chain_state(connection) -> tuple:
+        """
+        Get the state of the Ledger hash chain from which new Ledgers are continued.
+
+        Args:
+            connection (Connection): The database connection of the accounting session.
+
+        Returns:
+            tuple: The hash of the latest Ledger (or the hashing salt if there is none) and
+            the number of Ledgers recorded since the latest checkpoint.
+        """
+        tail = select(Ledger.hash).order_by(Ledger.id.desc()).limit(1).scalar_subquery()
+        if not config.hashing["checkpoint_interval"]:
+            return connection.execute(select(tail)).scalar() or config.hashing["salt"], 0
+
+        latest = select(
+            func.coalesce(func.max(LedgerCheckpoint.ledger_id), 0)
+        ).scalar_subquery()
+        pending = (
+            select(func.count(Ledger.id))  # pylint: disable=not-callable
+            .where(Ledger.id > latest)
+            .scalar_subquery()
+        )
+        previous, count = connection.execute(select(tail, pending)).one()
+        return previous or config.hashing["salt"], count
+
+    @staticmethod
+    def cutover(connection) -> int:
+        """
+        Get the last Ledger hashed before the hash chain was continuous.
+
+        Args:
+            connection (Connection): The database connection of the accounting session.
+
+        Returns:
+            int: The id of the Ledger at the legacy checkpoint, or 0 if there is none.
+        """
+        return (
+            connection.execute(
+                select(func.max(LedgerCheckpoint.ledger_id)).where(
+                    LedgerCheckpoint.legacy.is_(True)
+                )
+            ).scalar()
+            or 0
+        )
+
+    @staticmethod
+    def record_cutover(connection) -> int:
+        """
+        Record a legacy checkpoint at the latest Ledger of a database upgraded from a version
+        without a continuous hash chain, so that its existing Ledgers continue to be verified
+        with the rule under which they were hashed. Called by `database_init` when it creates
+        the checkpoints table for a database that already has a Ledger.
+
+        Args:
+            connection (Connection): The database connection of the accounting session.
+
+        Returns:
+            int: The id of the Ledger at the legacy checkpoint, or 0 if there are no Ledgers
+            or a cut-over has already been recorded.
+        """
+        latest = connection.execute(
+            select(Ledger.id, Ledger.hash).order_by(Ledger.id.desc()).limit(1)
+        ).first()
+        if latest is None or LedgerCheckpoint.cutover(connection):
+            return 0
+
+        connection.execute(
+            insert(LedgerCheckpoint).values(
+                ledger_id=latest.id, hash=latest.hash, legacy=True
+            )
+        )
+        return latest.id
+
+    @staticmethod
+    def nearest(connection, ledger_id: int = None) -> tuple:
+        """
+        Get the point in the hash chain from which the given Ledger is verified, which is the
+        latest checkpoint recorded before it or, if there is none, the start of the chain.
+
+        The stored hash of the Ledger preceding it is never used instead, since it is not
+        trusted until the chain up to it has been verified.
+
+        Args:
+            connection (Connection): The database connection of the accounting session.
+            ledger_id (`int`, optional): The id of the Ledger. Defaults to the beginning of
+                the chain.
+
+        Returns:
+            tuple: The id of the Ledger at the checkpoint (0 if there is none) and the
+            trusted hash from which the chain continues after it.
+        """
+        checkpoint = None
+        if ledger_id is not None:
+            checkpoint = connection.execute(
+                select(LedgerCheckpoint.ledger_id, LedgerCheckpoint.hash)
+                .where(LedgerCheckpoint.ledger_id < ledger_id)
+                .order_by(LedgerCheckpoint.ledger_id.desc())
+                .limit(1)
+            ).first()
+
+        return tuple(checkpoint) if checkpoint else (0, config.hashing["salt"])
+
+    @staticmethod
+    def following(connection, ledger_id: int = None) -> int:
+        """
+        Get the earliest checkpoint recorded at or after the given Ledger.
+
+        Args:
+            connection (Connection): The database connection of the accounting session.
+            ledger_id (`int`, optional): The id of the Ledger. Defaults to the end of the
+                chain.
+
+        Returns:
+            int: The id of the Ledger at the checkpoint, or None if there is none.
+        """
+        if ledger_id is None:
+            return None
+
+        return connection.execute(
+            select(func.min(LedgerCheckpoint.ledger_id)).where(
+                LedgerCheckpoint.ledger_id >= ledger_id
+            )
+        ).scalar()
@@ -0,0 +1,150 @@
+# models/ledger_watermark.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Represents the high-water mark of changes to the Ledger of an Entity.
+
+"""
+import random
+from sqlalchemy import UniqueConstraint, func, select, update
+from sqlalchemy.orm import Mapped, mapped_column
+from python_accounting.mixins import IsolatingMixin, CountingMixin
+from python_accounting.models import Base
+
+
+class LedgerWatermark(IsolatingMixin, CountingMixin, Base):
+    """
+    Represents the number of flushes that have changed the Ledgers or Balances of an
+    Entity in a Reporting Period, against which cached Account balances and report
+    snapshots are validated. (Should never have to be invoked directly).
+
+    The count of an Entity's Reporting Period is spread over `SHARDS` records, each flush
+    advancing one of them at random, so that concurrent postings rarely wait on the same
+    record lock. The watermark is the sum of the shards.
+    """
+
+    __tablename__ = "ledger_watermark"
+    __table_args__ = (UniqueConstraint("entity_id", "calendar_year", "shard"),)
+
+    SHARDS = 16
+    """(int): The number of records the watermark of a Reporting Period is spread over."""
+
+    calendar_year: Mapped[int] = mapped_column()
+    """(int): The calendar year of the Reporting Period whose changes are counted."""
+    shard: Mapped[int] = mapped_column(default=0)
+    """(int): The number of the record among the Reporting Period's watermark records."""
+    rewrites: Mapped[int] = mapped_column(default=0)
+    """(int): The number of flushes that have changed or removed existing Ledgers or Balances."""
+
+    def __repr__(self) -> str:
+        return f"{self.calendar_year} <{self.entity_id}> [{self.shard}]: {self.count}"
+
+    @staticmethod
+    def advance(
+        session, entity_id: int, calendar_year: int, rewrite: bool = False
+    ) -> None:
+        """
+        Advance the watermark of the Entity's Reporting Period, invalidating balances
+        cached against it.
+
+        Until the session's transaction ends, it does not read or store cached balances,
+        since they would include changes that may yet be rolled back.
+
+        Args:
+            session (Session): The accounting session making the changes.
+            entity_id (int): The id of the Entity whose Ledger has changed.
+            calendar_year (int): The calendar year of the Reporting Period of the changes.
+            rewrite (bool): Whether existing Ledgers or Balances were changed or removed,
+                rather than only new ones added.
+
+        Returns:
+            None
+        """
+        connection = session.connection()
+        key = {
+            "entity_id": entity_id,
+            "calendar_year": calendar_year,
+            "shard": random.randrange(LedgerWatermark.SHARDS),
+        }
+        criteria = [
+            getattr(LedgerWatermark, column) == value for column, value in key.items()
+        ]
+        if not connection.execute(
+            update(LedgerWatermark)
+            .where(*criteria)
+            .values(
+                count=LedgerWatermark.count + 1,
+                rewrites=LedgerWatermark.rewrites + int(rewrite),
+            )
+        ).rowcount:
+            LedgerWatermark.reserve(connection, key)
+            if rewrite:
+                connection.execute(
+                    update(LedgerWatermark)
+                    .where(*criteria)
+                    .values(rewrites=LedgerWatermark.rewrites + 1)
+                )
+        session.info["ledger_changed"] = True
+
+    @staticmethod
+    def _sum(
+        connection,
+        column,
+        entity_id: int,
+        calendar_year: int = None,
+        first_year: int = None,
+    ) -> int:
+        query = select(func.sum(column)).where(LedgerWatermark.entity_id == entity_id)
+        if calendar_year is not None:
+            query = query.where(
+                LedgerWatermark.calendar_year.between(
+                    calendar_year if first_year is None else first_year, calendar_year
+                )
+            )
+        return connection.execute(query).scalar() or 0
+
+    @staticmethod
+    def current(
+        connection, entity_id: int, calendar_year: int = None, first_year: int = None
+    ) -> int:
+        """
+        Get the watermark of the Entity.
+
+        Args:
+            connection (Connection): The database connection of the accounting session.
+            entity_id (int): The id of the Entity.
+            calendar_year (`int`, optional): The calendar year of the Reporting Period
+                whose watermark is required. Defaults to all Reporting Periods.
+            first_year (`int`, optional): The calendar year of the earliest Reporting
+                Period whose changes are counted together with those of calendar_year.
+                Defaults to calendar_year.
+
+        Returns:
+            int: The number of changes made to the Entity's Ledger.
+        """
+        return LedgerWatermark._sum(
+            connection, LedgerWatermark.count, entity_id, calendar_year, first_year
+        )
+
+    @staticmethod
+    def rewrites_of(connection, entity_id: int, calendar_year: int = None) -> int:
+        """
+        Get the number of rewrites of the Entity's Ledger.
+
+        Args:
+            connection (Connection): The database connection of the accounting session.
+            entity_id (int): The id of the Entity.
+            calendar_year (`int`, optional): The calendar year of the Reporting Period
+                whose rewrites are required. Defaults to all Reporting Periods.
+
+        Returns:
+            int: The number of changes that have altered or removed existing Ledgers or
+            Balances of the Entity.
+        """
+        return LedgerWatermark._sum(
+            connection, LedgerWatermark.rewrites, entity_id, calendar_year
+        )
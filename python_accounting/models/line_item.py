@@ -13,7 +13,7 @@ Represents the individual entries in a Transaction that will eventually be poste
 from decimal import Decimal
 from typing import List, Any
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
-from sqlalchemy import ForeignKey, Boolean, func, String
+from sqlalchemy import ForeignKey, Boolean, Index, func, String
 from sqlalchemy.types import DECIMAL
 from python_accounting.mixins import IsolatingMixin
 from python_accounting.models import Recyclable
@@ -24,6 +24,7 @@ class LineItem(IsolatingMixin, Recyclable):
     """Represents the other side of the double entry from the main account of a Transaction."""
 
     __tablename__ = "line_item"
+    __table_args__ = (Index("ix_line_item_transaction", "transaction_id"),)
 
     __mapper_args__ = {"polymorphic_identity": "LineItem"}
 
@@ -87,6 +88,27 @@ class LineItem(IsolatingMixin, Recyclable):
         return f"""{self.account.name if self.account else ''}
          <{'Credit' if self.credited else 'Debit'}>: {self.amount * self.quantity}"""
 
+    @staticmethod
+    def check_amounts(amount: Decimal, quantity: Decimal) -> None:
+        """
+        Checks the Line Item amount and quantity.
+
+        Args:
+            amount (Decimal): The amount of the Line Item.
+            quantity (Decimal): The quantity of the Line Item.
+
+        Raises:
+            NegativeValueError: If the amount or quantity is less than 0.
+
+        Returns:
+            None
+        """
+        if amount < 0:
+            raise NegativeValueError(LineItem.__name__)
+
+        if quantity and quantity < 0:
+            raise NegativeValueError(LineItem.__name__, "quantity")
+
     def validate(self, _) -> None:
         """
         Validates the Line Item properties.
@@ -101,11 +123,7 @@ class LineItem(IsolatingMixin, Recyclable):
             None
         """
 
-        if self.amount < 0:
-            raise NegativeValueError(self.__class__.__name__)
-
-        if self.quantity and self.quantity < 0:
-            raise NegativeValueError(self.__class__.__name__, "quantity")
+        LineItem.check_amounts(self.amount, self.quantity)
 
     def validate_delete(self, session) -> None:
         """
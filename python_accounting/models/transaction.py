@@ -9,7 +9,7 @@
 Represents a financial Transaction.
 
 """
-from typing import List, Set
+from typing import Iterable, List, Set
 from datetime import datetime
 from decimal import Decimal
 from strenum import StrEnum
@@ -19,6 +19,7 @@ from sqlalchemy import (
     ForeignKey,
     Enum,
     Boolean,
+    Index,
     func,
     UniqueConstraint,
     inspect,
@@ -36,6 +37,7 @@ from python_accounting.exceptions import (
     InvalidTransactionTypeError,
 )
 from python_accounting.models import Recyclable, Account, ReportingPeriod, LineItem
+from python_accounting.utils.aggregates import signed_sum
 
 
 class Transaction(IsolatingMixin, Recyclable):
@@ -48,7 +50,15 @@ class Transaction(IsolatingMixin, Recyclable):
     )
     """(StrEnum): Transaction Types representing standard source document Transactions."""
 
-    __table_args__ = (UniqueConstraint("transaction_no", "entity_id"),)
+    __table_args__ = (
+        UniqueConstraint("transaction_no", "entity_id"),
+        Index(
+            "ix_transaction_type_date",
+            "entity_id",
+            "transaction_type",
+            "transaction_date",
+        ),
+    )
     __tablename__ = "transaction"
     __mapper_args__ = {
         "polymorphic_identity": "Transaction",
@@ -115,8 +125,8 @@ class Transaction(IsolatingMixin, Recyclable):
             ValueError: If the unsaved Line Item are added or removed from the Transaction.
         """
         # pylint: enable=line-too-long
-        if hasattr(self, "_validate_subclass_line_items"):
-            self._validate_subclass_line_items(line_item)
+        if hasattr(self, "check_line_item"):
+            self.check_line_item(line_item, self.compound)
 
         if self.is_posted:
             raise PostedTransactionError(
@@ -206,24 +216,114 @@ class Transaction(IsolatingMixin, Recyclable):
         return account
 
     def _transaction_no(self, session, transaction_type, reporting_period) -> str:
-        next_id = (
-            session.query(Transaction)
-            .filter(Transaction.transaction_type == transaction_type)
-            .filter(Transaction.transaction_date > reporting_period.interval()["start"])
-            .with_entities(func.count())  # pylint: disable=not-callable
-            .execution_options(include_deleted=True)
-            .filter(Transaction.entity_id == self.entity_id)
-            .scalar()
-        ) + getattr(self, "session_index", 1)
+        return Transaction.transaction_numbers(
+            session, transaction_type, reporting_period
+        )[0]
+
+    @staticmethod
+    def _transaction_counter(session, transaction_type, reporting_period) -> tuple:
+        def initial() -> int:
+            # Continue from the Transactions recorded before the counter existed
+            return (
+                session.query(Transaction)
+                .filter(Transaction.transaction_type == transaction_type)
+                .filter(
+                    Transaction.transaction_date > reporting_period.interval()["start"]
+                )
+                .with_entities(func.count())  # pylint: disable=not-callable
+                .execution_options(include_deleted=True)
+                .filter(Transaction.entity_id == reporting_period.entity_id)
+                .scalar()
+            )
+
+        key = {
+            "entity_id": reporting_period.entity_id,
+            "transaction_type": transaction_type,
+            "reporting_period_id": reporting_period.id,
+        }
+        return key, initial
 
+    @staticmethod
+    def _transaction_no_prefix(transaction_type, reporting_period) -> str:
         prefix = config.transactions["types"][transaction_type.name][
             "transaction_no_prefix"
         ]
-        return f"{prefix}{reporting_period.period_count:02}/{next_id:04}"
+        return f"{prefix}{reporting_period.period_count:02}/"
+
+    @staticmethod
+    def transaction_numbers(
+        session, transaction_type, reporting_period, quantity: int = 1
+    ) -> list:
+        """
+        Reserves the next Transaction numbers for the Transaction type in the Reporting Period.
+
+        Args:
+            session (Session): The accounting session to which the Transactions belong.
+            transaction_type (TransactionType): The type of the Transactions.
+            reporting_period (ReportingPeriod): The Reporting Period of the Transactions.
+            quantity (`int`, optional): How many Transaction numbers to reserve. Defaults
+                to 1.
+
+        Returns:
+            list: The reserved Transaction numbers, in order.
+        """
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            TransactionCounter,
+        )
+
+        key, initial = Transaction._transaction_counter(
+            session, transaction_type, reporting_period
+        )
+        first = TransactionCounter.reserve(session.connection(), key, quantity, initial)
+
+        prefix = Transaction._transaction_no_prefix(transaction_type, reporting_period)
+        return [f"{prefix}{first + i:04}" for i in range(quantity)]
+
+    @staticmethod
+    def skip_transaction_numbers(
+        session, transaction_type, reporting_period, transaction_nos: Iterable
+    ) -> None:
+        """
+        Moves the Transaction number counter past numbers that were assigned explicitly.
+
+        Only numbers in the format generated for the Transaction type in the Reporting
+        Period are considered, so that they are never allocated again.
+
+        Args:
+            session (Session): The accounting session to which the Transactions belong.
+            transaction_type (TransactionType): The type of the Transactions.
+            reporting_period (ReportingPeriod): The Reporting Period of the Transactions.
+            transaction_nos (Iterable): The explicitly assigned Transaction numbers.
+        """
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            TransactionCounter,
+        )
+
+        prefix = Transaction._transaction_no_prefix(transaction_type, reporting_period)
+        serials = [
+            int(n[len(prefix) :])
+            for n in transaction_nos
+            if n.startswith(prefix) and n[len(prefix) :].isdigit()
+        ]
+        if not serials:
+            return
+
+        key, initial = Transaction._transaction_counter(
+            session, transaction_type, reporting_period
+        )
+        TransactionCounter.skip_to(session.connection(), key, max(serials), initial)
 
     def is_secure(self, session) -> bool:
         """Verify that the Transaction's Ledgers have not been tampered with."""
-        return all(l.hash == l.get_hash(session.connection()) for l in self.ledgers)
+        from python_accounting.utils.ledger_chain import (  # pylint: disable=import-outside-toplevel
+            verify_ledger_chain,
+        )
+
+        if not self.ledgers:
+            return True
+
+        ids = [l.id for l in self.ledgers]
+        return verify_ledger_chain(session, min(ids), max(ids)) is None
 
     def post(self, session) -> None:
         """
@@ -249,6 +349,23 @@ class Transaction(IsolatingMixin, Recyclable):
         session.flush()
         Ledger.post(session, self)
 
+    @staticmethod
+    def statement_columns() -> tuple:
+        """
+        Gets the columns of the Transaction that are listed on Account statements.
+
+        Returns:
+            tuple: The id, date, number, type, narration and reference columns.
+        """
+        return (
+            Transaction.id,
+            Transaction.transaction_date,
+            Transaction.transaction_no,
+            Transaction.transaction_type,
+            Transaction.narration,
+            Transaction.reference,
+        )
+
     def contribution(self, session, account: Account) -> Decimal:
         """
         Gets the amount contributed by the account to the transaction total.
@@ -262,25 +379,53 @@ class Transaction(IsolatingMixin, Recyclable):
             Decimal: The amount posted to the Account by the Transaction.
         """
         from python_accounting.models import (  # pylint: disable=import-outside-toplevel
-            Balance,
             Ledger,
         )
 
-        query = (
-            session.query(
-                func.sum(Ledger.amount).label("amount")  # pylint: disable=not-callable
-            )
+        return (
+            session.query(signed_sum(Ledger.amount, Ledger.entry_type))
             .filter(Ledger.entity_id == self.entity_id)
             .filter(Ledger.transaction_id == self.id)
             .filter(Ledger.currency_id == self.currency_id)
             .filter(Ledger.post_account_id == account.id)
+            .scalar()
         )
-        return (
-            query.filter(Ledger.entry_type == Balance.BalanceType.DEBIT).scalar()
-            or 0
-            - query.filter(Ledger.entry_type == Balance.BalanceType.CREDIT).scalar()
-            or 0
-        )
+
+    @staticmethod
+    def check_reporting_period(
+        reporting_period: ReportingPeriod,
+        transaction_type: TransactionType,
+        transaction_date: datetime,
+    ) -> None:
+        """
+        Checks that a Transaction can be recorded in the Reporting Period.
+
+        Args:
+            reporting_period (ReportingPeriod): The Reporting Period of the Transaction date.
+            transaction_type (TransactionType): The type of the Transaction.
+            transaction_date (datetime): The date of the Transaction.
+
+        Raises:
+            ClosedReportingPeriodError: If the Reporting Period is in the CLOSED status.
+            AdjustingReportingPeriodError: If the Reporting Period is in the ADJUSTING
+                status and the Transaction is not a Journal Entry.
+            InvalidTransactionDateError: If the Transaction date is exactly the beginning of
+                the Reporting Period.
+
+        Returns:
+            None
+        """
+        if reporting_period.status == ReportingPeriod.Status.CLOSED:
+            raise ClosedReportingPeriodError(reporting_period)
+
+        if (
+            reporting_period.status == ReportingPeriod.Status.ADJUSTING
+            and transaction_type != Transaction.TransactionType.JOURNAL_ENTRY
+        ):
+            raise AdjustingReportingPeriodError(reporting_period)
+
+        if transaction_date and transaction_date == reporting_period.interval()["start"]:
+            raise InvalidTransactionDateError
 
     def validate(self, session) -> None:
         """
@@ -316,20 +461,9 @@ class Transaction(IsolatingMixin, Recyclable):
         )
         self.currency_id = account.currency_id
 
-        if reporting_period.status == ReportingPeriod.Status.CLOSED:
-            raise ClosedReportingPeriodError(reporting_period)
-
-        if (
-            reporting_period.status == ReportingPeriod.Status.ADJUSTING
-            and self.transaction_type != Transaction.TransactionType.JOURNAL_ENTRY
-        ):
-            raise AdjustingReportingPeriodError(reporting_period)
-
-        if (
-            self.transaction_date
-            and self.transaction_date == reporting_period.interval()["start"]
-        ):
-            raise InvalidTransactionDateError
+        Transaction.check_reporting_period(
+            reporting_period, self.transaction_type, self.transaction_date
+        )
 
         if self.id and len(inspect(self).attrs.transaction_type.history.deleted) > 0:
             raise InvalidTransactionTypeError
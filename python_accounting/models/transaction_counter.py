@@ -0,0 +1,37 @@
+# models/transaction_counter.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Represents the serial number counter of a Transaction type in a Reporting Period.
+
+"""
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, ForeignKey, UniqueConstraint
+from python_accounting.mixins import IsolatingMixin, CountingMixin
+from python_accounting.models import Base
+
+
+class TransactionCounter(IsolatingMixin, CountingMixin, Base):
+    """
+    Represents the last Transaction number allocated for a Transaction type in a Reporting
+    Period. (Should never have to be invoked directly).
+    """
+
+    __tablename__ = "transaction_counter"
+    __table_args__ = (
+        UniqueConstraint("entity_id", "transaction_type", "reporting_period_id"),
+    )
+
+    transaction_type: Mapped[str] = mapped_column(String(255))
+    """(str): The label of the Transaction type being counted."""
+    reporting_period_id: Mapped[int] = mapped_column(
+        ForeignKey("reporting_period.id", ondelete="CASCADE")
+    )
+    """(int): The id of the Reporting Period being counted."""
+
+    def __repr__(self) -> str:
+        return f"{self.transaction_type} <{self.reporting_period_id}>: {self.count}"
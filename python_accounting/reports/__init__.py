@@ -14,3 +14,6 @@ from .balance_sheet import BalanceSheet
 from .aging_schedule import AgingSchedule
 from .cashflow_statement import CashflowStatement
 from .trial_balance import TrialBalance
+from .ledger_snapshot import LedgerSnapshot
+from .bundle import bundle
+from .comparative_statement import ComparativeStatement
@@ -10,7 +10,10 @@ Represents amounts oustanding to/from suppliers/clients, grouped by their age.
 
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy import and_, case, func, literal, not_, or_, select, union_all
+from sqlalchemy.orm import aliased
+from python_accounting.exceptions import InvalidAccountTypeError
 from python_accounting.models import Account
 from python_accounting.config import config
 from python_accounting.utils.dates import get_dates
@@ -64,35 +67,207 @@ class AgingSchedule:
         account_type: Account.AccountType,
         end_date: datetime = None,
     ) -> None:
+        if account_type not in [
+            Account.AccountType.RECEIVABLE,
+            Account.AccountType.PAYABLE,
+        ]:
+            raise InvalidAccountTypeError(
+                "Only Receivable and Payable Accounts can have a statement/schedule."
+            )
+
         self.account_type = account_type
         self.accounts = []
         self.balances = {k: 0 for k, v in self.brackets.items()}
-        _, self.end_date, _, _ = get_dates(session, None, end_date)
+        _, self.end_date, _, period_id = get_dates(session, None, end_date)
 
-        for account, transactions in [
-            (
-                account,
-                account.statement(session, None, self.end_date, True)["transactions"],
-            )
-            for account in session.query(Account)
+        outstanding = {}
+        for account_id, bracket, amount in self._outstanding_query(session, period_id):
+            outstanding.setdefault(account_id, {})[bracket] = amount
+
+        for account in (
+            session.query(Account)
             .filter(Account.account_type == account_type)
             .filter(Account.entity_id == session.entity.id)
             .all()
-        ]:
-            if transactions:
+        ):
+            if account.id in outstanding:
                 account.balances = {k: 0 for k, v in self.brackets.items()}
-                self._allocate_balances(transactions, account)
+                for bracket, amount in outstanding[account.id].items():
+                    self.balances[bracket] += amount
+                    account.balances[bracket] += amount
                 self.accounts.append(account)
 
     def __repr__(self) -> str:
         return f"{self.account_type} Aging Schedule as at {str(self.end_date)}"
 
-    def _allocate_balances(self, transactions: list, account: Account) -> None:
-        for transaction in transactions:
-            bracket = [
-                bracket
-                for bracket, max_age in self.brackets.items()
-                if transaction.age <= max_age
-            ][0]
-            self.balances[bracket] += transaction.uncleared_amount
-            account.balances[bracket] += transaction.uncleared_amount
+    def _bracket(self, transaction_date):
+        # A clearable's age in whole days is within a bracket if it is dated after its
+        # cutoff, and the last bracket takes all older clearables whatever its max age
+        *bounded, (last, _) = self.brackets.items()
+        if not bounded:
+            return literal(last)
+        return case(
+            *[
+                (
+                    transaction_date > self.end_date - timedelta(days=max_age + 1),
+                    bracket,
+                )
+                for bracket, max_age in bounded
+            ],
+            else_=last,
+        )
+
+    def _outstanding_query(self, session, period_id: int):  # pylint: disable=too-many-locals
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            Assignment,
+            Balance,
+            Ledger,
+            LineItem,
+            Tax,
+            Transaction,
+        )
+
+        account = aliased(Account, flat=True)
+        transaction = aliased(Transaction, flat=True)
+        tax = aliased(Tax, flat=True)
+
+        # Journal Entries on the same side as the clearing Transactions are not outstanding
+        credited = self.account_type == Account.AccountType.RECEIVABLE
+
+        # Transactions and Balances share the recyclable id sequence
+        assigned_balance = Assignment.assigned_type == "Balance"
+        cleared = (
+            select(
+                Assignment.assigned_id,
+                assigned_balance.label("balance"),
+                func.sum(Assignment.amount).label("amount"),  # pylint: disable=not-callable
+            )
+            .group_by(Assignment.assigned_id, assigned_balance)
+            .subquery()
+        )
+        amounts = (
+            select(
+                LineItem.transaction_id,
+                func.sum(  # pylint: disable=not-callable
+                    LineItem.amount * LineItem.quantity
+                    + case(
+                        (
+                            and_(
+                                LineItem.tax_id.is_not(None),
+                                LineItem.tax_inclusive.is_(False),
+                            ),
+                            LineItem.amount
+                            * LineItem.quantity
+                            * func.coalesce(tax.rate, 0)
+                            / 100,
+                        ),
+                        else_=0,
+                    )
+                ).label("amount"),
+            )
+            .join(transaction, transaction.id == LineItem.transaction_id)
+            .outerjoin(tax, tax.id == LineItem.tax_id)
+            .filter(LineItem.credited != transaction.credited)
+            .group_by(LineItem.transaction_id)
+            .subquery()
+        )
+        postings = (
+            select(
+                account.id.label("account_id"),
+                account.currency_id,
+                Ledger.transaction_id,
+            )
+            .join(
+                account,
+                or_(
+                    Ledger.post_account_id == account.id,
+                    Ledger.folio_account_id == account.id,
+                ),
+            )
+            .filter(account.account_type == self.account_type)
+            .filter(Ledger.entity_id == account.entity_id)
+            .distinct()
+            .subquery()
+        )
+
+        transactions = (
+            select(
+                postings.c.account_id,
+                Transaction.transaction_date,
+                (
+                    func.coalesce(amounts.c.amount, 0)
+                    - func.coalesce(cleared.c.amount, 0)
+                ).label("uncleared"),
+            )
+            .join(Transaction, Transaction.id == postings.c.transaction_id)
+            .outerjoin(amounts, amounts.c.transaction_id == Transaction.id)
+            .outerjoin(
+                cleared,
+                and_(
+                    cleared.c.assigned_id == Transaction.id,
+                    cleared.c.balance.is_(False),
+                ),
+            )
+            .filter(Transaction.currency_id == postings.c.currency_id)
+            .filter(Transaction.transaction_date <= self.end_date)
+            .filter(Transaction.transaction_type.in_(Assignment.clearables))
+            .filter(
+                not_(
+                    and_(
+                        Transaction.transaction_type
+                        == Transaction.TransactionType.JOURNAL_ENTRY,
+                        Transaction.credited.is_(credited),
+                    )
+                )
+            )
+        )
+        balances = (
+            select(
+                Balance.account_id,
+                Balance.transaction_date,
+                (Balance.amount - func.coalesce(cleared.c.amount, 0)).label(
+                    "uncleared"
+                ),
+            )
+            .join(account, account.id == Balance.account_id)
+            .outerjoin(
+                cleared,
+                and_(
+                    cleared.c.assigned_id == Balance.id,
+                    cleared.c.balance.is_(True),
+                ),
+            )
+            .filter(account.account_type == self.account_type)
+            .filter(Balance.reporting_period_id == period_id)
+            .filter(Balance.entity_id == account.entity_id)
+            .filter(
+                not_(
+                    and_(
+                        Balance.transaction_type
+                        == Balance.BalanceTransactions.JOURNAL_ENTRY,
+                        Balance.balance_type
+                        == (
+                            Balance.BalanceType.CREDIT
+                            if credited
+                            else Balance.BalanceType.DEBIT
+                        ),
+                    )
+                )
+            )
+        )
+
+        clearables = union_all(transactions, balances).subquery()
+        bucketed = (
+            select(
+                clearables.c.account_id,
+                self._bracket(clearables.c.transaction_date).label("bracket"),
+                clearables.c.uncleared,
+            )
+            .filter(clearables.c.uncleared != 0)
+            .subquery()
+        )
+        return session.query(
+            bucketed.c.account_id,
+            bucketed.c.bracket,
+            func.sum(bucketed.c.uncleared),  # pylint: disable=not-callable
+        ).group_by(bucketed.c.account_id, bucketed.c.bracket)
@@ -14,6 +14,7 @@ from datetime import datetime
 from strenum import StrEnum
 from python_accounting.utils.dates import get_dates
 from python_accounting.reports.financial_statement import FinancialStatement
+from python_accounting.reports.ledger_snapshot import LedgerSnapshot
 
 from python_accounting.models import Account
 
@@ -46,16 +47,20 @@ class BalanceSheet(FinancialStatement):
 
     config = "balance_sheet"
     """(str): The configuration section for the report."""
+    position = True
+    """(bool): The report shows balances as at its end date."""
 
-    def __init__(self, session, end_date: datetime = None) -> None:
+    def __init__(
+        self, session, end_date: datetime = None, snapshot: LedgerSnapshot = None
+    ) -> None:
         from python_accounting.reports.income_statement import (  # pylint: disable=import-outside-toplevel
             IncomeStatement,
         )
 
         self.start_date, self.end_date, _, _ = get_dates(session, None, end_date)
-        super().__init__(session)
+        super().__init__(session, snapshot)
 
-        self._get_sections(None, self.end_date)
+        self._get_sections()
 
         # Net Assets
         self.result_amounts[self.results.NET_ASSETS.name] = (
@@ -64,7 +69,9 @@ class BalanceSheet(FinancialStatement):
         )
 
         # Net Profit
-        net_profit = IncomeStatement.net_profit(session, self.start_date, self.end_date)
+        net_profit = IncomeStatement.net_profit(
+            session, self.start_date, self.end_date, self.snapshot
+        )
         self.balances["credit"] += net_profit * -1
 
         # Total Equity
@@ -87,3 +94,6 @@ class BalanceSheet(FinancialStatement):
         return f"""Assets: {abs(self.totals[self.sections.ASSETS.name])},
          Liabilities: {abs(self.totals[self.sections.LIABILITIES.name])},
          Equity: {abs(self.result_amounts[self.results.TOTAL_EQUITY.name])}"""
+
+    def _rebuild(self) -> "BalanceSheet":
+        return BalanceSheet(self.session, self.end_date, self.snapshot)
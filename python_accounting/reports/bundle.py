@@ -0,0 +1,60 @@
+# reports/bundle.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Provides the financial statements of an Entity for a period from a single aggregation.
+
+"""
+from datetime import datetime
+from sqlalchemy.orm.session import Session
+from python_accounting.reports.income_statement import IncomeStatement
+from python_accounting.reports.balance_sheet import BalanceSheet
+from python_accounting.reports.cashflow_statement import CashflowStatement
+from python_accounting.reports.trial_balance import TrialBalance
+from python_accounting.reports.ledger_snapshot import LedgerSnapshot
+from python_accounting.utils.dates import get_dates
+
+
+def bundle(
+    session: Session, start_date: datetime = None, end_date: datetime = None
+) -> dict:
+    """
+    Generates the Income Statement, Balance Sheet, Cashflow Statement and Trial Balance of the
+    session's Entity, aggregating the balances of its Accounts once for all four reports.
+
+    The reports are identical to those constructed separately for the same dates.
+
+    Args:
+        session (Session): The accounting session to which the reports belong.
+        start_date (datetime): The earliest transaction date for Transaction amounts to be
+            included in the Income and Cashflow Statements.
+        end_date (datetime): The latest transaction date for Transaction amounts to be
+            included in the reports.
+
+    Returns:
+        dict: The reports, keyed by their configuration section.
+    """
+    start_date, end_date, period_start, _ = get_dates(session, start_date, end_date)
+
+    # The Balance Sheet and Trial Balance always cover the whole Reporting Period
+    performance = LedgerSnapshot.empty(session, start_date, end_date)
+    position = (
+        performance
+        if start_date == period_start
+        else LedgerSnapshot.empty(session, period_start, end_date)
+    )
+    LedgerSnapshot.aggregate(
+        [performance] if position is performance else [performance, position]
+    )
+
+    reports = [
+        IncomeStatement(session, start_date, end_date, performance),
+        BalanceSheet(session, end_date, position),
+        CashflowStatement(session, start_date, end_date, performance),
+        TrialBalance(session, end_date, position),
+    ]
+    return {report.config: report for report in reports}
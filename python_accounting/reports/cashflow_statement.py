@@ -11,6 +11,7 @@ Represents the movement of liquid funds of an Entity.
 """
 from datetime import datetime
 from python_accounting.reports.financial_statement import FinancialStatement
+from python_accounting.reports.ledger_snapshot import LedgerSnapshot
 from python_accounting.config import config
 from python_accounting.utils.dates import get_dates
 from python_accounting.models import Account
@@ -29,25 +30,23 @@ class CashflowStatement(FinancialStatement):
 
     # pylint: enable=line-too-long
     def __init__(
-        self, session, start_date: datetime = None, end_date: datetime = None
+        self,
+        session,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        snapshot: LedgerSnapshot = None,
     ) -> None:
         self.start_date, self.end_date, _, _ = get_dates(session, start_date, end_date)
-        super().__init__(session)
+        super().__init__(session, snapshot)
 
         self.sub_sections = {
             k: v["sub_sections"]
             for k, v in config.reports[self.config]["sections"].items()
         }
 
-        self._get_sections(self.start_date, self.end_date, False)
+        self._get_sections(False)
 
-        cash_balances = Account.section_balances(
-            self.session,
-            [Account.AccountType.BANK],
-            start_date,
-            end_date,
-            True,
-        )
+        cash_balances = self.snapshot.section([Account.AccountType.BANK], True)
 
         # Beginning cash balance
         self.balances["NET_CASH_FLOW"]["Beginning Cash Balance"] = cash_balances[
@@ -88,24 +87,18 @@ class CashflowStatement(FinancialStatement):
          Financing: {self.totals[self.sections.FINANCING_CASH_FLOW.name]},
          Net: {self.totals[self.sections.NET_CASH_FLOW.name]}"""
 
-    def _get_sections(
-        self,
-        start_date: datetime = None,
-        end_date: datetime = None,
-        full_balance: bool = True,
-    ) -> None:
+    def _rebuild(self) -> "CashflowStatement":
+        return CashflowStatement(
+            self.session, self.start_date, self.end_date, self.snapshot
+        )
+
+    def _get_sections(self, full_balance: bool = True) -> None:
         for section, sub_sections in self.sub_sections.items():
             for sub_section in sub_sections:
                 label, account_types = config.reports[self.config]["sub_sections"][
                     sub_section
                 ].items()
-                balances = Account.section_balances(
-                    self.session,
-                    account_types[1],
-                    start_date,
-                    end_date,
-                    full_balance,
-                )
+                balances = self.snapshot.section(account_types[1], full_balance)
                 if balances["movement"] != 0:
                     self.balances[section][label[1]] = balances["movement"]
                     self.totals[section] += balances["movement"]
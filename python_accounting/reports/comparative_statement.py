@@ -0,0 +1,174 @@
+# reports/comparative_statement.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Represents a financial statement of an Entity compared across several periods.
+
+"""
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+from sqlalchemy.orm.session import Session
+from python_accounting.config import config
+from python_accounting.reports.ledger_snapshot import LedgerSnapshot
+from python_accounting.utils.dates import get_dates
+
+
+# pylint: disable=too-few-public-methods
+class ComparativeStatement:
+    # pylint: disable=line-too-long
+    """
+    This class represents a Financial Statement generated for each of several periods, with the
+    balances of all the periods aggregated together in one query of the Ledger.
+    """
+
+    statement: type
+    """(type): The class of the Financial Statement being compared."""
+    periods: list
+    """(list): The start and end dates of each period, the start being ignored by statements of financial position."""
+    columns: list
+    """(list): The Financial Statement for each period."""
+    totals: dict
+    """(dict): The Total balances of Accounts in the sections of the statements, as a list by period."""
+    result_amounts: dict
+    """(dict): The amounts results of the statements, as a list by period."""
+
+    # pylint: enable=line-too-long
+    def __init__(
+        self,
+        session: Session,
+        statement: type,
+        *,
+        periods: list = None,
+        bucket: str = None,
+    ) -> None:
+        """
+        Args:
+            session (Session): The accounting session to which the statements belong.
+            statement (type): The class of the Financial Statement to be compared, such as
+                `IncomeStatement` or `BalanceSheet`.
+            periods (`list` of `tuple`): The start and end dates of each period, such as
+                the buckets returned by `ComparativeStatement.buckets`.
+            bucket (`str`, optional): The length of the periods, one of "month", "quarter"
+                or "year", dividing the current Reporting Period up to today. Defaults to
+                "month" if no periods are given.
+
+        Raises:
+            ValueError: If both periods and a bucket are given, or the bucket is not one of
+                the supported intervals.
+        """
+        if periods is not None and bucket is not None:
+            raise ValueError("Either periods or a bucket can be given, not both.")
+
+        self.session = session
+        self.statement = statement
+        self.periods = (
+            ComparativeStatement.buckets(session, bucket=bucket or "month")
+            if periods is None
+            else periods
+        )
+
+        snapshots = [
+            LedgerSnapshot.empty(session, None if statement.position else start, end)
+            for start, end in self.periods
+        ]
+        LedgerSnapshot.aggregate(snapshots)
+
+        self.columns = [
+            statement(session, snapshot.end_date, snapshot=snapshot)
+            if statement.position
+            else statement(
+                session, snapshot.start_date, snapshot.end_date, snapshot=snapshot
+            )
+            for snapshot in snapshots
+        ]
+
+        report = config.reports[statement.config]
+        self.totals = {
+            section: [column.totals[section] for column in self.columns]
+            for section in report["sections"]
+        }
+        self.result_amounts = {
+            result: [column.result_amounts[result] for column in self.columns]
+            for result in report["results"]
+        }
+
+    def __str__(self) -> str:
+        report = config.reports[self.statement.config]
+        rows = [
+            (section["label"], self.totals[name])
+            for name, section in report["sections"].items()
+        ] + [
+            (label, self.result_amounts[name])
+            for name, label in report["results"].items()
+        ]
+
+        width = max(len(label) for label, _ in rows)
+        length = config.reports["result_length"]
+        lines = [
+            report["title"],
+            " " * width
+            + "".join(
+                f"{column.end_date.strftime(config.dates['short']):>{length}}"
+                for column in self.columns
+            ),
+        ]
+        for label, amounts in rows:
+            lines.append(
+                label.ljust(width) + "".join(f"{amount:>{length}}" for amount in amounts)
+            )
+        return "\n".join(lines)
+
+    @staticmethod
+    def buckets(
+        session: Session,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        bucket: str = "month",
+    ) -> list:
+        """
+        Divides the given dates into consecutive months, quarters or years.
+
+        Args:
+            session (Session): The accounting session to which the statements belong.
+            start_date (datetime): The start of the first bucket. Defaults to the start of the
+                current Reporting Period.
+            end_date (datetime): The end of the last bucket. Defaults to today.
+            bucket (`str`, optional): The length of the buckets, one of "month", "quarter" or
+                "year". Defaults to "month".
+
+        Raises:
+            ValueError: If the bucket is not one of the supported intervals.
+
+        Returns:
+            list: The start and end dates of each bucket, the last ending on the end date.
+        """
+        year_start = session.entity.year_start
+        steps = {
+            "month": lambda day: day + relativedelta(day=31),
+            "quarter": lambda day: day
+            + relativedelta(months=2 - (day.month - year_start) % 3, day=31),
+            "year": lambda day: day
+            + relativedelta(months=(year_start - 1 - day.month) % 12, day=31),
+        }
+        if bucket not in steps:
+            raise ValueError(f"Unsupported comparative statement bucket: {bucket}")
+
+        start_date, end_date, _, _ = get_dates(session, start_date, end_date)
+        periods = []
+        day = start_date
+        while day <= end_date:
+            end = min(
+                steps[bucket](day).replace(
+                    hour=23, minute=59, second=59, microsecond=999999
+                ),
+                end_date,
+            )
+            periods.append((day, end))
+            day = (end + relativedelta(days=1)).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+        return periods
@@ -14,6 +14,7 @@ from strenum import StrEnum
 from sqlalchemy.orm.session import Session
 from python_accounting.config import config as configuration
 from python_accounting.models import Account
+from python_accounting.reports.ledger_snapshot import LedgerSnapshot
 
 
 # pylint: disable=too-few-public-methods
@@ -24,8 +25,14 @@ class FinancialStatement:
 
     config: dict
     """(str): The configuration section for the report."""
+    position: bool = False
+    """(bool): Whether the report shows balances as at its end date, for the whole Reporting Period."""
+    start_date: datetime
+    """(datetime): The earliest transaction date for Transaction amounts to be included in the report."""
     end_date: datetime
     """(datetime): The latest transaction date for Transaction amounts to be included in the report."""
+    snapshot: LedgerSnapshot
+    """(LedgerSnapshot): The balances of the Entity's Accounts from which the report sections are derived, aggregated for the dates of the report unless given."""
 
     # printing
     printout: tuple
@@ -39,8 +46,13 @@ class FinancialStatement:
     grandtotal: str = "=" * configuration.reports["result_length"]
     """(str): The underline for report grand totals."""
 
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, snapshot: LedgerSnapshot = None) -> None:
         self.session = session
+        self.snapshot = (
+            LedgerSnapshot(session, self.start_date, self.end_date)
+            if snapshot is None
+            else snapshot
+        )
         self.title = configuration.reports[self.config]["title"]
 
         # Financial Statement Sections
@@ -77,17 +89,25 @@ class FinancialStatement:
         template = "{}\n" * len(self.printout)
         return template.format(*self.printout)
 
-    def _get_sections(
-        self,
-        start_date: datetime = None,
-        end_date: datetime = None,
-        full_balance: bool = True,
-    ) -> None:
+    def refresh(self) -> "FinancialStatement":
+        """
+        Gets the report again with the Ledgers and Balances posted since it was generated,
+        aggregating only those rather than the whole Ledger.
+
+        Returns:
+            FinancialStatement: The report for the same dates, from the refreshed snapshot.
+        """
+        self.snapshot.refresh()
+        return self._rebuild()
+
+    def _rebuild(self) -> "FinancialStatement":
+        # Generates the report again for the same dates from its snapshot
+        raise NotImplementedError
+
+    def _get_sections(self, full_balance: bool = True) -> None:
         for section, content in configuration.reports[self.config]["sections"].items():
             for account_type in content["account_types"]:
-                balances = Account.section_balances(
-                    self.session, [account_type], start_date, end_date, full_balance
-                )
+                balances = self.snapshot.section([account_type], full_balance)
                 account_type = Account.AccountType[account_type].value
                 if balances["closing"] != 0:
                     self.accounts[section][account_type] = balances["categories"]
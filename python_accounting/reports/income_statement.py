@@ -15,6 +15,7 @@ from datetime import datetime
 from strenum import StrEnum
 from python_accounting.models import Account
 from python_accounting.reports.financial_statement import FinancialStatement
+from python_accounting.reports.ledger_snapshot import LedgerSnapshot
 from python_accounting.utils.dates import get_dates
 
 
@@ -42,12 +43,16 @@ class IncomeStatement(FinancialStatement):
     """(str): The configuration section for the report."""
 
     def __init__(
-        self, session, start_date: datetime = None, end_date: datetime = None
+        self,
+        session,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        snapshot: LedgerSnapshot = None,
     ) -> None:
         self.start_date, self.end_date, _, _ = get_dates(session, start_date, end_date)
-        super().__init__(session)
+        super().__init__(session, snapshot)
 
-        self._get_sections(self.start_date, self.end_date, False)
+        self._get_sections(False)
 
         # gross profit
         self.result_amounts[self.results.GROSS_PROFIT.name] = (
@@ -89,9 +94,17 @@ class IncomeStatement(FinancialStatement):
          Gross Profit: {self.result_amounts[self.results.GROSS_PROFIT.name]},
          Net Profit: {self.result_amounts[self.results.NET_PROFIT.name]}"""
 
+    def _rebuild(self) -> "IncomeStatement":
+        return IncomeStatement(
+            self.session, self.start_date, self.end_date, self.snapshot
+        )
+
     @staticmethod
     def net_profit(
-        session, start_date: datetime = None, end_date: datetime = None
+        session,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        snapshot: LedgerSnapshot = None,
     ) -> Decimal:
         # pylint: disable=line-too-long
         """
@@ -101,19 +114,15 @@ class IncomeStatement(FinancialStatement):
             session (Session): The accounting session to which the report belongs.
             start_date (datetime): The earliest transaction date for Transaction amounts to be included in the report.
             end_date (datetime): The latest transaction date for Transaction amounts to be included in the report.
+            snapshot (LedgerSnapshot): The balances of the Entity's Accounts for the period, to be used instead of aggregating them again.
 
         Returns:
             Decimal: The net profit or loss for the Entity for the period.
 
         """
         # pylint: enable=line-too-long
-        return (
-            Account.section_balances(
-                session,
-                IncomeStatement.Accounts,
-                start_date,
-                end_date,
-                True,
-            )["closing"]
-            * -1
-        )
+        if snapshot is None:
+            snapshot = LedgerSnapshot(
+                session, start_date, end_date, list(IncomeStatement.Accounts)
+            )
+        return snapshot.section(IncomeStatement.Accounts, True)["closing"] * -1
@@ -0,0 +1,461 @@
+# reports/ledger_snapshot.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Represents the balances of the Accounts of an Entity for a given period.
+
+"""
+from datetime import datetime
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.orm.session import Session
+from python_accounting.config import config
+from python_accounting.models import Account, ReportingPeriod
+from python_accounting.utils.aggregates import signed_sum
+from python_accounting.utils.dates import get_dates
+
+
+# pylint: disable=too-few-public-methods
+# pylint: disable=too-many-instance-attributes
+class LedgerSnapshot:
+    # pylint: disable=line-too-long
+    """
+    This class aggregates the opening Balances and Ledgers of an Entity's Accounts once for a period,
+    so that every section of a financial statement can be derived from the same figures.
+    """
+
+    session: Session
+    """(Session): The accounting session to which the Accounts belong."""
+    start_date: datetime
+    """(datetime): The earliest transaction date for Transaction amounts to be included in the snapshot."""
+    end_date: datetime
+    """(datetime): The latest transaction date for Transaction amounts to be included in the snapshot."""
+    period_start: datetime
+    """(datetime): The start of the Reporting Period of the snapshot's end date."""
+    period_id: int
+    """(int): The id of the Reporting Period of the snapshot's end date."""
+    calendar_year: int
+    """(int): The calendar year of the Reporting Period of the snapshot's end date."""
+    calendar_years: tuple
+    """(tuple): The calendar years of the earliest and latest Reporting Periods whose Ledgers the snapshot aggregates."""
+    accounts: dict
+    """(dict): The Accounts included in the snapshot, by id."""
+    balances: dict
+    """(dict): The opening, movement and closing balances of the Accounts in the snapshot, by Account id."""
+    account_types: list
+    """(`list` of `Account.AccountType`): The Account types included in the snapshot, all of them if None."""
+    marks: dict
+    """(dict): The Ledger rewrites count, the highest Ledger and Balance ids included in the snapshot and the contribution of the window below them."""
+
+    # pylint: enable=line-too-long
+    def __init__(
+        self,
+        session: Session,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        account_types: list = None,
+    ) -> None:
+        """
+        Args:
+            session (Session): The accounting session to which the Accounts belong.
+            start_date (datetime): The earliest transaction date for Transaction amounts to be
+                included in the snapshot.
+            end_date (datetime): The latest transaction date for Transaction amounts to be
+                included in the snapshot.
+            account_types (`list` of `Account.AccountType`): The Account types to be included
+                in the snapshot. All Account types are included if not given.
+        """
+        LedgerSnapshot._prepare(self, session, start_date, end_date, account_types)
+        LedgerSnapshot.aggregate([self], account_types)
+
+    @classmethod
+    def empty(
+        cls,
+        session: Session,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        account_types: list = None,
+    ) -> "LedgerSnapshot":
+        """
+        Creates a snapshot without aggregating its balances, so that they can be aggregated
+        together with those of other snapshots through `LedgerSnapshot.aggregate`.
+
+        Args:
+            session (Session): The accounting session to which the Accounts belong.
+            start_date (datetime): The earliest transaction date for Transaction amounts to be
+                included in the snapshot.
+            end_date (datetime): The latest transaction date for Transaction amounts to be
+                included in the snapshot.
+            account_types (`list` of `Account.AccountType`): The Account types to be included
+                in the snapshot. All Account types are included if not given.
+
+        Returns:
+            LedgerSnapshot: The snapshot, with no Accounts or balances.
+        """
+        snapshot = cls.__new__(cls)
+        cls._prepare(snapshot, session, start_date, end_date, account_types)
+        return snapshot
+
+    @staticmethod
+    def _prepare(
+        snapshot: "LedgerSnapshot",
+        session: Session,
+        start_date: datetime,
+        end_date: datetime,
+        account_types: list,
+    ) -> None:
+        snapshot.session = session
+        (
+            snapshot.start_date,
+            snapshot.end_date,
+            snapshot.period_start,
+            snapshot.period_id,
+        ) = get_dates(session, start_date, end_date)
+        snapshot.calendar_year = session.get(
+            ReportingPeriod, snapshot.period_id
+        ).calendar_year
+        years = [snapshot.calendar_year] + [
+            ReportingPeriod.date_year(date, session.entity)
+            for date in [
+                min(snapshot.start_date, snapshot.period_start),
+                snapshot.end_date,
+            ]
+        ]
+        snapshot.calendar_years = (min(years), max(years))
+        snapshot.accounts = {}
+        snapshot.balances = {}
+        snapshot.account_types = account_types
+        snapshot.marks = {}
+
+    @staticmethod
+    def aggregate(  # pylint: disable=too-many-locals
+        snapshots: list, account_types: list = None
+    ) -> None:
+        """
+        Aggregates the balances of the given snapshots' Accounts, with one grouped query of the
+        opening Balances and one of the Ledger however many snapshots there are.
+
+        Snapshots of all Account types are fetched from and stored in the snapshot cache
+        when `config.cache["snapshots"]` is set.
+
+        Args:
+            snapshots (`list` of `LedgerSnapshot`): The snapshots to be aggregated, which must
+                belong to the same session.
+            account_types (`list` of `Account.AccountType`): The Account types to be included
+                in the snapshots. All Account types are included if not given.
+
+        Returns:
+            None
+        """
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            CachedSnapshot,
+        )
+
+        if not snapshots:
+            return
+
+        session = snapshots[0].session
+        types = list(Account.AccountType) if account_types is None else account_types
+        marks = LedgerSnapshot._marks(session, {s.calendar_year for s in snapshots})
+
+        keys = [
+            CachedSnapshot.key(session, s) if account_types is None else None
+            for s in snapshots
+        ]
+        figures = [CachedSnapshot.fetch(session, key) for key in keys]
+        tails = {}
+        pending = [i for i, cached in enumerate(figures) if cached is None]
+        if pending:
+            aggregated = LedgerSnapshot._aggregate_ledger(
+                session, [snapshots[i] for i in pending], types, None, marks
+            )
+            for i, (balances, tail) in zip(pending, aggregated):
+                figures[i], tails[i] = balances, tail
+                CachedSnapshot.store(session, keys[i], balances)
+
+        accounts = LedgerSnapshot._accounts(session, types)
+
+        for i, (snapshot, balances) in enumerate(zip(snapshots, figures)):
+            snapshot.account_types = account_types
+            # Cached figures carry no tail, so their first refresh aggregates in full
+            snapshot.marks = (
+                {
+                    "rewrites": marks["rewrites"][snapshot.calendar_year],
+                    "ledger": marks["ledger"],
+                    "balance": marks["balance"],
+                    "window": marks["window"],
+                    "tail": tails[i],
+                }
+                if i in tails
+                else {}
+            )
+            snapshot.accounts = accounts
+            snapshot.balances = {}
+            for account_id in accounts:
+                opening, movement = balances.get(account_id, (0, 0))
+                snapshot.balances[account_id] = {
+                    "opening": opening,
+                    "movement": movement,
+                    "closing": opening + movement,
+                }
+
+    def refresh(self) -> set:
+        """
+        Applies the Ledgers and Balances added since the snapshot was aggregated to the
+        balances of their Accounts, so that the cost of a refresh follows the number of new
+        postings rather than the number of Accounts.
+
+        Ids are allocated before the postings holding them are committed, so the last
+        `config.cache["refresh_window"]` ids included in the snapshot are aggregated again
+        and their earlier contribution replaced, picking up postings committed out of order.
+        The Accounts are reloaded, so changes to their categories and types are reflected.
+
+        If existing Ledgers or Balances of the snapshot's Reporting Period have been changed
+        or removed since, Accounts have moved into or out of the snapshot's Account types, or
+        the snapshot's figures were fetched from the snapshot cache, it is aggregated again in
+        full instead.
+
+        Returns:
+            set: The ids of the Accounts whose balances may have changed.
+        """
+        types = (
+            list(Account.AccountType)
+            if self.account_types is None
+            else self.account_types
+        )
+        accounts = LedgerSnapshot._accounts(self.session, types)
+        marks = LedgerSnapshot._marks(self.session, {self.calendar_year})
+        marks["rewrites"] = marks["rewrites"][self.calendar_year]
+        if (
+            "tail" not in self.marks
+            or marks["rewrites"] != self.marks["rewrites"]
+            # Accounts whose type moved them into or out of the snapshot
+            or (self.account_types is not None and set(accounts) != set(self.accounts))
+        ):
+            LedgerSnapshot.aggregate([self], self.account_types)
+            return set(self.accounts)
+
+        changes, marks["tail"] = LedgerSnapshot._aggregate_ledger(
+            self.session, [self], types, self.marks, marks
+        )[0]
+
+        # Accounts may be shared with other snapshots aggregated together
+        self.accounts = accounts
+        self.balances = {
+            account_id: dict(
+                self.balances.get(
+                    account_id, {"opening": 0, "movement": 0, "closing": 0}
+                )
+            )
+            for account_id in self.accounts
+        }
+
+        changed = set()
+        for account_id in set(changes).union(self.marks["tail"]):
+            opening, movement = changes.get(account_id, (0, 0))
+            tail_opening, tail_movement = self.marks["tail"].get(account_id, (0, 0))
+            opening, movement = opening - tail_opening, movement - tail_movement
+            if (opening or movement) and account_id in self.balances:
+                figures = self.balances[account_id]
+                figures["opening"] += opening
+                figures["movement"] += movement
+                figures["closing"] = figures["opening"] + figures["movement"]
+                changed.add(account_id)
+
+        self.marks = marks
+        return changed
+
+    @staticmethod
+    def _accounts(session: Session, account_types: list) -> dict:
+        return {
+            a.id: a
+            for a in session.scalars(
+                select(Account)
+                .filter(Account.account_type.in_(account_types))
+                .options(selectinload(Account.category))
+                .execution_options(populate_existing=True)
+            ).all()
+        }
+
+    @staticmethod
+    def _marks(session: Session, calendar_years: set) -> dict:
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            Balance,
+            Ledger,
+            LedgerWatermark,
+        )
+
+        return {
+            "rewrites": {
+                calendar_year: LedgerWatermark.rewrites_of(
+                    session.connection(), session.entity.id, calendar_year
+                )
+                for calendar_year in calendar_years
+            },
+            "ledger": session.query(func.max(Ledger.id)).scalar() or 0,
+            "balance": session.query(func.max(Balance.id)).scalar() or 0,
+            "window": config.cache["refresh_window"],
+        }
+
+    @staticmethod
+    def _aggregate_ledger(  # pylint: disable=too-many-locals
+        session: Session,
+        snapshots: list,
+        account_types: list,
+        after: dict,
+        upto: dict,
+    ) -> list:
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            Balance,
+            Ledger,
+        )
+
+        account = aliased(Account, flat=True)
+
+        # A refresh starts from the window below the previous marks, and the tail of rows in
+        # the window below the new marks is summed separately for the next one
+        start = {
+            key: after[key] - after["window"] if after else 0
+            for key in ["ledger", "balance"]
+        }
+        tail = {key: upto[key] - upto["window"] for key in ["ledger", "balance"]}
+
+        # Each snapshot's opening and movement windows, shared between snapshots if equal
+        windows, columns = {}, []
+        for snapshot in snapshots:
+            # Ledgers up to the end of the start date's day count towards the opening balance
+            opening_end = snapshot.start_date.replace(
+                hour=23, minute=59, second=59, microsecond=999999
+            )
+            columns.append(
+                [
+                    windows.setdefault(window, len(windows))
+                    for window in [
+                        (snapshot.period_start, opening_end),
+                        (snapshot.start_date, snapshot.end_date),
+                    ]
+                ]
+            )
+
+        opening_balances = {}
+        for period_id, account_id, amount, tail_amount in (
+            session.query(
+                Balance.reporting_period_id,
+                Balance.account_id,
+                signed_sum(Balance.amount, Balance.balance_type),
+                signed_sum(
+                    case((Balance.id > tail["balance"], Balance.amount), else_=0),
+                    Balance.balance_type,
+                ),
+            )
+            .join(account, account.id == Balance.account_id)
+            .filter(account.account_type.in_(account_types))
+            .filter(Balance.currency_id == account.currency_id)
+            .filter(
+                Balance.reporting_period_id.in_({s.period_id for s in snapshots})
+            )
+            .filter(Balance.entity_id == account.entity_id)
+            .filter(Balance.id > start["balance"])
+            .filter(Balance.id <= upto["balance"])
+            .group_by(Balance.reporting_period_id, Balance.account_id)
+        ):
+            opening_balances[(period_id, account_id)] = (amount, tail_amount)
+
+        ledger_balances = {
+            account_id: (amounts[: len(windows)], amounts[len(windows) :])
+            for account_id, *amounts in session.query(
+                Ledger.post_account_id,
+                *[
+                    Account._ledger_window(  # pylint: disable=protected-access
+                        window_start, window_end, *criteria
+                    )
+                    for criteria in [[], [Ledger.id > tail["ledger"]]]
+                    for window_start, window_end in windows
+                ],
+            )
+            .join(account, account.id == Ledger.post_account_id)
+            .filter(account.account_type.in_(account_types))
+            .filter(Ledger.currency_id == account.currency_id)
+            .filter(Ledger.transaction_date >= min(s for s, _ in windows))
+            .filter(Ledger.transaction_date <= max(e for _, e in windows))
+            .filter(Ledger.entity_id == account.entity_id)
+            .filter(Ledger.id > start["ledger"])
+            .filter(Ledger.id <= upto["ledger"])
+            .group_by(Ledger.post_account_id)
+        }
+
+        # The opening and movement of each Account with any balance, and of its tail, by
+        # snapshot
+        aggregated = []
+        empty = ([0] * len(windows), [0] * len(windows))
+        for snapshot, (opening_column, movement_column) in zip(snapshots, columns):
+            balances, tails = {}, {}
+            for account_id in set(ledger_balances).union(
+                a for p, a in opening_balances if p == snapshot.period_id
+            ):
+                ledgers = ledger_balances.get(account_id, empty)
+                opening = opening_balances.get((snapshot.period_id, account_id), (0, 0))
+                for figures, amounts, balance in zip(
+                    [balances, tails], ledgers, opening
+                ):
+                    figures[account_id] = (
+                        amounts[opening_column] + balance,
+                        amounts[movement_column],
+                    )
+            aggregated.append((balances, tails))
+        return aggregated
+
+    def section(self, account_types: list, full_balance: bool = True) -> dict:
+        """
+        Gets the opening, movement and closing balances of the Accounts of the given section
+        (account types), organized by category.
+
+        Args:
+            account_types (`list` of `Account.AccountType`): The Account types
+                belonging to the section.
+            full_balance (bool): Whether to include opening balance amounts in the balance.
+
+        Returns:
+            dict: A summary of the total opening, balance movement and closing balance, which
+            details of totals by Category and the Accounts contained in each Category.
+                - opening (Decimal): The sum of opening balances of Accounts in the section.
+                - movement (Decimal): The movememt of the balances of Accounts in the section.
+                - closing (Decimal): The sum of opening closing of Accounts in the section.
+                - categories (dict): The Accounts belonging to the section separated by Category.
+        """
+        account_types = {
+            Account.AccountType[getattr(account_type, "name", account_type)]
+            for account_type in account_types
+        }
+        balances = {"opening": 0, "movement": 0, "closing": 0, "categories": {}}
+
+        for account_id, account in self.accounts.items():
+            if account.account_type not in account_types:
+                continue
+
+            figures = self.balances[account_id]
+            account.opening = figures["opening"]
+            account.closing = figures["closing"] if full_balance else figures["movement"]
+            account.movement = figures["movement"] * -1  # cashflow statement display
+            if account.closing == 0 and account.movement == 0:
+                continue
+
+            category_id, category_name = (
+                (0, account.account_type.value)
+                if account.category is None
+                else (account.category_id, account.category.name)
+            )
+            category = balances["categories"].setdefault(
+                category_name, {"id": category_id, "total": 0, "accounts": []}
+            )
+            category["total"] += account.closing
+            category["accounts"].append(account)
+
+            balances["opening"] += account.opening
+            balances["movement"] += account.movement
+            balances["closing"] += account.closing
+        return balances
@@ -12,6 +12,7 @@ Represents the equality of all the credit and debit balances of an Entity.
 
 from datetime import datetime
 from python_accounting.reports.financial_statement import FinancialStatement
+from python_accounting.reports.ledger_snapshot import LedgerSnapshot
 from python_accounting.utils.dates import get_dates
 
 
@@ -22,12 +23,16 @@ class TrialBalance(FinancialStatement):
 
     config = "trial_balance"
     """(str): The configuration section for the report."""
+    position = True
+    """(bool): The report shows balances as at its end date."""
 
-    def __init__(self, session, end_date: datetime = None) -> None:
+    def __init__(
+        self, session, end_date: datetime = None, snapshot: LedgerSnapshot = None
+    ) -> None:
         self.start_date, self.end_date, _, _ = get_dates(session, None, end_date)
-        super().__init__(session)
+        super().__init__(session, snapshot)
 
-        self._get_sections(None, self.end_date)
+        self._get_sections()
 
         # Debits
         self.result_amounts[self.results.DEBIT.name] = self.balances["debit"]
@@ -44,3 +49,6 @@ class TrialBalance(FinancialStatement):
             self._print_result(self.results.DEBIT, True),
             self._print_result(self.results.CREDIT, True),
         )
+
+    def _rebuild(self) -> "TrialBalance":
+        return TrialBalance(self.session, self.end_date, self.snapshot)
@@ -35,8 +35,22 @@ class JournalEntry(  # pylint: disable=too-many-ancestors
         self.credited = True
         super().__init__(**kw)
 
-    def _validate_subclass_line_items(self, line_item):
-        if self.compound and line_item.tax_id:
+    def check_line_item(self, line_item, compound: bool) -> None:
+        """
+        Checks the Line Item Tax against the rules of the Journal Entry.
+
+        Args:
+            line_item (LineItem): The Line Item.
+            compound (bool): Whether the Journal Entry is compound.
+
+        Raises:
+            InvalidTaxChargeError: If the Line Item of a compound Journal Entry is
+                charged Tax.
+
+        Returns:
+            None
+        """
+        if compound and line_item.tax_id:
             raise InvalidTaxChargeError(f"Compound {self.__class__.__name__}")
 
     def get_compound_entries(self) -> tuple:
@@ -0,0 +1,38 @@
+# utils/aggregates.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Provides accounting specific aggregation utilities.
+
+"""
+from sqlalchemy import case, func
+
+
+def signed_sum(amount, entry_type):
+    """
+    Returns an expression for the net of double entry amounts, computed in a single pass.
+
+    Debit amounts are added and Credit amounts subtracted, so the total is the balance of
+    the amounts from the perspective of the Account they are posted to.
+
+    Args:
+        amount (ColumnElement): The column of the amounts to be totalled.
+        entry_type (ColumnElement): The column of the BalanceType of each amount.
+
+    Returns:
+        ColumnElement: The signed total of the amounts, zero if there are none.
+    """
+    from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+        Balance,
+    )
+
+    return func.coalesce(
+        func.sum(  # pylint: disable=not-callable
+            case((entry_type == Balance.BalanceType.DEBIT, amount), else_=-amount)
+        ),
+        0,
+    )
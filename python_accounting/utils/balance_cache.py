@@ -0,0 +1,100 @@
+# utils/balance_cache.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Provides a cache for Account balances, validated against the Ledger watermark.
+
+"""
+from collections import OrderedDict
+from decimal import Decimal
+from threading import Lock
+from typing import Callable
+from python_accounting.config import config
+
+
+class BalanceCache:
+    """
+    A least recently used cache of Account balances.
+
+    Balances are keyed by the database engine and the Ledger watermark of their Entity as
+    well as their Account, Currency and dates. Any change to the Ledger advances the
+    watermark, so balances computed before it are never returned again and age out of the
+    cache. The watermark is read for every balance, so a long lived session is served the
+    balances committed by others since it started.
+
+    Attributes:
+        size (int): The maximum number of balances cached. Defaults to
+            `config.cache["balances"]`, 0 disables the cache.
+        hits (int): The number of balances returned from the cache.
+        misses (int): The number of balances computed and added to the cache.
+    """
+
+    def __init__(self, size: int = None) -> None:
+        self._size = size
+        self._balances = OrderedDict()
+        self._lock = Lock()
+        self.hits = self.misses = 0
+
+    @property
+    def size(self) -> int:
+        """The maximum number of balances cached."""
+        return config.cache["balances"] if self._size is None else self._size
+
+    def __len__(self) -> int:
+        return len(self._balances)
+
+    def fetch(self, session, account, key: tuple, compute: Callable) -> Decimal:
+        """
+        Get a balance of the Account from the cache, computing it if it is not cached.
+
+        Args:
+            session (Session): The accounting session to which the Account belongs.
+            account (Account): The Account whose balance is requested.
+            key (tuple): The kind of balance and the dates it covers.
+            compute (Callable): Computes the balance from the database.
+
+        Returns:
+            Decimal: The balance.
+        """
+        from python_accounting.models import (  # pylint: disable=import-outside-toplevel
+            LedgerWatermark,
+        )
+
+        if not self.size or session.info.get("ledger_changed"):
+            return compute()
+
+        # Databases sharing the process may have Accounts with the same ids
+        key = (
+            session.get_bind().engine,
+            account.entity_id,
+            account.id,
+            account.currency_id,
+            LedgerWatermark.current(session.connection(), account.entity_id),
+        ) + key
+        with self._lock:
+            if key in self._balances:
+                self._balances.move_to_end(key)
+                self.hits += 1
+                return self._balances[key]
+
+        balance = compute()
+        with self._lock:
+            self._balances[key] = balance
+            self.misses += 1
+            while len(self._balances) > self.size:
+                self._balances.popitem(last=False)
+        return balance
+
+    def clear(self) -> None:
+        """Removes all balances from the cache."""
+        with self._lock:
+            self._balances.clear()
+            self.hits = self.misses = 0
+
+
+balance_cache = BalanceCache()
+"""The Account balances cache"""
@@ -0,0 +1,62 @@
+# utils/cursors.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Provides opaque cursor tokens for paging through accounting listings.
+
+"""
+import base64
+import binascii
+import hmac
+import json
+from python_accounting.config import config
+from python_accounting.exceptions import InvalidCursorError
+
+
+def _signature(payload: str) -> str:
+    return hmac.new(
+        config.hashing["salt"].encode(), payload.encode(), config.hashing["algorithm"]
+    ).hexdigest()
+
+
+def encode_cursor(position: dict) -> str:
+    """
+    Encodes the position in a listing as an opaque token.
+
+    The token is signed with the hashing salt, so that positions carrying balances cannot
+    be altered by the clients they are handed to.
+
+    Args:
+        position (dict): The json serializable values that identify the position.
+
+    Returns:
+        str: The cursor token.
+    """
+    payload = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+    return f"{payload}.{_signature(payload)}"
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decodes the position in a listing from a cursor token.
+
+    Args:
+        cursor (str): The cursor token.
+
+    Raises:
+        InvalidCursorError: If the token was not issued by `encode_cursor`.
+
+    Returns:
+        dict: The values that identify the position.
+    """
+    payload, _, signature = cursor.partition(".")
+    if not hmac.compare_digest(signature, _signature(payload)):
+        raise InvalidCursorError
+    try:
+        return json.loads(base64.urlsafe_b64decode(payload))
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidCursorError from exc
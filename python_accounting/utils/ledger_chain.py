@@ -0,0 +1,198 @@
+# utils/ledger_chain.py
+# Copyright (C) 2024 - 2028 the PythonAccounting authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of PythonAccounting and is released under
+# the MIT License: https://www.opensource.org/licenses/mit-license.php
+
+"""
+Provides verification of the Ledger hash chain against direct database tampering.
+
+"""
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import create_engine, insert, select, func
+from python_accounting.models import Ledger, LedgerCheckpoint
+from python_accounting.config import config
+
+
+def _chain_query(after_id: int = None, to_id: int = None):
+    query = select(
+        Ledger.id,
+        Ledger.hash,
+        Ledger.transaction_date,
+        Ledger.entry_type,
+        Ledger.amount,
+        Ledger.entity_id,
+        Ledger.transaction_id,
+        Ledger.currency_id,
+        Ledger.post_account_id,
+        Ledger.folio_account_id,
+        Ledger.line_item_id,
+        Ledger.tax_id,
+        LedgerCheckpoint.hash.label("checkpoint"),
+    )
+    query = query.outerjoin(
+        LedgerCheckpoint, LedgerCheckpoint.ledger_id == Ledger.id
+    ).order_by(Ledger.id)
+
+    if after_id is not None:
+        query = query.where(Ledger.id > after_id)
+    if to_id is not None:
+        query = query.where(Ledger.id <= to_id)
+    return query
+
+
+def _walk_chain(connection, from_id: int, to_id: int, chunk_size: int):
+    cutover = LedgerCheckpoint.cutover(connection)
+    preceding, previous = LedgerCheckpoint.nearest(connection, from_id)
+
+    for ledger in connection.execution_options(yield_per=chunk_size).execute(
+        _chain_query(preceding, to_id)
+    ):
+        # Legacy Ledgers are chained to the Ledger with the preceding id, if there is one
+        if ledger.id <= cutover and preceding != ledger.id - 1:
+            previous = config.hashing["salt"]
+
+        previous = Ledger.compute_hash(ledger, previous)
+        yield ledger, previous
+        preceding = ledger.id
+
+
+def _verify_segment(
+    connection, from_id: int = None, to_id: int = None, chunk_size: int = 1000
+) -> int:
+    # Legacy Ledgers are only chained to their neighbours, so they are verified in place
+    if to_id is None or to_id > LedgerCheckpoint.cutover(connection):
+        to_id = LedgerCheckpoint.following(connection, to_id) or to_id
+
+    for ledger, expected in _walk_chain(connection, from_id, to_id, chunk_size):
+        if ledger.hash != expected or ledger.checkpoint not in (None, expected):
+            return ledger.id
+    return None
+
+
+def _verify_segment_worker(url: str, from_id: int, to_id: int, chunk_size: int) -> int:
+    engine = create_engine(url)
+    try:
+        with engine.connect() as connection:
+            return _verify_segment(connection, from_id, to_id, chunk_size)
+    finally:
+        engine.dispose()
+
+
+def _segments(connection, from_id: int, to_id: int, count: int) -> list:
+    query = select(func.min(Ledger.id), func.max(Ledger.id))
+    if from_id is not None:
+        query = query.where(Ledger.id >= from_id)
+    if to_id is not None:
+        query = query.where(Ledger.id <= to_id)
+    first, last = connection.execute(query).one()
+    if first is None:
+        return []
+
+    size = -(-(last - first + 1) // count)
+    return [
+        (start, min(start + size - 1, last))
+        for start in (first + i * size for i in range(count))
+        if start <= last
+    ]
+
+
+def verify_ledger_chain(
+    session,
+    from_id: int = None,
+    to_id: int = None,
+    chunk_size: int = 1000,
+    processes: int = 1,
+) -> int:
+    """
+    Verify that the hashes of the Ledgers in the given id range have not been tampered with.
+
+    The Ledgers are streamed in id order in chunks, so memory use does not grow with the
+    size of the Ledger. The running hash is recalculated from the nearest checkpoint
+    recorded before from_id (or the hashing salt at the start of the chain if there is no
+    such checkpoint) up to the first checkpoint at or after to_id, and compared to the hash
+    stored for each Ledger and checkpoint on the way. Only the Ledgers between those two
+    points are read, and hashes that have been rewritten after tampering are caught at the
+    closing checkpoint. Past the last checkpoint there is no closing checkpoint, so a
+    tampered Ledger there is only caught if the hashes of all the Ledgers after it have not
+    been rewritten too. The hash chain spans the Ledgers of all Entities.
+
+    Args:
+        session (Session): The accounting session to verify the Ledger of.
+        from_id (`int`, optional): The id of the first Ledger to verify. Defaults to the
+            first Ledger.
+        to_id (`int`, optional): The id of the last Ledger to verify. Defaults to the
+            last Ledger.
+        chunk_size (`int`, optional): The number of Ledgers fetched from the database at a
+            time. Defaults to 1000.
+        processes (`int`, optional): The number of worker processes among which segments of
+            the id range are verified in parallel. Defaults to 1. In memory databases are
+            always verified in the current process.
+
+    Returns:
+        int: The id of the first Ledger whose hash or checkpoint does not match the chain,
+        or None if the chain is intact. This may lie outside the given range if a Ledger
+        between it and the enclosing checkpoints has been tampered with.
+    """
+    connection = session.connection()
+    url = connection.engine.url
+
+    if processes <= 1 or url.database in (None, "", ":memory:"):
+        return _verify_segment(connection, from_id, to_id, chunk_size)
+
+    segments = _segments(connection, from_id, to_id, processes * 4)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(
+                _verify_segment_worker,
+                url.render_as_string(hide_password=False),
+                start,
+                end,
+                chunk_size,
+            )
+            for start, end in segments
+        ]
+        broken = [f.result() for f in futures]
+    return min((b for b in broken if b is not None), default=None)
+
+
+def record_ledger_checkpoints(session, chunk_size: int = 1000) -> list:
+    """
+    Record the checkpoints missing from the Ledger hash chain, such as for Ledgers posted
+    while `config.hashing["checkpoint_interval"]` was 0 or before checkpoints were recorded.
+
+    The chain is walked and verified from the first Ledger, and a checkpoint is recorded
+    every `config.hashing["checkpoint_interval"]` Ledgers after the previous one.
+    Checkpoints are only recorded up to the first Ledger whose hash does not match the
+    chain, as reported by `verify_ledger_chain`, so that tampered Ledgers are never trusted.
+
+    Args:
+        session (Session): The accounting session to record the checkpoints of.
+        chunk_size (`int`, optional): The number of Ledgers fetched from the database at a
+            time. Defaults to 1000.
+
+    Returns:
+        list: The ids of the Ledgers at which checkpoints were recorded.
+    """
+    interval = config.hashing["checkpoint_interval"]
+    if not interval:
+        return []
+
+    connection = session.connection()
+    checkpoints, pending = [], 0
+    for ledger, expected in _walk_chain(connection, None, None, chunk_size):
+        if ledger.hash != expected or ledger.checkpoint not in (None, expected):
+            break
+
+        pending += 1
+        if ledger.checkpoint is not None:
+            pending = 0
+        elif pending >= interval:
+            checkpoints.append({"ledger_id": ledger.id, "hash": ledger.hash})
+            pending = 0
+
+    if checkpoints:
+        connection.execute(insert(LedgerCheckpoint), checkpoints)
+    session.commit()
+    return [c["ledger_id"] for c in checkpoints]
@@ -2,10 +2,16 @@ import pytest
 from datetime import datetime
 from decimal import Decimal
 from dateutil.relativedelta import relativedelta
-from sqlalchemy import select
+from sqlalchemy import create_engine, event, select
+from python_accounting.config import config
+from python_accounting.database.session import get_session
+from python_accounting.utils import dates
+from python_accounting.utils.balance_cache import balance_cache
 from python_accounting.models import (
     Account,
+    Base,
     Category,
+    Currency,
     Entity,
     Balance,
     Transaction,
@@ -13,6 +19,9 @@ from python_accounting.models import (
     LineItem,
     Tax,
     Assignment,
+    AccountCounter,
+    AccountMovement,
+    LedgerWatermark,
 )
 from python_accounting.transactions import (
     ClientInvoice,
@@ -30,6 +39,8 @@ from python_accounting.exceptions import (
     InvalidCategoryAccountTypeError,
     InvalidAccountTypeError,
     HangingTransactionsError,
+    ExhaustedAccountCodesError,
+    InvalidCursorError,
 )
 
 
@@ -161,6 +172,50 @@ def test_account_validation(session, entity, currency):
     )
 
 
+def test_account_codes(session, entity, currency):
+    """Tests the allocation of account codes from the counter table"""
+
+    session.add_all(
+        [
+            Account(
+                name=f"test client {i}",
+                account_type=Account.AccountType.RECEIVABLE,
+                currency_id=currency.id,
+                entity_id=entity.id,
+            )
+            for i in range(50)
+        ]
+    )
+    session.commit()
+
+    accounts = session.scalars(select(Account).order_by(Account.id)).all()
+    assert [a.account_code for a in accounts] == list(range(50001, 50051))
+    counter = session.scalar(select(AccountCounter))
+    assert counter.count == 50
+
+    # Counters missing from existing databases continue from the recorded Accounts
+    session.erase(counter)
+    session.commit()
+    assert Account.account_codes(session, Account.AccountType.RECEIVABLE, 2) == [
+        50051,
+        50052,
+    ]
+
+    assert Account.code_range(Account.AccountType.BANK) == (3000, 4000)
+    assert Account.code_range(Account.AccountType.RECEIVABLE) == (50000, None)
+
+    codes = Account.account_codes(session, Account.AccountType.BANK, 999)
+    assert codes[0] == 3001 and codes[-1] == 3999
+
+    with pytest.raises(ExhaustedAccountCodesError) as e:
+        Account.account_codes(session, Account.AccountType.BANK)
+    assert (
+        str(e.value)
+        == """No more Bank Account codes are available, as they
+         must be lower than 4000."""
+    )
+
+
 def test_account_isolation(session, entity, currency):
     """Tests the isolation of account objects by entity"""
 
@@ -399,6 +454,269 @@ def test_account_closing_balance(session, entity, currency):
         account1.closing_balance(session, datetime.now() - relativedelta(days=1)) == 90
     )
 
+    dates = [datetime.now() - relativedelta(days=1), datetime.now()]
+    assert Account.closing_balances(session, [account1.id, account2.id], dates) == {
+        account1.id: {dates[0]: 90, dates[1]: 65},
+        account2.id: {dates[0]: 0, dates[1]: 25},
+    }
+
+    # Large numbers of Accounts are queried in batches
+    account_ids = [account1.id] + list(range(10**6, 10**6 + 2500)) + [account2.id]
+    balances = Account.closing_balances(session, account_ids, dates)
+    assert len(balances) == 2502
+    assert balances[account1.id] == {dates[0]: 90, dates[1]: 65}
+    assert balances[account2.id] == {dates[0]: 0, dates[1]: 25}
+
+
+def test_account_movements(session, entity, currency, monkeypatch):
+    """Tests reading account balance movements from the daily totals"""
+    monkeypatch.setitem(config.movements, "enabled", True)
+
+    bank = Account(
+        name="test bank account",
+        account_type=Account.AccountType.BANK,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    revenue = Account(
+        name="test revenue account",
+        account_type=Account.AccountType.OPERATING_REVENUE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    session.add_all([bank, revenue])
+    session.flush()
+
+    start = entity.reporting_period.interval()["start"]
+    for days, hours, amount in [(1, 10, 100), (2, 15, 50), (2, 16, 20), (3, 9, 30)]:
+        transaction = CashSale(
+            narration="Test transaction",
+            transaction_date=start + relativedelta(days=days, hours=hours),
+            account_id=bank.id,
+            entity_id=entity.id,
+        )
+        line_item = LineItem(
+            narration="Test line item",
+            account_id=revenue.id,
+            amount=amount,
+            entity_id=entity.id,
+        )
+        session.add_all([transaction, line_item])
+        session.flush()
+        transaction.line_items.add(line_item)
+        session.add(transaction)
+        session.flush()
+        transaction.post(session)
+
+    movements = session.scalars(
+        select(AccountMovement)
+        .filter(AccountMovement.account_id == bank.id)
+        .order_by(AccountMovement.movement_date)
+    ).all()
+    assert [(m.debit, m.credit) for m in movements] == [(100, 0), (70, 0), (30, 0)]
+
+    end = start + relativedelta(days=3)
+    ranges = [
+        (start, end),
+        (start + relativedelta(days=1, hours=11), end),
+        (start + relativedelta(days=2, hours=15, minutes=30), end),
+        (start + relativedelta(days=2, hours=15), start + relativedelta(days=2)),
+    ]
+    expected = [200, 100, 50, 70]
+    assert [bank.balance_movement(session, *r) for r in ranges] == expected
+    assert [revenue.balance_movement(session, *r) for r in ranges] == [
+        -e for e in expected
+    ]
+
+    for movement in session.scalars(select(AccountMovement)).all():
+        session.erase(movement)
+    session.commit()
+    assert bank.balance_movement(session, start, end) == 0
+
+    assert AccountMovement.rebuild(session) == 6
+    assert [bank.balance_movement(session, *r) for r in ranges] == expected
+
+    series = {
+        "dates": [(start + relativedelta(days=d)).date() for d in range(4)],
+        "balances": [0, 100, 170, 200],
+    }
+    assert bank.balance_series(session, start, end, "day") == series
+    assert bank.balance_series(session, start, end) == {
+        "dates": [start.date()],
+        "balances": [200],
+    }
+
+    monkeypatch.setitem(config.movements, "enabled", False)
+    assert [bank.balance_movement(session, *r) for r in ranges] == expected
+    assert bank.balance_series(session, start, end, "day") == series
+    with pytest.raises(ValueError):
+        bank.balance_series(session, start, end, "year")
+
+
+def test_account_balance_cache(session, entity, currency, monkeypatch):
+    """Tests caching account balances against the ledger watermark"""
+    monkeypatch.setitem(config.cache, "balances", 3)
+    balance_cache.clear()
+
+    bank = Account(
+        name="test bank account",
+        account_type=Account.AccountType.BANK,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    revenue = Account(
+        name="test revenue account",
+        account_type=Account.AccountType.OPERATING_REVENUE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    session.add_all([bank, revenue])
+    session.commit()
+
+    def cash_sale(amount):
+        transaction = CashSale(
+            narration="Test transaction",
+            transaction_date=datetime.now(),
+            account_id=bank.id,
+            entity_id=entity.id,
+        )
+        line_item = LineItem(
+            narration="Test line item",
+            account_id=revenue.id,
+            amount=amount,
+            entity_id=entity.id,
+        )
+        session.add_all([transaction, line_item])
+        session.flush()
+        transaction.line_items.add(line_item)
+        session.add(transaction)
+        session.flush()
+        transaction.post(session)
+
+    cash_sale(100)
+    assert bank.closing_balance(session) == 100
+    assert bank.closing_balance(session) == 100
+    assert balance_cache.hits == 1
+
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    cash_sale(50)
+    statements.clear()
+    assert bank.closing_balance(session) == 150
+    assert revenue.closing_balance(session) == -150
+    assert balance_cache.hits == 1
+    assert len(balance_cache) == 3
+
+    # The watermark is read for every balance, including the opening balances of the
+    # closing balances computed, from the sum of its shards
+    assert len([s for s in statements if "FROM ledger_watermark" in s]) == 4
+    assert len(session.scalars(select(LedgerWatermark)).all()) <= LedgerWatermark.SHARDS
+
+    # Uncommitted changes are neither cached nor served from the cache
+    session.add(
+        Balance(
+            transaction_date=datetime.now() - relativedelta(years=1),
+            transaction_type=Transaction.TransactionType.JOURNAL_ENTRY,
+            amount=30,
+            balance_type=Balance.BalanceType.DEBIT,
+            account_id=bank.id,
+            entity_id=entity.id,
+        )
+    )
+    session.flush()
+    assert bank.closing_balance(session) == 180
+    assert balance_cache.hits == 1
+
+    session.rollback()
+    assert bank.closing_balance(session) == 150
+    assert balance_cache.hits == 2
+
+
+def test_account_balance_cache_sessions(tmp_path, monkeypatch):
+    """Tests that cached balances are not shared between databases or served stale"""
+    monkeypatch.setitem(config.cache, "balances", 10)
+    balance_cache.clear()
+
+    def cash_sale(session, ids, amount):
+        transaction = CashSale(
+            narration="Test transaction",
+            transaction_date=datetime.now(),
+            account_id=ids["bank"],
+            entity_id=ids["entity"],
+        )
+        line_item = LineItem(
+            narration="Test line item",
+            account_id=ids["revenue"],
+            amount=amount,
+            entity_id=ids["entity"],
+        )
+        session.add_all([transaction, line_item])
+        session.flush()
+        transaction.line_items.add(line_item)
+        session.add(transaction)
+        session.flush()
+        transaction.post(session)
+
+    def database(name, amount):
+        engine = create_engine(f"sqlite:///{tmp_path / name}")
+        Base.metadata.create_all(engine)
+        with get_session(engine) as session:
+            entity = Entity(name="Test Entity")
+            session.add(entity)
+            session.commit()
+            currency = Currency(name="US Dollars", code="USD", entity_id=entity.id)
+            session.add(currency)
+            session.commit()
+            accounts = [
+                Account(
+                    name=f"test {account_type.value} account",
+                    account_type=account_type,
+                    currency_id=currency.id,
+                    entity_id=entity.id,
+                )
+                for account_type in [
+                    Account.AccountType.BANK,
+                    Account.AccountType.OPERATING_REVENUE,
+                ]
+            ]
+            session.add_all(accounts)
+            session.commit()
+            ids = {
+                "entity": entity.id,
+                "bank": accounts[0].id,
+                "revenue": accounts[1].id,
+            }
+            cash_sale(session, ids, amount)
+        return engine, ids
+
+    def closing_balance(session, ids):
+        session.entity = session.get(Entity, ids["entity"])
+        return session.get(Account, ids["bank"]).closing_balance(session)
+
+    first, ids = database("first.db", 100)
+    second, _ = database("second.db", 200)
+
+    # Databases with the same ids keep their own balances
+    with get_session(first) as session:
+        assert closing_balance(session, ids) == 100
+    with get_session(second) as session:
+        assert closing_balance(session, ids) == 200
+
+    # A session is served the postings committed by others since it started
+    with get_session(first) as reader:
+        assert closing_balance(reader, ids) == 100
+        with get_session(first) as writer:
+            writer.entity = writer.get(Entity, ids["entity"])
+            cash_sale(writer, ids, 50)
+        assert closing_balance(reader, ids) == 150
+
+    first.dispose()
+    second.dispose()
+
 
 def test_account_section_balances(session, entity, currency):
     """Tests accounts' balances aggregation by section"""
@@ -542,7 +860,7 @@ def test_account_section_balances(session, entity, currency):
     assert control_balances["categories"][category4.name]["accounts"] == [account4]
 
 
-def test_bank_account_statement(session, entity, currency):
+def test_bank_account_statement(session, entity, currency, monkeypatch):
     """Tests a bank account's statement"""
 
     bank_account = Account(
@@ -818,6 +1136,41 @@ def test_bank_account_statement(session, entity, currency):
 
     assert statement["closing_balance"] == 120
 
+    lines = list(bank_account.iter_statement(session, chunk_size=2))
+    assert [(l["id"], l["debit"], l["credit"], l["balance"]) for l in lines] == [
+        (t.id, t.debit, t.credit, t.balance) for t in statement["transactions"]
+    ]
+    assert lines[0]["transaction_no"] == statement["transactions"][0].transaction_no
+
+    first = bank_account.statement_page(session, limit=4)
+    assert first["brought_forward"] == 70
+    assert first["transactions"] == lines[:4]
+    assert first["carried_forward"] == 205
+
+    last = bank_account.statement_page(session, cursor=first["cursor"], limit=4)
+    assert last["brought_forward"] == 205
+    assert last["transactions"] == lines[4:]
+    assert last["carried_forward"] == 120
+    assert last["cursor"] is None
+
+    # Cursors continue their statement after the day they were issued on
+    class Tomorrow(datetime):
+        @classmethod
+        def today(cls):
+            return datetime.today() + relativedelta(days=1)
+
+    monkeypatch.setattr(dates, "datetime", Tomorrow)
+    assert bank_account.statement_page(session, cursor=first["cursor"], limit=4) == last
+    monkeypatch.undo()
+
+    payload, _, signature = first["cursor"].partition(".")
+    with pytest.raises(InvalidCursorError):
+        bank_account.statement_page(session, cursor=f"{payload}x.{signature}")
+    with pytest.raises(InvalidCursorError):
+        bank_account.statement_page(
+            session, datetime.now() - relativedelta(days=1), cursor=first["cursor"]
+        )
+
     statement = bank_account.statement(
         session,
         datetime.now() - relativedelta(days=2),
@@ -1,5 +1,7 @@
 from dateutil.relativedelta import relativedelta
 from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import event
 from python_accounting.models import (
     Account,
     Balance,
@@ -559,3 +561,90 @@ def test_payables_aging_schedule(session, entity, currency):
     assert schedule.accounts[1].balances["181 - 270 days"] == 0
     assert schedule.accounts[1].balances["271 - 365 days"] == 83
     assert schedule.accounts[1].balances["365+ (bad debts)"] == 0
+
+
+def test_aging_schedule_query(session, entity, currency):
+    """Tests the aging of outstanding transactions of many accounts in one query"""
+
+    revenue = Account(
+        name="test account one",
+        account_type=Account.AccountType.OPERATING_REVENUE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    control = Account(
+        name="test account two",
+        account_type=Account.AccountType.CONTROL,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    clients = [
+        Account(
+            name=f"test client {i}",
+            account_type=Account.AccountType.RECEIVABLE,
+            currency_id=currency.id,
+            entity_id=entity.id,
+        )
+        for i in range(3)
+    ]
+    session.add_all([revenue, control, *clients])
+    session.flush()
+
+    tax = Tax(
+        name="Output Vat",
+        code="OTPT",
+        account_id=control.id,
+        rate=16,
+        entity_id=entity.id,
+    )
+    session.add(tax)
+    session.flush()
+
+    for i, client in enumerate(clients):
+        for days in [0, 45, 200]:
+            transaction = ClientInvoice(
+                narration="Test transaction",
+                transaction_date=datetime.now() - relativedelta(days=days + i),
+                account_id=client.id,
+                entity_id=entity.id,
+            )
+            line_item = LineItem(
+                narration="Test line item",
+                account_id=revenue.id,
+                amount=33 + i,
+                quantity=3,
+                tax_id=tax.id,
+                entity_id=entity.id,
+            )
+            session.add_all([transaction, line_item])
+            session.flush()
+            transaction.line_items.add(line_item)
+            session.add(transaction)
+            session.flush()
+            transaction.post(session)
+
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    schedule = AgingSchedule(session, Account.AccountType.RECEIVABLE)
+    assert len([s for s in statements if "FROM assignment" in s]) == 1
+
+    assert [a.id for a in schedule.accounts] == [c.id for c in clients]
+    for account in schedule.accounts:
+        expected = {bracket: 0 for bracket in AgingSchedule.brackets}
+        for transaction in account.statement(session, None, None, True)[
+            "transactions"
+        ]:
+            bracket = [
+                bracket
+                for bracket, max_age in AgingSchedule.brackets.items()
+                if transaction.age <= max_age
+            ][0]
+            expected[bracket] += transaction.uncleared_amount
+        assert account.balances == expected
+    assert schedule.balances["current"] == sum(
+        (33 + i) * 3 * Decimal("1.16") for i in range(3)
+    )
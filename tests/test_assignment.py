@@ -3,6 +3,7 @@ from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from python_accounting.transactions import ClientReceipt, ClientInvoice, JournalEntry
 from python_accounting.models import Account, Assignment, Balance, LineItem, Transaction
+from python_accounting.mixins import ClearingMixin
 from python_accounting.exceptions import (
     UnassignableTransactionError,
     UnclearableTransactionError,
@@ -594,3 +595,7 @@ def test_bulk_assignment(session, entity, currency):
 
     assert balance.cleared(session) == 75
     assert invoice.cleared(session) == 25
+    assert ClearingMixin.cleared_amounts(session, [balance, invoice, receipt]) == {
+        (balance.id, "Balance"): 75,
+        (invoice.id, "ClientInvoice"): 25,
+    }
@@ -0,0 +1,95 @@
+import pytest
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import event
+from python_accounting.models import Account, LineItem
+from python_accounting.transactions import CashSale
+from python_accounting.reports import (
+    ComparativeStatement,
+    IncomeStatement,
+    BalanceSheet,
+)
+
+
+def test_comparative_statement(session, entity, currency):
+    """Tests the generation of an entity's financial statements for several periods"""
+
+    bank = Account(
+        name="test account one",
+        account_type=Account.AccountType.BANK,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    revenue = Account(
+        name="test account two",
+        account_type=Account.AccountType.OPERATING_REVENUE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    session.add_all([bank, revenue])
+    session.flush()
+
+    period_start = entity.reporting_period.interval()["start"]
+    for months, amount in [(0, 100), (1, 50), (3, 25)]:
+        transaction = CashSale(
+            narration="Test transaction",
+            transaction_date=period_start + relativedelta(months=months, days=1),
+            account_id=bank.id,
+            entity_id=entity.id,
+        )
+        line_item = LineItem(
+            narration="Test line item",
+            account_id=revenue.id,
+            amount=amount,
+            entity_id=entity.id,
+        )
+        session.add_all([transaction, line_item])
+        session.flush()
+        transaction.line_items.add(line_item)
+        session.add(transaction)
+        session.flush()
+        transaction.post(session)
+
+    end_date = period_start + relativedelta(months=6, days=-1)
+    statements = []
+    event.listen(
+        session.connection(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    income_statements = ComparativeStatement(
+        session,
+        IncomeStatement,
+        periods=ComparativeStatement.buckets(session, end_date=end_date),
+    )
+    assert len([s for s in statements if s.startswith("SELECT ledger.")]) == 1
+
+    assert len(income_statements.periods) == 6
+    assert income_statements.result_amounts["NET_PROFIT"] == [100, 50, 0, 25, 0, 0]
+    for (start, end), column in zip(income_statements.periods, income_statements.columns):
+        assert str(column) == str(IncomeStatement(session, start, end))
+
+    balance_sheets = ComparativeStatement(
+        session,
+        BalanceSheet,
+        periods=ComparativeStatement.buckets(
+            session, end_date=end_date, bucket="quarter"
+        ),
+    )
+    assert [end.month for _, end in balance_sheets.periods] == [
+        (period_start + relativedelta(months=months)).month for months in [2, 5]
+    ]
+    assert balance_sheets.totals["ASSETS"] == [150, 175]
+    assert "Balance Sheet" in str(balance_sheets)
+
+    quarters = ComparativeStatement(session, BalanceSheet, bucket="quarter")
+    assert quarters.periods == ComparativeStatement.buckets(session, bucket="quarter")
+
+    with pytest.raises(ValueError):
+        ComparativeStatement.buckets(session, bucket="fortnight")
+    with pytest.raises(ValueError):
+        ComparativeStatement(session, IncomeStatement, bucket="fortnight")
+    with pytest.raises(ValueError):
+        ComparativeStatement(
+            session, IncomeStatement, periods=quarters.periods, bucket="quarter"
+        )
@@ -0,0 +1,144 @@
+from datetime import datetime
+from sqlalchemy import create_engine, inspect, select, update
+from python_accounting.config import config
+from python_accounting.models import (
+    Account,
+    Base,
+    Currency,
+    Entity,
+    Ledger,
+    LedgerCheckpoint,
+    LineItem,
+    Transaction,
+)
+from python_accounting.database.database_init import create_indexes, database_init
+from python_accounting.database.session import get_session
+from python_accounting.transactions import CashSale
+from python_accounting.utils.ledger_chain import verify_ledger_chain
+
+
+def test_create_indexes(tmp_path):
+    """Tests creating the model indexes missing from an existing database"""
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'accounting.db'}")
+    Base.metadata.create_all(engine)
+    assert create_indexes(engine) == []
+
+    for index in Ledger.__table__.indexes:
+        index.drop(engine)
+    assert inspect(engine).get_indexes("ledger") == []
+
+    assert sorted(create_indexes(engine)) == [
+        "ix_ledger_folio",
+        "ix_ledger_posting",
+        "ix_ledger_statement",
+        "ix_ledger_transaction",
+    ]
+    assert len(inspect(engine).get_indexes("ledger")) == 4
+    assert create_indexes(engine) == []
+
+    # Indexes declared with different columns are rebuilt
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_ledger_posting")
+        connection.exec_driver_sql(
+            "CREATE INDEX ix_ledger_posting ON ledger "
+            "(entity_id, post_account_id, currency_id, transaction_date, transaction_id)"
+        )
+    assert create_indexes(engine) == ["ix_ledger_posting"]
+    assert {
+        index["name"]: index["column_names"]
+        for index in inspect(engine).get_indexes("ledger")
+    }["ix_ledger_posting"][-1] == "entry_type"
+    assert create_indexes(engine) == []
+
+
+def test_database_init_ledger_cutover(tmp_path):
+    """Tests verifying the Ledgers of a database hashed before the chain was continuous"""
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'accounting.db'}")
+    Base.metadata.create_all(engine)
+
+    def post_transaction(session, amount):
+        transaction = CashSale(
+            narration="Test transaction",
+            transaction_date=datetime.now(),
+            account_id=ids["bank"],
+            entity_id=ids["entity"],
+        )
+        line_item = LineItem(
+            narration="Test line item",
+            account_id=ids["revenue"],
+            amount=amount,
+            entity_id=ids["entity"],
+        )
+        session.add_all([transaction, line_item])
+        session.flush()
+        transaction.line_items.add(line_item)
+        session.add(transaction)
+        session.flush()
+        transaction.post(session)
+        return transaction.id
+
+    with get_session(engine) as session:
+        entity = Entity(name="Test Entity")
+        session.add(entity)
+        session.commit()
+        currency = Currency(name="US Dollars", code="USD", entity_id=entity.id)
+        session.add(currency)
+        session.commit()
+        bank = Account(
+            name="test bank account",
+            account_type=Account.AccountType.BANK,
+            currency_id=currency.id,
+            entity_id=entity.id,
+        )
+        revenue = Account(
+            name="test revenue account",
+            account_type=Account.AccountType.OPERATING_REVENUE,
+            currency_id=currency.id,
+            entity_id=entity.id,
+        )
+        session.add_all([bank, revenue])
+        session.commit()
+        ids = {"entity": entity.id, "bank": bank.id, "revenue": revenue.id}
+
+        legacy = [post_transaction(session, amount) for amount in [10, 20, 30]]
+
+        # Rehash the Ledgers under the legacy rule, chained to the record with id - 1
+        connection = session.connection()
+        hashes = {}
+        for ledger in connection.execute(select(Ledger).order_by(Ledger.id)).all():
+            hashes[ledger.id] = Ledger.compute_hash(
+                ledger, hashes.get(ledger.id - 1, config.hashing["salt"])
+            )
+            connection.execute(
+                update(Ledger)
+                .where(Ledger.id == ledger.id)
+                .values(hash=hashes[ledger.id])
+            )
+        session.commit()
+        assert session.get(Transaction, legacy[1]).is_secure(session) is False
+
+    LedgerCheckpoint.__table__.drop(engine)
+    database_init(engine)
+    database_init(engine)
+
+    with get_session(engine) as session:
+        session.entity = session.get(Entity, ids["entity"])
+        checkpoints = session.scalars(select(LedgerCheckpoint)).all()
+        assert [(c.ledger_id, c.legacy) for c in checkpoints] == [(max(hashes), True)]
+
+        recent = post_transaction(session, 40)
+
+        assert verify_ledger_chain(session) is None
+        assert all(
+            session.get(Transaction, t).is_secure(session) for t in legacy + [recent]
+        )
+
+        session.connection().execute(
+            update(Ledger).where(Ledger.id == min(hashes)).values(amount=1000)
+        )
+        assert verify_ledger_chain(session) == min(hashes)
+        assert session.get(Transaction, legacy[0]).is_secure(session) is False
+        assert session.get(Transaction, recent).is_secure(session) is True
+    engine.dispose()
@@ -0,0 +1,349 @@
+import io
+import json
+import pytest
+from datetime import datetime
+from sqlalchemy import event, select
+from python_accounting.models import Account, Tax, Transaction, Balance
+from python_accounting.transactions import ClientInvoice, CashPurchase, JournalEntry
+from python_accounting.importers import TransactionImporter, read_csv, read_jsonl
+from python_accounting.utils.ledger_chain import verify_ledger_chain
+from python_accounting.exceptions import (
+    InvalidImportRecordError,
+    InvalidMainAccountError,
+    UnbalancedTransactionError,
+)
+
+
+@pytest.fixture
+def accounts(session, entity, currency):
+    accounts = {
+        account_type: Account(
+            name=f"test {account_type.value} account",
+            account_type=account_type,
+            currency_id=currency.id,
+            entity_id=entity.id,
+        )
+        for account_type in [
+            Account.AccountType.RECEIVABLE,
+            Account.AccountType.OPERATING_REVENUE,
+            Account.AccountType.BANK,
+            Account.AccountType.OPERATING_EXPENSE,
+            Account.AccountType.CONTROL,
+        ]
+    }
+    session.add_all(accounts.values())
+    session.flush()
+    return accounts
+
+
+def test_import_jsonl(session, entity, accounts):
+    """Tests importing transactions from json lines"""
+
+    tax = Tax(
+        name="Output Vat",
+        code="OTPT",
+        account_id=accounts[Account.AccountType.CONTROL].id,
+        rate=10,
+        entity_id=entity.id,
+    )
+    session.add(tax)
+    session.commit()
+
+    date = datetime.now().isoformat()
+    records = [
+        {
+            "transaction_type": "CLIENT_INVOICE",
+            "transaction_date": date,
+            "narration": "Test invoice",
+            "account_id": accounts[Account.AccountType.RECEIVABLE].id,
+            "line_items": [
+                {
+                    "narration": "Test line item one",
+                    "account_id": accounts[Account.AccountType.OPERATING_REVENUE].id,
+                    "amount": 100,
+                    "tax_id": tax.id,
+                },
+                {
+                    "narration": "Test line item two",
+                    "account_id": accounts[Account.AccountType.OPERATING_REVENUE].id,
+                    "amount": 25,
+                    "quantity": 2,
+                },
+            ],
+        },
+        {
+            "transaction_type": "Cash Purchase",
+            "transaction_date": date,
+            "narration": "Test purchase",
+            "account_id": accounts[Account.AccountType.BANK].id,
+            "line_items": [
+                {
+                    "narration": "Test line item",
+                    "account_id": accounts[Account.AccountType.OPERATING_EXPENSE].id,
+                    "amount": 40,
+                }
+            ],
+        },
+        {
+            "transaction_type": "JOURNAL_ENTRY",
+            "transaction_date": date,
+            "narration": "Test journal",
+            "account_id": accounts[Account.AccountType.BANK].id,
+            "compound": True,
+            "main_account_amount": 30,
+            "line_items": [
+                {
+                    "narration": "Test line item one",
+                    "account_id": accounts[Account.AccountType.OPERATING_EXPENSE].id,
+                    "amount": 20,
+                },
+                {
+                    "narration": "Test line item two",
+                    "account_id": accounts[Account.AccountType.RECEIVABLE].id,
+                    "amount": 10,
+                },
+            ],
+        },
+    ]
+    source = io.StringIO("\n".join(json.dumps(r) for r in records * 2))
+
+    assert TransactionImporter(session, chunk_size=4).run(read_jsonl(source)) == 6
+
+    transactions = session.scalars(select(Transaction).order_by(Transaction.id)).all()
+    assert [type(t) for t in transactions] == [
+        ClientInvoice,
+        CashPurchase,
+        JournalEntry,
+    ] * 2
+    assert [t.transaction_no for t in transactions] == [
+        "IN01/0001",
+        "CP01/0001",
+        "JN01/0001",
+        "IN01/0002",
+        "CP01/0002",
+        "JN01/0002",
+    ]
+
+    invoice, purchase, journal = transactions[:3]
+    assert invoice.amount == 160
+    assert len(invoice.ledgers) == 6
+    assert invoice.contribution(session, accounts[Account.AccountType.CONTROL]) == -10
+    assert purchase.contribution(session, accounts[Account.AccountType.BANK]) == -40
+    assert journal.contribution(session, accounts[Account.AccountType.BANK]) == -30
+    assert (
+        journal.contribution(session, accounts[Account.AccountType.RECEIVABLE]) == 10
+    )
+    assert all(t.is_secure(session) for t in transactions)
+
+    transaction = CashPurchase(
+        narration="Test transaction",
+        transaction_date=datetime.now(),
+        account_id=accounts[Account.AccountType.BANK].id,
+        entity_id=entity.id,
+    )
+    session.add(transaction)
+    session.commit()
+    assert transaction.transaction_no == "CP01/0003"
+
+    assert verify_ledger_chain(session) is None
+
+
+def test_import_csv(session, entity, accounts):
+    """Tests importing transactions from csv with one line item per row"""
+
+    date = datetime.now().isoformat()
+    receivable = accounts[Account.AccountType.RECEIVABLE].id
+    revenue = accounts[Account.AccountType.OPERATING_REVENUE].id
+    source = io.StringIO(
+        "transaction,transaction_type,transaction_date,narration,account_id,"
+        "transaction_no,line_item_narration,line_item_account_id,line_item_amount\n"
+        f"1,CLIENT_INVOICE,{date},Test invoice,{receivable},INV-1,Item one,{revenue},50\n"
+        f"1,,,,,,Item two,{revenue},70\n"
+        f"2,CLIENT_INVOICE,{date},Test invoice,{receivable},,Item one,{revenue},30\n"
+    )
+
+    assert TransactionImporter(session).run(read_csv(source)) == 2
+
+    transactions = session.scalars(select(Transaction).order_by(Transaction.id)).all()
+    assert [t.transaction_no for t in transactions] == ["INV-1", "IN01/0001"]
+    assert [t.amount for t in transactions] == [120, 30]
+    assert all(
+        l.entry_type == Balance.BalanceType.CREDIT
+        for l in transactions[0].ledgers
+        if l.post_account_id == revenue
+    )
+
+
+def test_import_validation(session, entity, accounts):
+    """Tests that invalid records are reported and their chunk is not imported"""
+
+    record = {
+        "transaction_type": "CLIENT_INVOICE",
+        "transaction_date": datetime.now().isoformat(),
+        "narration": "Test invoice",
+        "account_id": accounts[Account.AccountType.RECEIVABLE].id,
+        "line_items": [
+            {
+                "narration": "Test line item",
+                "account_id": accounts[Account.AccountType.OPERATING_REVENUE].id,
+                "amount": 100,
+            }
+        ],
+    }
+    importer = TransactionImporter(session, chunk_size=2)
+
+    with pytest.raises(InvalidImportRecordError) as e:
+        importer.run(
+            [record] * 3
+            + [dict(record, account_id=accounts[Account.AccountType.BANK].id)]
+        )
+    assert e.value.record == 4
+    assert isinstance(e.value.error, InvalidMainAccountError)
+    assert importer.imported == 2
+    assert len(session.scalars(select(Transaction)).all()) == 2
+
+    journal = {
+        "transaction_type": "JOURNAL_ENTRY",
+        "transaction_date": datetime.now().isoformat(),
+        "narration": "Test journal",
+        "account_id": accounts[Account.AccountType.BANK].id,
+        "compound": True,
+        "main_account_amount": 30,
+        "line_items": [
+            {
+                "narration": "Test line item",
+                "account_id": accounts[Account.AccountType.OPERATING_EXPENSE].id,
+                "amount": 20,
+            }
+        ],
+    }
+    with pytest.raises(InvalidImportRecordError) as e:
+        TransactionImporter(session).run([journal])
+    assert e.value.record == 1
+    assert isinstance(e.value.error, UnbalancedTransactionError)
+    assert str(e.value) == (
+        "Record 1 could not be imported: "
+        "Total Debit amounts do not match total Credit amounts."
+    )
+
+    # Transaction numbers must be unique within the import and against the Ledger
+    numbered = dict(record, transaction_no="INV/001")
+    with pytest.raises(InvalidImportRecordError) as e:
+        TransactionImporter(session).run([numbered, record, numbered])
+    assert e.value.record == 3
+    assert str(e.value.error) == "Transaction number INV/001 already exists"
+
+    assert TransactionImporter(session).run([numbered]) == 1
+    with pytest.raises(InvalidImportRecordError) as e:
+        TransactionImporter(session).run([record, numbered])
+    assert e.value.record == 2
+    assert len(session.scalars(select(Transaction)).all()) == 3
+
+    # The numbers reserved for a failed chunk are released
+    assert TransactionImporter(session).run([record]) == 1
+    transaction = session.scalars(
+        select(Transaction).order_by(Transaction.id.desc())
+    ).first()
+    assert transaction.transaction_no == "IN01/0003"
+
+
+def test_import_transaction_numbers(session, entity, accounts):
+    """Tests that supplied transaction numbers are not generated again"""
+
+    record = {
+        "transaction_type": "CLIENT_INVOICE",
+        "transaction_date": datetime.now().isoformat(),
+        "narration": "Test invoice",
+        "account_id": accounts[Account.AccountType.RECEIVABLE].id,
+        "line_items": [
+            {
+                "narration": "Test line item",
+                "account_id": accounts[Account.AccountType.OPERATING_REVENUE].id,
+                "amount": 100,
+            }
+        ],
+    }
+    importer = TransactionImporter(session)
+    importer.run(
+        [
+            dict(record, transaction_no="IN01/0005"),
+            dict(record, transaction_no="IN01/0003"),
+            dict(record, transaction_no="CN01/0009"),
+            record,
+        ]
+    )
+    assert importer.imported == 4
+
+    transactions = session.scalars(select(Transaction).order_by(Transaction.id)).all()
+    assert transactions[-1].transaction_no == "IN01/0006"
+
+    transaction = ClientInvoice(
+        narration="Test transaction",
+        transaction_date=datetime.now(),
+        account_id=accounts[Account.AccountType.RECEIVABLE].id,
+        entity_id=entity.id,
+    )
+    session.add(transaction)
+    session.commit()
+    assert transaction.transaction_no == "IN01/0007"
+
+
+def test_import_without_returning(session, entity, accounts, monkeypatch):
+    """Tests importing on databases that cannot return the ids of inserted rows"""
+
+    monkeypatch.setattr(session.get_bind().dialect, "insert_returning", False)
+    record = {
+        "transaction_type": "CLIENT_INVOICE",
+        "transaction_date": datetime.now().isoformat(),
+        "narration": "Test invoice",
+        "account_id": accounts[Account.AccountType.RECEIVABLE].id,
+        "line_items": [
+            {
+                "narration": "Test line item",
+                "account_id": accounts[Account.AccountType.OPERATING_REVENUE].id,
+                "amount": 100,
+            }
+        ],
+    }
+
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda *args: statements.append((args[2], args[5])),
+    )
+    importer = TransactionImporter(session)
+    assert importer.run([record] * 3) == 3
+
+    # Each table is written with one executemany statement
+    inserts = [s for s in statements if s[0].startswith("INSERT INTO recyclable")]
+    assert len(inserts) == 3 and all(executemany for _, executemany in inserts)
+
+    # Rows inserted one at a time do not take the ids reserved by later imports
+    transaction = ClientInvoice(
+        narration="Test transaction",
+        transaction_date=datetime.now(),
+        account_id=accounts[Account.AccountType.RECEIVABLE].id,
+        entity_id=entity.id,
+    )
+    session.add(transaction)
+    session.commit()
+    assert importer.run([record] * 2) == 5
+
+    transactions = session.scalars(select(Transaction).order_by(Transaction.id)).all()
+    assert [type(t) for t in transactions] == [ClientInvoice] * 6
+    assert [t.transaction_no for t in transactions] == [
+        "IN01/0001",
+        "IN01/0002",
+        "IN01/0003",
+        "IN01/0004",
+        "IN01/0005",
+        "IN01/0006",
+    ]
+    assert transactions[3].id == transaction.id
+    assert all(
+        len(t.ledgers) == 2 and t.amount == 100
+        for t in transactions
+        if t.id != transaction.id
+    )
+    assert verify_ledger_chain(session) is None
@@ -172,6 +172,135 @@ def test_compound_journal_entry_ledgers(session, entity, currency):
     assert transaction.amount == 175
 
 
+def test_compound_journal_entry_many_line_items(session, entity, currency):
+    """Tests compound journal entries with more line items than the recursion limit"""
+
+    account1 = Account(
+        name="test account one",
+        account_type=Account.AccountType.CURRENT_LIABILITY,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    account2 = Account(
+        name="test account two",
+        account_type=Account.AccountType.OPERATING_EXPENSE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    account3 = Account(
+        name="test account three",
+        account_type=Account.AccountType.CONTROL,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    session.add_all([account1, account2, account3])
+    session.flush()
+
+    transaction = JournalEntry(
+        narration="Test payroll run",
+        transaction_date=datetime.now(),
+        account_id=account1.id,
+        entity_id=entity.id,
+        main_account_amount=1200,
+        compound=True,
+    )
+    session.add(transaction)
+    session.commit()
+
+    line_items = [
+        LineItem(
+            narration=f"Test line item {i}",
+            account_id=account2.id,
+            amount=2,
+            entity_id=entity.id,
+        )
+        for i in range(550)
+    ] + [
+        LineItem(
+            narration=f"Test line item {i}",
+            account_id=account3.id,
+            amount=2,
+            entity_id=entity.id,
+        )
+        for i in range(50)
+    ]
+    session.add_all(line_items)
+    session.flush()
+
+    transaction.line_items.update(line_items)
+    session.add(transaction)
+    session.flush()
+
+    transaction.post(session)
+
+    assert len(transaction.ledgers) == 1200
+    assert transaction.contribution(session, account1) == -1200
+    assert transaction.contribution(session, account2) == 1100
+    assert transaction.contribution(session, account3) == 100
+    assert all(
+        ledger.amount == 2
+        and (ledger.post_account_id == account1.id)
+        != (ledger.folio_account_id == account1.id)
+        for ledger in transaction.ledgers
+    )
+
+
+def test_compound_journal_entry_net_contribution(session, entity, currency):
+    """Tests the contribution of an account posted on both sides of a journal entry"""
+
+    account1 = Account(
+        name="test account one",
+        account_type=Account.AccountType.BANK,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    account2 = Account(
+        name="test account two",
+        account_type=Account.AccountType.CONTROL,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    session.add_all([account1, account2])
+    session.flush()
+
+    transaction = JournalEntry(
+        narration="Test transaction one",
+        transaction_date=datetime.now(),
+        account_id=account1.id,
+        entity_id=entity.id,
+        credited=False,
+        main_account_amount=25,
+        compound=True,
+    )
+    session.add(transaction)
+    session.commit()
+
+    line_item1 = LineItem(
+        narration="Test line item one",
+        account_id=account2.id,
+        amount=100,
+        credited=True,
+        entity_id=entity.id,
+    )
+    line_item2 = LineItem(
+        narration="Test line item two",
+        account_id=account2.id,
+        amount=75,
+        entity_id=entity.id,
+    )
+    session.add_all([line_item1, line_item2])
+    session.flush()
+
+    transaction.line_items.update([line_item1, line_item2])
+    session.add(transaction)
+    session.flush()
+
+    transaction.post(session)
+
+    assert transaction.contribution(session, account1) == 25
+    assert transaction.contribution(session, account2) == -25
+
+
 def test_journal_entry_validation(session, entity, currency):
     """Tests the validation of journal entry transactions"""
     account1 = Account(
@@ -1,10 +1,23 @@
 from datetime import datetime
+from sqlalchemy import create_engine, event, select, update
 from python_accounting.models import (
     Ledger,
     Account,
     Transaction,
     LineItem,
+    Tax,
+    Base,
+    Entity,
+    Currency,
+    LedgerCheckpoint,
 )
+from python_accounting.config import config
+from python_accounting.database.session import get_session
+from python_accounting.utils.ledger_chain import (
+    record_ledger_checkpoints,
+    verify_ledger_chain,
+)
+from python_accounting.transactions import ClientInvoice
 
 
 def test_ledger_entity(session, entity, currency):
@@ -55,3 +68,336 @@ def test_ledger_entity(session, entity, currency):
     assert ledger.post_account.name == "Test Ledger Account"
     assert ledger.folio_account.name == "Test Line Item Account"
     assert ledger.line_item.amount == 10
+
+
+def test_ledger_batch_posting(session, entity, currency):
+    """Tests that all of a Transaction's Ledgers are written in a single flush"""
+
+    account1 = Account(
+        name="test client account",
+        account_type=Account.AccountType.RECEIVABLE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    account2 = Account(
+        name="test revenue account",
+        account_type=Account.AccountType.OPERATING_REVENUE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    account3 = Account(
+        name="test tax account",
+        account_type=Account.AccountType.CONTROL,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    session.add_all([account1, account2, account3])
+    session.flush()
+
+    tax = Tax(
+        name="Output Vat",
+        code="OTPT",
+        account_id=account3.id,
+        rate=16,
+        entity_id=entity.id,
+    )
+    session.add(tax)
+    session.flush()
+
+    transaction = ClientInvoice(
+        narration="Test transaction",
+        transaction_date=datetime.now(),
+        account_id=account1.id,
+        entity_id=entity.id,
+    )
+    session.add(transaction)
+    session.flush()
+
+    line_items = [
+        LineItem(
+            narration=f"Test line item {i}",
+            account_id=account2.id,
+            amount=10 * i,
+            tax_id=tax.id if i % 2 else None,
+            entity_id=entity.id,
+        )
+        for i in range(1, 11)
+    ]
+    session.add_all(line_items)
+    session.flush()
+
+    for line_item in line_items:
+        transaction.line_items.add(line_item)
+    session.add(transaction)
+    session.flush()
+
+    writes = {"flush": 0, "commit": 0}
+    event.listen(
+        session, "after_flush", lambda *_: writes.update(flush=writes["flush"] + 1)
+    )
+    event.listen(
+        session, "after_commit", lambda *_: writes.update(commit=writes["commit"] + 1)
+    )
+
+    transaction.post(session)
+
+    assert writes == {"flush": 1, "commit": 1}
+    assert len(transaction.ledgers) == 30
+    assert transaction.contribution(session, account1) == transaction.amount
+    assert account1.closing_balance(session) == transaction.amount
+    assert transaction.is_secure(session)
+
+
+def test_ledger_hash_chain(session, entity, currency):
+    """Tests that Ledger hashes are chained in memory across Transactions"""
+
+    account1 = Account(
+        name="test bank account",
+        account_type=Account.AccountType.BANK,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    account2 = Account(
+        name="test expense account",
+        account_type=Account.AccountType.OPERATING_EXPENSE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    session.add_all([account1, account2])
+    session.flush()
+
+    for i in range(1, 4):
+        transaction = Transaction(
+            narration=f"Test transaction {i}",
+            transaction_date=datetime.now(),
+            account_id=account1.id,
+            transaction_type=Transaction.TransactionType.JOURNAL_ENTRY,
+            entity_id=entity.id,
+        )
+        session.add(transaction)
+        session.flush()
+
+        line_items = [
+            LineItem(
+                narration=f"Test line item {j}",
+                account_id=account2.id,
+                amount=i * j,
+                entity_id=entity.id,
+            )
+            for j in range(1, 3)
+        ]
+        session.add_all(line_items)
+        session.flush()
+
+        transaction.line_items.update(line_items)
+        session.add(transaction)
+        session.flush()
+
+        statements = []
+        event.listen(
+            session.connection(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        transaction.post(session)
+
+        # One lookup of the chain tail, no updates of the ledgers after the inserts
+        assert len([s for s in statements if s.startswith("SELECT")]) == 1
+        assert not [s for s in statements if s.startswith("UPDATE ledger ")]
+
+    ledgers = session.scalars(select(Ledger).order_by(Ledger.id)).all()
+    assert len(ledgers) == 12
+
+    previous = config.hashing["salt"]
+    for ledger in ledgers:
+        assert ledger.hash == ledger.get_hash(session.connection(), previous)
+        assert ledger.hash == ledger.get_hash(session.connection())
+        previous = ledger.hash
+
+
+def _post_transactions(session, entity, currency, count):
+    account1 = Account(
+        name="test bank account",
+        account_type=Account.AccountType.BANK,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    account2 = Account(
+        name="test expense account",
+        account_type=Account.AccountType.OPERATING_EXPENSE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    session.add_all([account1, account2])
+    session.flush()
+
+    for i in range(1, count + 1):
+        transaction = Transaction(
+            narration=f"Test transaction {i}",
+            transaction_date=datetime.now(),
+            account_id=account1.id,
+            transaction_type=Transaction.TransactionType.JOURNAL_ENTRY,
+            entity_id=entity.id,
+        )
+        session.add(transaction)
+        session.flush()
+
+        line_item = LineItem(
+            narration=f"Test line item {i}",
+            account_id=account2.id,
+            amount=i,
+            entity_id=entity.id,
+        )
+        session.add(line_item)
+        session.flush()
+
+        transaction.line_items.add(line_item)
+        session.add(transaction)
+        session.flush()
+        transaction.post(session)
+
+    return session.scalars(select(Ledger.id).order_by(Ledger.id)).all()
+
+
+def test_verify_ledger_chain(session, entity, currency):
+    """Tests the verification of the Ledger hash chain"""
+
+    ids = _post_transactions(session, entity, currency, 10)
+
+    assert verify_ledger_chain(session) is None
+    assert verify_ledger_chain(session, ids[5], ids[12], chunk_size=3) is None
+
+    amount = session.get(Ledger, ids[7]).amount
+    session.connection().execute(
+        update(Ledger).where(Ledger.id == ids[7]).values(amount=1000)
+    )
+
+    assert verify_ledger_chain(session, chunk_size=3) == ids[7]
+    assert verify_ledger_chain(session, ids[3]) == ids[7]
+    assert verify_ledger_chain(session, None, ids[6]) is None
+
+    # Without checkpoints, verification starts from the beginning of the chain
+    assert verify_ledger_chain(session, ids[8]) == ids[7]
+
+    # So a Ledger whose own hash was rewritten is caught from any later range
+    connection = session.connection()
+    connection.execute(update(Ledger).where(Ledger.id == ids[7]).values(amount=amount))
+    connection.execute(update(Ledger).where(Ledger.id == ids[14]).values(amount=1000))
+    tampered = connection.execute(select(Ledger).where(Ledger.id == ids[14])).one()
+    connection.execute(
+        update(Ledger)
+        .where(Ledger.id == ids[14])
+        .values(
+            hash=Ledger.compute_hash(tampered, session.get(Ledger, ids[13]).hash)
+        )
+    )
+    assert verify_ledger_chain(session, ids[18]) == ids[15]
+
+
+def test_verify_ledger_chain_segments(tmp_path, monkeypatch):
+    """Tests the verification of the Ledger hash chain in parallel segments"""
+
+    monkeypatch.setitem(config.hashing, "checkpoint_interval", 4)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}")
+    Base.metadata.create_all(engine)
+
+    with get_session(engine) as session:
+        entity = Entity(name="Test Entity")
+        session.add(entity)
+        session.commit()
+
+        currency = Currency(name="US Dollars", code="USD", entity_id=entity.id)
+        session.add(currency)
+        session.commit()
+
+        ids = _post_transactions(session, entity, currency, 20)
+
+        assert verify_ledger_chain(session, processes=2) is None
+
+        session.connection().execute(
+            update(Ledger).where(Ledger.id.in_([ids[15], ids[31]])).values(amount=1)
+        )
+        session.commit()
+
+        assert verify_ledger_chain(session, processes=2, chunk_size=4) == ids[15]
+        assert verify_ledger_chain(session, ids[16], processes=3) == ids[31]
+    engine.dispose()
+
+
+def test_ledger_checkpoints(session, entity, currency, monkeypatch):
+    """Tests the verification of the Ledger hash chain from checkpoints"""
+
+    monkeypatch.setitem(config.hashing, "checkpoint_interval", 4)
+    ids = _post_transactions(session, entity, currency, 10)
+
+    checkpoints = session.scalars(
+        select(LedgerCheckpoint).order_by(LedgerCheckpoint.ledger_id)
+    ).all()
+    assert [c.ledger_id for c in checkpoints] == ids[3::4]
+    assert [c.hash for c in checkpoints] == [
+        session.get(Ledger, i).hash for i in ids[3::4]
+    ]
+
+    transactions = session.scalars(select(Transaction).order_by(Transaction.id)).all()
+    connection = session.connection()
+    connection.execute(update(Ledger).where(Ledger.id == ids[1]).values(amount=1000))
+
+    # Verification starts at the nearest checkpoint so earlier tampering is not read
+    assert verify_ledger_chain(session) == ids[1]
+    assert verify_ledger_chain(session, ids[12]) is None
+    assert transactions[0].is_secure(session) is False
+    assert transactions[9].is_secure(session) is True
+
+    # Rewriting the hashes of the tampered ledgers breaks the next checkpoint
+    connection.execute(update(Ledger).where(Ledger.id == ids[1]).values(amount=1))
+    connection.execute(update(Ledger).where(Ledger.id == ids[13]).values(amount=1000))
+    previous = session.get(Ledger, ids[12]).hash
+    for ledger_id in ids[13:]:
+        ledger = connection.execute(select(Ledger).where(Ledger.id == ledger_id)).one()
+        previous = Ledger.compute_hash(ledger, previous)
+        connection.execute(
+            update(Ledger).where(Ledger.id == ledger_id).values(hash=previous)
+        )
+
+    assert verify_ledger_chain(session, ids[12]) == ids[15]
+    assert verify_ledger_chain(session) == ids[15]
+    assert transactions[5].is_secure(session) is True
+    assert transactions[6].is_secure(session) is False
+    assert transactions[8].is_secure(session) is False
+
+
+def test_ledger_checkpoints_disabled(session, entity, currency, monkeypatch):
+    """Tests the verification and backfilling of a Ledger hash chain without checkpoints"""
+
+    monkeypatch.setitem(config.hashing, "checkpoint_interval", 0)
+    ids = _post_transactions(session, entity, currency, 10)
+    assert not session.scalars(select(LedgerCheckpoint)).all()
+
+    hashed = []
+    compute_hash = Ledger.compute_hash
+    monkeypatch.setattr(
+        Ledger,
+        "compute_hash",
+        lambda ledger, previous: hashed.append(ledger.id)
+        or compute_hash(ledger, previous),
+    )
+
+    # Without checkpoints, the Transaction's Ledgers are verified from the start of the chain
+    transaction = session.scalars(
+        select(Transaction).order_by(Transaction.id.desc())
+    ).first()
+    assert transaction.is_secure(session) is True
+    assert hashed == ids
+
+    # Checkpoints are backfilled up to the first tampered Ledger
+    monkeypatch.setitem(config.hashing, "checkpoint_interval", 4)
+    session.connection().execute(update(Ledger).where(Ledger.id == ids[9]).values(amount=1000))
+    assert record_ledger_checkpoints(session) == ids[3:8:4]
+
+    session.connection().execute(update(Ledger).where(Ledger.id == ids[9]).values(amount=5))
+    assert record_ledger_checkpoints(session) == ids[11::4]
+    assert session.scalars(
+        select(LedgerCheckpoint.ledger_id).order_by(LedgerCheckpoint.ledger_id)
+    ).all() == ids[3::4]
+    assert verify_ledger_chain(session) is None
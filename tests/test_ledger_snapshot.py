@@ -0,0 +1,534 @@
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import create_engine, event, func, select, update
+from python_accounting.config import config
+from python_accounting.database.session import get_session
+from python_accounting.models import (
+    Account,
+    Balance,
+    Base,
+    CachedSnapshot,
+    Currency,
+    Entity,
+    Ledger,
+    LineItem,
+    ReportingPeriod,
+    Transaction,
+)
+from python_accounting.transactions import CashSale, ClientInvoice
+from python_accounting.reports import (
+    LedgerSnapshot,
+    IncomeStatement,
+    BalanceSheet,
+    CashflowStatement,
+    TrialBalance,
+    bundle,
+)
+
+
+def test_ledger_snapshot(session, entity, currency):
+    """Tests the aggregation of an entity's account balances for a period"""
+
+    bank = Account(
+        name="test account one",
+        account_type=Account.AccountType.BANK,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    revenue = Account(
+        name="test account two",
+        account_type=Account.AccountType.OPERATING_REVENUE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    client = Account(
+        name="test account three",
+        account_type=Account.AccountType.RECEIVABLE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    session.add_all([bank, revenue, client])
+    session.flush()
+
+    session.add(
+        Balance(
+            transaction_date=datetime.now() - relativedelta(years=1),
+            transaction_type=Transaction.TransactionType.CLIENT_INVOICE,
+            amount=50,
+            balance_type=Balance.BalanceType.DEBIT,
+            account_id=client.id,
+            entity_id=entity.id,
+        )
+    )
+    session.flush()
+
+    for transaction_class, account, amount in [
+        (CashSale, bank, 100),
+        (ClientInvoice, client, 40),
+    ]:
+        transaction = transaction_class(
+            narration="Test transaction",
+            transaction_date=datetime.now(),
+            account_id=account.id,
+            entity_id=entity.id,
+        )
+        line_item = LineItem(
+            narration="Test line item",
+            account_id=revenue.id,
+            amount=amount,
+            entity_id=entity.id,
+        )
+        session.add_all([transaction, line_item])
+        session.flush()
+        transaction.line_items.add(line_item)
+        session.add(transaction)
+        session.flush()
+        transaction.post(session)
+
+    snapshot = LedgerSnapshot(session)
+
+    assert snapshot.balances[client.id]["opening"] == 50
+    assert snapshot.balances[client.id]["movement"] == 40
+    for account in [bank, revenue, client]:
+        assert snapshot.balances[account.id]["closing"] == account.closing_balance(
+            session
+        )
+
+    receivables = snapshot.section([Account.AccountType.RECEIVABLE])
+    assert receivables["closing"] == 90
+    assert receivables["categories"]["Receivable"]["accounts"] == [client]
+    assert snapshot.section([Account.AccountType.RECEIVABLE], False)["closing"] == 40
+
+    # The reports aggregate the ledger once, however many sections they have
+    statements = []
+    event.listen(
+        session.connection(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    BalanceSheet(session)
+    CashflowStatement(session)
+    ledger_queries = [s for s in statements if s.startswith("SELECT ledger.")]
+    assert len(ledger_queries) == 2
+
+
+def test_reports_bundle(session, entity, currency):
+    """Tests the generation of an entity's financial statements from one aggregation"""
+
+    bank = Account(
+        name="test account one",
+        account_type=Account.AccountType.BANK,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    revenue = Account(
+        name="test account two",
+        account_type=Account.AccountType.OPERATING_REVENUE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    session.add_all([bank, revenue])
+    session.flush()
+
+    period_start = entity.reporting_period.interval()["start"]
+    for transaction_date, amount in [
+        (period_start + relativedelta(days=1), 100),
+        (datetime.now(), 40),
+    ]:
+        transaction = CashSale(
+            narration="Test transaction",
+            transaction_date=transaction_date,
+            account_id=bank.id,
+            entity_id=entity.id,
+        )
+        line_item = LineItem(
+            narration="Test line item",
+            account_id=revenue.id,
+            amount=amount,
+            entity_id=entity.id,
+        )
+        session.add_all([transaction, line_item])
+        session.flush()
+        transaction.line_items.add(line_item)
+        session.add(transaction)
+        session.flush()
+        transaction.post(session)
+
+    statements = []
+    event.listen(
+        session.connection(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    for start_date in [None, today]:
+        statements.clear()
+        reports = bundle(session, start_date)
+        assert len([s for s in statements if s.startswith("SELECT ledger.")]) == 1
+
+        for report in [
+            IncomeStatement(session, start_date),
+            BalanceSheet(session),
+            CashflowStatement(session, start_date),
+            TrialBalance(session),
+        ]:
+            bundled = reports[report.config]
+            assert bundled.result_amounts == report.result_amounts
+            assert bundled.totals == report.totals
+            assert str(bundled) == str(report)
+
+    assert reports["income_statement"].result_amounts["NET_PROFIT"] == 40
+    assert reports["balance_sheet"].totals["ASSETS"] == 140
+
+
+def test_ledger_snapshot_cache(session, entity, currency, monkeypatch):
+    """Tests the storing of an entity's account balances for reuse by reports"""
+    monkeypatch.setitem(config.cache, "snapshots", 2)
+
+    bank = Account(
+        name="test account one",
+        account_type=Account.AccountType.BANK,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    revenue = Account(
+        name="test account two",
+        account_type=Account.AccountType.OPERATING_REVENUE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    session.add_all([bank, revenue])
+    session.commit()
+
+    def cash_sale(amount, transaction_date=None):
+        transaction = CashSale(
+            narration="Test transaction",
+            transaction_date=transaction_date or datetime.now(),
+            account_id=bank.id,
+            entity_id=entity.id,
+        )
+        line_item = LineItem(
+            narration="Test line item",
+            account_id=revenue.id,
+            amount=amount,
+            entity_id=entity.id,
+        )
+        session.add_all([transaction, line_item])
+        session.flush()
+        transaction.line_items.add(line_item)
+        session.add(transaction)
+        session.flush()
+        transaction.post(session)
+        session.commit()
+
+    cash_sale(100)
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    def ledger_queries():
+        queries = [s for s in statements if s.startswith("SELECT ledger.")]
+        statements.clear()
+        return len(queries)
+
+    trial_balance = TrialBalance(session)
+    assert ledger_queries() == 1
+    assert str(TrialBalance(session)) == str(trial_balance)
+    assert not [s for s in statements if s.split()[0] in ("INSERT", "UPDATE", "DELETE")]
+    assert ledger_queries() == 0
+
+    # Changes to the ledger only invalidate the snapshots of their Reporting Period
+    session.add(
+        ReportingPeriod(
+            calendar_year=datetime.now().year - 1,
+            period_count=2,
+            entity_id=entity.id,
+        )
+    )
+    session.commit()
+    last_year = datetime.now() - relativedelta(years=1)
+    TrialBalance(session, last_year)
+    assert ledger_queries() == 1
+
+    cash_sale(50)
+    statements.clear()
+    TrialBalance(session, last_year)
+    assert ledger_queries() == 0
+    assert TrialBalance(session).result_amounts["DEBIT"] == 150
+    assert ledger_queries() == 1
+    assert session.scalar(select(func.count(CachedSnapshot.id))) == 2
+
+    # Snapshots starting in an earlier Reporting Period are invalidated by its changes
+    assert IncomeStatement(session, last_year).result_amounts["NET_PROFIT"] == 150
+    assert ledger_queries() == 1
+    cash_sale(25, last_year)
+    statements.clear()
+    assert IncomeStatement(session, last_year).result_amounts["NET_PROFIT"] == 175
+    assert ledger_queries() == 1
+
+    # As are snapshots aggregated with a different configuration
+    TrialBalance(session)
+    assert ledger_queries() == 0
+    types = config.accounts["types"]
+    monkeypatch.setitem(
+        config.accounts,
+        "types",
+        {name: account_type for name, account_type in types.items() if name != "INVENTORY"},
+    )
+    TrialBalance(session)
+    assert ledger_queries() == 1
+    monkeypatch.setitem(config.accounts, "types", types)
+
+    # Least recently stored snapshots are evicted
+    for days in range(1, 4):
+        TrialBalance(session, datetime.now() - relativedelta(days=days))
+    assert session.scalar(select(func.count(CachedSnapshot.id))) == 2
+
+
+def test_ledger_snapshot_store(tmp_path, monkeypatch):
+    """Tests storing snapshots from sessions that only read reports"""
+    monkeypatch.setitem(config.cache, "snapshots", 2)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'accounting.db'}")
+    Base.metadata.create_all(engine)
+
+    with get_session(engine) as session:
+        entity = Entity(name="Test Entity")
+        session.add(entity)
+        session.commit()
+        currency = Currency(name="US Dollars", code="USD", entity_id=entity.id)
+        session.add(currency)
+        session.commit()
+        bank = Account(
+            name="test account one",
+            account_type=Account.AccountType.BANK,
+            currency_id=currency.id,
+            entity_id=entity.id,
+        )
+        revenue = Account(
+            name="test account two",
+            account_type=Account.AccountType.OPERATING_REVENUE,
+            currency_id=currency.id,
+            entity_id=entity.id,
+        )
+        session.add_all([bank, revenue])
+        session.commit()
+        ids = {
+            "entity": entity.id,
+            "currency": currency.id,
+            "bank": bank.id,
+            "revenue": revenue.id,
+        }
+
+    def cash_sale(session, amount):
+        transaction = CashSale(
+            narration="Test transaction",
+            transaction_date=datetime.now(),
+            account_id=ids["bank"],
+            entity_id=ids["entity"],
+        )
+        line_item = LineItem(
+            narration="Test line item",
+            account_id=ids["revenue"],
+            amount=amount,
+            entity_id=ids["entity"],
+        )
+        session.add_all([transaction, line_item])
+        session.flush()
+        transaction.line_items.add(line_item)
+        session.add(transaction)
+        session.flush()
+        transaction.post(session)
+
+    with get_session(engine) as session:
+        session.entity = session.get(Entity, ids["entity"])
+        cash_sale(session, 100)
+
+    def stored():
+        with engine.connect() as connection:
+            return connection.scalar(select(func.count(CachedSnapshot.id)))
+
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+
+    def trial_balance(session):
+        statements.clear()
+        debit = TrialBalance(session).result_amounts["DEBIT"]
+        return debit, len([s for s in statements if s.startswith("SELECT ledger.")])
+
+    # Snapshots are committed apart from the transactions of the sessions reading them
+    with get_session(engine) as session:
+        session.entity = session.get(Entity, ids["entity"])
+        assert trial_balance(session) == (100, 1)
+        session.rollback()
+    assert stored() == 1
+
+    # They only include committed postings, so they outlive rollbacks of other sessions
+    with get_session(engine) as session:
+        session.entity = session.get(Entity, ids["entity"])
+        cash_sale(session, 50)
+        assert trial_balance(session) == (150, 1)
+    with get_session(engine) as session:
+        session.entity = session.get(Entity, ids["entity"])
+        session.add(
+            Balance(
+                transaction_date=datetime.now() - relativedelta(years=1),
+                transaction_type=Transaction.TransactionType.CLIENT_INVOICE,
+                amount=30,
+                balance_type=Balance.BalanceType.DEBIT,
+                account_id=ids["bank"],
+                entity_id=ids["entity"],
+            )
+        )
+        session.flush()
+        assert trial_balance(session) == (180, 1)
+        session.rollback()
+        assert trial_balance(session) == (150, 0)
+    assert stored() == 1
+
+    # Unless the session has flushed changes they would have to wait on
+    with get_session(engine) as session:
+        session.entity = session.get(Entity, ids["entity"])
+        session.add(
+            Account(
+                name="test account three",
+                account_type=Account.AccountType.BANK,
+                currency_id=ids["currency"],
+                entity_id=ids["entity"],
+            )
+        )
+        session.flush()
+        TrialBalance(session, datetime.now() - relativedelta(days=1))
+        session.rollback()
+    assert stored() == 1
+    engine.dispose()
+
+
+def test_ledger_snapshot_refresh(session, entity, currency):
+    """Tests the refreshing of a report with only the postings made since it was generated"""
+
+    bank = Account(
+        name="test account one",
+        account_type=Account.AccountType.BANK,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    revenue = Account(
+        name="test account two",
+        account_type=Account.AccountType.OPERATING_REVENUE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    client = Account(
+        name="test account three",
+        account_type=Account.AccountType.RECEIVABLE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    session.add_all([bank, revenue, client])
+    session.commit()
+
+    def cash_sale(account, amount):
+        transaction = CashSale(
+            narration="Test transaction",
+            transaction_date=datetime.now(),
+            account_id=bank.id,
+            entity_id=entity.id,
+        )
+        line_item = LineItem(
+            narration="Test line item",
+            account_id=account.id,
+            amount=amount,
+            entity_id=entity.id,
+        )
+        session.add_all([transaction, line_item])
+        session.flush()
+        transaction.line_items.add(line_item)
+        session.add(transaction)
+        session.flush()
+        transaction.post(session)
+        session.commit()
+
+    cash_sale(revenue, 100)
+    trial_balance = TrialBalance(session)
+
+    cash_sale(revenue, 50)
+    balance = Balance(
+        transaction_date=datetime.now() - relativedelta(years=1),
+        transaction_type=Transaction.TransactionType.CLIENT_INVOICE,
+        amount=30,
+        balance_type=Balance.BalanceType.DEBIT,
+        account_id=client.id,
+        entity_id=entity.id,
+    )
+    session.add(balance)
+    session.commit()
+
+    other = Account(
+        name="test account four",
+        account_type=Account.AccountType.OPERATING_REVENUE,
+        currency_id=currency.id,
+        entity_id=entity.id,
+    )
+    session.add(other)
+    session.commit()
+    cash_sale(other, 30)
+
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    assert trial_balance.snapshot.refresh() == {bank.id, revenue.id, client.id, other.id}
+    ledger_queries = [s for s in statements if s.startswith("SELECT ledger.")]
+    assert len(ledger_queries) == 1 and "ledger.id >" in ledger_queries[0]
+
+    refreshed = trial_balance.refresh()
+    assert refreshed.result_amounts["DEBIT"] == 210
+    assert str(refreshed) == str(TrialBalance(session))
+
+    # Changes to existing balances are aggregated again in full
+    balance.amount = 40
+    session.commit()
+    assert trial_balance.snapshot.refresh() == set(trial_balance.snapshot.accounts)
+    assert str(trial_balance.refresh()) == str(TrialBalance(session))
+
+    # Ledgers committed after a higher id was included are picked up from the window
+    cash_sale(other, 20)
+    trial_balance.snapshot.marks["ledger"] = session.scalar(select(func.max(Ledger.id)))
+    assert trial_balance.snapshot.refresh() == {bank.id, other.id}
+    assert trial_balance.refresh().result_amounts["DEBIT"] == 240
+    assert trial_balance.snapshot.refresh() == set()
+
+    # Accounts are reloaded with the snapshot
+    session.connection().execute(
+        update(Account.__table__)
+        .where(Account.__table__.c.id == other.id)
+        .values(account_type=Account.AccountType.NON_OPERATING_REVENUE)
+    )
+    trial_balance.snapshot.refresh()
+    assert (
+        trial_balance.snapshot.accounts[other.id].account_type
+        == Account.AccountType.NON_OPERATING_REVENUE
+    )
+    assert str(trial_balance.refresh()) == str(TrialBalance(session))
+
+    # Every statement is generated again for its own dates
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    reports = [
+        (IncomeStatement(session, today), lambda: IncomeStatement(session, today)),
+        (BalanceSheet(session), lambda: BalanceSheet(session)),
+        (CashflowStatement(session, today), lambda: CashflowStatement(session, today)),
+    ]
+    cash_sale(revenue, 10)
+    for report, generate in reports:
+        refreshed = report.refresh()
+        assert type(refreshed) is type(report)
+        assert refreshed.start_date == report.start_date
+        assert str(refreshed) == str(generate())